@@ -0,0 +1,84 @@
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.transformers.bronze_to_silver import BronzeToSilverTransformer
+from src.transformers.silver_to_gold import SilverToGoldTransformer
+from scripts.benchmark_transform import make_bronze
+import numpy as np
+import pandas as pd
+import argparse
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+
+def make_imf_bronze(path, rows, countries, indicators, duplicate_ratio, null_ratio, seed=1):
+    """Write a synthetic IMF-shaped bronze file (quarterly labels, no name columns)."""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-50, 1000, rows)
+    values[rng.random(rows) < null_ratio] = np.nan
+    df = pd.DataFrame({
+        'country': pd.Categorical(rng.choice([f"C{i:03d}" for i in range(countries)], rows)),
+        'indicator': pd.Categorical(rng.choice([f"IFS.{i}" for i in range(indicators)], rows)),
+        'value': values,
+        'date': pd.Categorical(rng.choice([f"{y}-Q{q}" for y in range(1980, 2024) for q in range(1, 5)], rows)),
+        'source': pd.Categorical(['IMF'] * rows)
+    })
+    duplicates = df.sample(frac=duplicate_ratio, random_state=seed)
+    pd.concat([df, duplicates], ignore_index=True).to_parquet(path, index=False)
+
+def timed(function, *args):
+    """Run a transformation and return (seconds, output path)."""
+    start = time.perf_counter()
+    output_path = function(*args)
+    return time.perf_counter() - start, output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark transformation engines on synthetic World Bank/IMF data')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Bronze rows per source before duplicates')
+    parser.add_argument('--countries', type=int, default=200, help='Number of synthetic countries')
+    parser.add_argument('--indicators', type=int, default=50, help='Number of synthetic indicators')
+    parser.add_argument('--engines', nargs='+', default=['pandas', 'polars'], help='Engines to compare (first is the reference)')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        bronze_paths = [workdir / 'world_bronze.parquet', workdir / 'imf_bronze.parquet']
+        make_bronze(bronze_paths[0], args.rows, args.countries, args.indicators, 0.05, 0.1)
+        make_imf_bronze(bronze_paths[1], args.rows, args.countries, args.indicators, 0.05, 0.1)
+
+        print("\n=== Transformation Engine Benchmark ===")
+        print(f"{'engine':<10}{'silver s':>10}{'gold s':>10}{'total s':>10}{'gold rows':>12}")
+
+        outputs = {}
+        for engine in args.engines:
+            config = {
+                'data_paths': {'silver': str(workdir / engine / 'silver'), 'gold': str(workdir / engine / 'gold')},
+                'transformation': {'engine': engine if engine in BronzeToSilverTransformer.ENGINES else 'pandas',
+                                   'gold_engine': engine if engine in SilverToGoldTransformer.ENGINES else 'pandas'}
+            }
+            bronze_transformer = BronzeToSilverTransformer(config)
+            silver_seconds, silver_paths = 0.0, []
+            for bronze_path in bronze_paths:
+                seconds, silver_path = timed(bronze_transformer.transform, bronze_path)
+                silver_seconds += seconds
+                silver_paths.append(silver_path)
+            gold_seconds, gold_path = timed(SilverToGoldTransformer(config).transform, silver_paths)
+
+            outputs[engine] = pd.read_parquet(gold_path)
+            total = silver_seconds + gold_seconds
+            print(f"{engine:<10}{silver_seconds:>10.2f}{gold_seconds:>10.2f}{total:>10.2f}{len(outputs[engine]):>12}")
+
+        reference, *others = args.engines
+        for engine in others:
+            pd.testing.assert_frame_equal(outputs[reference], outputs[engine], check_categorical=False, rtol=1e-9)
+            print(f"\n{engine} gold output matches {reference} row for row")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tests.fake_api import FakeAPIServer, FakeAPIConfig
+from src.extractors.world_bank import WorldBankExtractor
+from src.extractors.imf import IMFExtractor
+import pandas as pd
+import argparse
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+
+def run_extractor(extractor_class, config, params):
+    """Run one extraction and return (seconds, rows)."""
+    start = time.perf_counter()
+    path = extractor_class(config).extract(**params)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(pd.read_parquet(path))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extractors against the local fake API')
+    parser.add_argument('--countries', type=int, default=50, help='Number of synthetic countries')
+    parser.add_argument('--indicators', type=int, default=5, help='World Bank indicators / IMF indicators per dataset')
+    parser.add_argument('--datasets', type=int, default=2, help='Number of IMF datasets')
+    parser.add_argument('--start-year', type=int, default=1990, help='Start year')
+    parser.add_argument('--end-year', type=int, default=2023, help='End year')
+    parser.add_argument('--latency', type=float, default=0.02, help='Per-request server latency in seconds')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Return 429 on every Nth request (0 = never)')
+    parser.add_argument('--per-page', type=int, default=1000, help='World Bank page size')
+    parser.add_argument('--record-padding', type=int, default=0, help='Filler characters added to every record')
+    parser.add_argument('--modes', nargs='+', default=['sync', 'async'], help='Extraction modes to compare')
+
+    args = parser.parse_args()
+
+    countries = [f"C{i:03d}" for i in range(args.countries)]
+    server_config = FakeAPIConfig(
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        countries=countries,
+        indicators_per_dataset=args.indicators,
+        record_padding=args.record_padding
+    )
+
+    with FakeAPIServer(server_config) as server, tempfile.TemporaryDirectory() as workdir:
+        print("\n=== Extraction Benchmark ===")
+        print(f"{'extractor':<12}{'mode':<8}{'requests':>10}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+
+        for mode in args.modes:
+            config = {
+                'data_paths': {'bronze': str(Path(workdir) / mode)},
+                'extraction': {'mode': mode},
+                'http': {'retry_backoff_factor': 0.01},
+                'world_bank_params': {
+                    'indicators': [f"WB.IND.{i}" for i in range(args.indicators)],
+                    'base_url': server.world_bank_url,
+                    'per_page': args.per_page
+                },
+                'imf_params': {
+                    'datasets': [f"DS{i}" for i in range(args.datasets)],
+                    'base_url': server.imf_url,
+                    'structure_cache_dir': str(Path(workdir) / mode / 'dsd')
+                }
+            }
+
+            runs = [
+                ('world_bank', WorldBankExtractor,
+                 {'countries': countries, 'start_year': args.start_year, 'end_year': args.end_year}),
+                ('imf', IMFExtractor,
+                 {'countries': countries, 'start_period': str(args.start_year), 'end_period': str(args.end_year)})
+            ]
+            for name, extractor_class, params in runs:
+                requests_before = server.request_count
+                seconds, rows = run_extractor(extractor_class, config, params)
+                requests_made = server.request_count - requests_before
+                print(f"{name:<12}{mode:<8}{requests_made:>10}{rows:>10}{seconds:>10.2f}{rows / seconds:>12,.0f}")
+
+        if server.throttled_count:
+            print(f"\nThrottled responses: {server.throttled_count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import sys
+import os
+import time
+import tempfile
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.transformers.bronze_to_silver import BronzeToSilverTransformer
+from src.transformers.silver_to_gold import SilverToGoldTransformer
+from scripts.benchmark_transform import make_bronze
+import argparse
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+
+def timed(function, *args, **kwargs):
+    """Run a transformation and return (seconds, output path)."""
+    start = time.perf_counter()
+    output_path = function(*args, **kwargs)
+    return time.perf_counter() - start, output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark partitioned process-pool transformations')
+    parser.add_argument('--rows', type=int, default=4_000_000, help='Bronze rows before duplicates')
+    parser.add_argument('--countries', type=int, default=200, help='Number of synthetic countries')
+    parser.add_argument('--indicators', type=int, default=50, help='Number of synthetic indicators')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32], help='Worker counts to compare')
+    parser.add_argument('--engine', default='arrow', help='Bronze to silver engine')
+
+    args = parser.parse_args()
+    print(f"CPU cores available: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        bronze_path = workdir / 'world_bank_bronze.parquet'
+        make_bronze(bronze_path, args.rows, args.countries, args.indicators, 0.05, 0.1)
+
+        print("\n=== Partitioned Transformation Benchmark ===")
+        print(f"{'workers':<10}{'silver s':>10}{'gold s':>10}{'total s':>10}{'speedup':>10}")
+
+        baseline = None
+        for workers in args.workers:
+            config = {
+                'data_paths': {'silver': str(workdir / str(workers) / 'silver'), 'gold': str(workdir / str(workers) / 'gold')},
+                'transformation': {'engine': args.engine, 'workers': workers}
+            }
+            silver_seconds, silver_path = timed(BronzeToSilverTransformer(config).transform, bronze_path)
+            gold_seconds, _ = timed(SilverToGoldTransformer(config).transform, [silver_path])
+            total = silver_seconds + gold_seconds
+            baseline = baseline or total
+            print(f"{workers:<10}{silver_seconds:>10.2f}{gold_seconds:>10.2f}{total:>10.2f}{baseline / total:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
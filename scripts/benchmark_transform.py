@@ -0,0 +1,84 @@
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.transformers.bronze_to_silver import BronzeToSilverTransformer
+import numpy as np
+import pandas as pd
+import argparse
+import logging
+
+logging.basicConfig(level=logging.WARNING)
+
+def make_bronze(path, rows, countries, indicators, duplicate_ratio, null_ratio, seed=0):
+    """Write a synthetic World Bank-shaped bronze file with nulls and duplicates."""
+    rng = np.random.default_rng(seed)
+    country_codes = [f"C{i:03d}" for i in range(countries)]
+    indicator_codes = [f"WB.IND.{i}" for i in range(indicators)]
+    values = rng.uniform(-50, 1000, rows)
+    values[rng.random(rows) < null_ratio] = np.nan
+    df = pd.DataFrame({
+        'country': pd.Categorical(rng.choice(country_codes, rows)),
+        'country_name': pd.Categorical(rng.choice(country_codes, rows)),
+        'indicator': pd.Categorical(rng.choice(indicator_codes, rows)),
+        'indicator_name': pd.Categorical(rng.choice(indicator_codes, rows)),
+        'value': values,
+        'date': pd.Categorical(rng.choice([str(year) for year in range(1960, 2024)], rows)),
+        'source': pd.Categorical(['World Bank'] * rows)
+    })
+    duplicates = df.sample(frac=duplicate_ratio, random_state=seed)
+    pd.concat([df, duplicates], ignore_index=True).to_parquet(path, index=False)
+
+def run_engine(transformer, bronze_path, engine):
+    """Run one transformation and return (seconds, silver path)."""
+    start = time.perf_counter()
+    output_path = transformer.transform(bronze_path, engine=engine)
+    return time.perf_counter() - start, output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bronze to silver engines on synthetic data')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Bronze rows before duplicates')
+    parser.add_argument('--countries', type=int, default=200, help='Number of synthetic countries')
+    parser.add_argument('--indicators', type=int, default=50, help='Number of synthetic indicators')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.05, help='Fraction of rows duplicated')
+    parser.add_argument('--null-ratio', type=float, default=0.1, help='Fraction of null values')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine (best time is reported)')
+    parser.add_argument('--engines', nargs='+', default=['pandas', 'arrow'], help='Engines to compare')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        bronze_path = workdir / 'world_bank_bronze.parquet'
+        make_bronze(bronze_path, args.rows, args.countries, args.indicators, args.duplicate_ratio, args.null_ratio)
+
+        print("\n=== Bronze to Silver Benchmark ===")
+        print(f"{'engine':<10}{'rows in':>12}{'rows out':>12}{'seconds':>10}{'rows/s':>14}")
+
+        outputs = {}
+        for engine in args.engines:
+            transformer = BronzeToSilverTransformer({
+                'data_paths': {'silver': str(workdir / engine / 'silver'), 'gold': str(workdir / engine / 'gold')}
+            })
+            timings = []
+            for _ in range(args.repeat):
+                seconds, output_path = run_engine(transformer, bronze_path, engine)
+                timings.append(seconds)
+                outputs[engine] = pd.read_parquet(output_path)
+                output_path.unlink()
+            rows_in = int(args.rows * (1 + args.duplicate_ratio))
+            best = min(timings)
+            print(f"{engine:<10}{rows_in:>12}{len(outputs[engine]):>12}{best:>10.2f}{rows_in / best:>14,.0f}")
+
+        reference, *others = args.engines
+        for engine in others:
+            pd.testing.assert_frame_equal(outputs[reference], outputs[engine])
+            print(f"\n{engine} output identical to {reference}")
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,10 @@ import requests
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 from dataclasses import dataclass
+from src.extractors.http_cache import ResponseCache
+from src.extractors.http_session import HTTPSessionManager
+from src.etl.raw_storage import write_raw
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +39,8 @@ class ExtractorConfig:
     retry_attempts: int
     retry_backoff_factor: float
     timeout: int
+    http_cache: Optional[Dict[str, Any]] = None
+    rate_limit: Optional[Dict[str, Any]] = None
 
 class DataValidationError(Exception):
     """Raised when data validation fails."""
@@ -62,7 +65,8 @@ class WorldBankExtractor:
     def __init__(self, config_path: Optional[Union[str, Path]] = None):
         """Initialize the extractor with configuration."""
         self.config = self._load_config(config_path)
-        self.session = self._setup_session()
+        self.http = self._setup_http()
+        self.response_cache = ResponseCache.from_config(self.config.http_cache)
         self.extraction_metrics = {
             'start_time': None,
             'end_time': None,
@@ -90,25 +94,39 @@ class WorldBankExtractor:
                 default_page_size=config_data['world_bank']['default_page_size'],
                 retry_attempts=config_data['world_bank'].get('retry_attempts', 3),
                 retry_backoff_factor=config_data['world_bank'].get('retry_backoff_factor', 0.3),
-                timeout=config_data['world_bank'].get('timeout', 10)
+                timeout=config_data['world_bank'].get('timeout', 10),
+                http_cache=config_data.get('http_cache'),
+                rate_limit=config_data.get('rate_limit')
             )
         except FileNotFoundError:
             raise ConfigurationError(f"Configuration file not found at: {config_path}")
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Invalid YAML configuration: {e}")
 
-    def _setup_session(self) -> requests.Session:
-        """Configure requests session with retry mechanism."""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=self.config.retry_attempts,
-            backoff_factor=self.config.retry_backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504]
+    def _setup_http(self) -> HTTPSessionManager:
+        """
+        Get the shared connection pools with this extractor's retry policy.
+
+        Requests go through the manager so each thread uses its own session.
+        """
+        return HTTPSessionManager.shared({
+            'http': {
+                'retry_attempts': self.config.retry_attempts,
+                'retry_backoff_factor': self.config.retry_backoff_factor,
+                'timeout': self.config.timeout
+            },
+            'rate_limit': self.config.rate_limit
+        })
+
+    def _get(self, url: str, params: Dict[str, Any]) -> Any:
+        """Issue a GET request, going through the response cache when enabled."""
+        if self.response_cache is None:
+            return self.http.get(url, params=params, timeout=self.config.timeout)
+        return self.response_cache.fetch(
+            url,
+            params,
+            lambda headers: self.http.get(url, params=params, headers=headers, timeout=self.config.timeout)
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
 
     def _validate_response_data(self, data: List[Any]) -> bool:
         """Validate the structure and content of the API response."""
@@ -143,11 +161,7 @@ class WorldBankExtractor:
 
             logger.info(f"Starting data extraction for {country} - {indicator}")
             
-            response = self.session.get(
-                url, 
-                params=params, 
-                timeout=self.config.timeout
-            )
+            response = self._get(url, params)
             response.raise_for_status()
             
             data = response.json()
@@ -157,6 +171,12 @@ class WorldBankExtractor:
 
             self.extraction_metrics['records_extracted'] = len(data[1])
             
+            # Save raw data to disk
+            raw_data_dir = self._ensure_raw_data_dir()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{country}_{indicator}_{timestamp}.arrow"
+            filepath = raw_data_dir / filename
+
             # Create result dictionary
             result = {
                 'extracted_data': data[1],
@@ -164,19 +184,13 @@ class WorldBankExtractor:
                     'country': country,
                     'indicator': indicator,
                     'time_range': f"{start_year}-{end_year}",
-                    'extraction_timestamp': datetime.now().isoformat()
+                    'extraction_timestamp': datetime.now().isoformat(),
+                    'output_file': str(filepath)
                 },
                 'metrics': self.extraction_metrics
             }
 
-            # Save raw data to disk
-            raw_data_dir = self._ensure_raw_data_dir()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{country}_{indicator}_{timestamp}.json"
-            filepath = raw_data_dir / filename
-
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=2)
+            write_raw(filepath, data[1], {'metadata': result['metadata'], 'metrics': result['metrics']})
 
             logger.info(f"Successfully extracted {len(data[1])} records and saved to {filepath}")
             return result
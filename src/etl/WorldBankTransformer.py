@@ -1,9 +1,12 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterator, List, Optional, Union, Any
 from datetime import datetime
 from dataclasses import dataclass
+from src.etl.raw_storage import read_raw
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +22,36 @@ class TransformerConfig:
     date_format: str = "%Y"
     value_precision: int = 2
 
+@dataclass(frozen=True)
+class TransformedData:
+    """
+    Handle to a transformed Parquet file.
+    
+    Carries the row count and schema from the file footer; rows are only
+    read when ``load`` or ``iter_batches`` is called.
+    """
+    path: Path
+    row_count: int
+    schema: pa.Schema
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'TransformedData':
+        """Build a handle from the Parquet footer without reading any rows."""
+        metadata = pq.read_metadata(path)
+        return cls(path=Path(path), row_count=metadata.num_rows, schema=metadata.schema.to_arrow_schema())
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the transformed data (optionally only some columns)."""
+        return pd.read_parquet(self.path, columns=columns)
+
+    def iter_batches(self, batch_size: int = 100_000, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Read the transformed data in DataFrames of at most ``batch_size`` rows."""
+        for batch in pq.ParquetFile(self.path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
 class DataTransformationError(Exception):
     """Raised when data transformation fails."""
     pass
@@ -53,17 +86,14 @@ class WorldBankTransformer:
             input_file: Path to the raw data file
             
         Returns:
-            Dictionary containing transformed data and metadata
+            Dictionary with a ``TransformedData`` handle to the written file
+            (rows are not materialized) and metadata
         """
         try:
             logger.info(f"Starting data transformation for {input_file}")
             
-            # Read raw data
-            with open(input_file, 'r') as f:
-                raw_data = pd.read_json(f)
-                
-            # Extract the actual data from the nested structure
-            df = pd.DataFrame(raw_data['extracted_data'].iloc[0])
+            # Read raw data (compact Arrow files, or legacy JSON documents)
+            df, _ = read_raw(input_file)
             
             # Clean and transform data
             transformed_df = self._transform_dataframe(df)
@@ -74,20 +104,21 @@ class WorldBankTransformer:
             output_path = transformed_data_dir / output_filename
             
             transformed_df.to_parquet(output_path, index=False)
+            transformed_data = TransformedData.from_file(output_path)
             
             # Prepare result
             result = {
-                'transformed_data': transformed_df.to_dict(orient='records'),
+                'transformed_data': transformed_data,
                 'metadata': {
                     'input_file': str(input_file),
                     'output_file': str(output_path),
                     'transformation_timestamp': datetime.now().isoformat(),
-                    'rows_processed': len(transformed_df),
-                    'columns': list(transformed_df.columns)
+                    'rows_processed': transformed_data.row_count,
+                    'columns': transformed_data.schema.names
                 }
             }
             
-            logger.info(f"Successfully transformed {len(transformed_df)} records")
+            logger.info(f"Successfully transformed {transformed_data.row_count} records")
             return result
             
         except Exception as e:
@@ -1,13 +1,16 @@
 import os
 import yaml
 import logging
-import requests
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, BinaryIO, Iterator
+from contextlib import contextmanager
+from io import BytesIO
 from datetime import datetime
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 from dataclasses import dataclass
+from src.extractors.http_cache import ResponseCache
+from src.extractors.http_session import HTTPSessionManager
+from src.extractors.sdmx_stream import iter_compact_observations
+from src.etl.raw_storage import write_raw
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +26,9 @@ class IMFExtractorConfig:
     retry_attempts: int = 3
     retry_backoff_factor: float = 0.3
     timeout: int = 30
+    http_cache: Optional[Dict[str, Any]] = None
+    rate_limit: Optional[Dict[str, Any]] = None
+    stream_parse: bool = True
 
 class IMFExtractor:
     """
@@ -38,21 +44,48 @@ class IMFExtractor:
     def __init__(self, config: Optional[IMFExtractorConfig] = None):
         """Initialize the extractor with configuration."""
         self.config = config or IMFExtractorConfig()
-        self.session = self._setup_session()
+        self.http = self._setup_http()
+        self.response_cache = ResponseCache.from_config(self.config.http_cache)
         self._ensure_raw_data_dir()
 
-    def _setup_session(self) -> requests.Session:
-        """Configure requests session with retry mechanism."""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=self.config.retry_attempts,
-            backoff_factor=self.config.retry_backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504]
+    def _setup_http(self) -> HTTPSessionManager:
+        """
+        Get the shared connection pools with this extractor's retry policy.
+
+        Requests go through the manager so each thread uses its own session.
+        """
+        return HTTPSessionManager.shared({
+            'http': {
+                'retry_attempts': self.config.retry_attempts,
+                'retry_backoff_factor': self.config.retry_backoff_factor,
+                'timeout': self.config.timeout
+            },
+            'rate_limit': self.config.rate_limit
+        })
+
+    def _get(self, url: str, params: Dict[str, Any]) -> Any:
+        """Issue a GET request, going through the response cache when enabled."""
+        if self.response_cache is None:
+            return self.http.get(url, params=params, timeout=self.config.timeout)
+        return self.response_cache.fetch(
+            url,
+            params,
+            lambda headers: self.http.get(url, params=params, headers=headers, timeout=self.config.timeout)
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
+
+    @contextmanager
+    def _open_stream(self, url: str, params: Dict[str, Any]) -> Iterator[BinaryIO]:
+        """Issue a GET request and yield the response body as a binary stream."""
+        if self.response_cache is not None:
+            response = self._get(url, params)
+            response.raise_for_status()
+            yield BytesIO(response.content)
+            return
+
+        with self.http.get(url, params=params, timeout=self.config.timeout, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
 
     def _ensure_raw_data_dir(self) -> Path:
         """Ensure the raw data directory exists."""
@@ -92,19 +125,19 @@ class IMFExtractor:
                 "indicators": ",".join(indicators)
             }
             
-            # Make the request
-            response = self.session.get(url, params=params, timeout=self.config.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Extract the actual data series from the IMF's nested structure
-            series_data = self._parse_imf_response(data)
+            # Make the request and extract the data series from the IMF's nested structure
+            if self.config.stream_parse:
+                with self._open_stream(url, params) as stream:
+                    series_data = self._parse_imf_stream(stream)
+            else:
+                response = self._get(url, params)
+                response.raise_for_status()
+                series_data = self._parse_imf_response(response.json())
             
             # Save raw data
             raw_data_dir = self._ensure_raw_data_dir()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"fsi_{country_code}_{timestamp}.json"
+            filename = f"fsi_{country_code}_{timestamp}.arrow"
             filepath = raw_data_dir / filename
             
             result = {
@@ -118,8 +151,7 @@ class IMFExtractor:
                 }
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=2)
+            write_raw(filepath, series_data, {'metadata': result['metadata']})
             
             logger.info(f"Successfully extracted FSI data for {country_code}")
             return result
@@ -160,4 +192,22 @@ class IMFExtractor:
             logger.error(f"Failed to parse IMF response: {str(e)}")
             raise
             
-        return series_data
\ No newline at end of file
+        return series_data
+
+    def _parse_imf_stream(self, stream: BinaryIO) -> List[Dict[str, Any]]:
+        """Parse an IMF CompactData response body incrementally into a flat structure."""
+        series_data = []
+
+        try:
+            for series, ob in iter_compact_observations(stream):
+                series_data.append({
+                    'indicator': series['@INDICATOR'],
+                    'date': ob['@TIME_PERIOD'],
+                    'value': float(ob['@OBS_VALUE'])
+                })
+
+        except KeyError as e:
+            logger.error(f"Failed to parse IMF response: {str(e)}")
+            raise
+
+        return series_data
@@ -0,0 +1,84 @@
+"""
+Raw Landing Storage Module
+
+Compact on-disk format for the raw extraction results of the legacy ETL.
+Records are stored as a zstd-compressed Arrow IPC (Feather v2) file, with
+the run metadata in a small JSON sidecar next to it. Files written by older
+versions as a single pretty-printed JSON document are still readable.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+RAW_SUFFIX = '.arrow'
+METADATA_SUFFIX = '.meta.json'
+
+
+def metadata_path(path: Union[str, Path]) -> Path:
+    """Return the metadata sidecar path for a raw data file."""
+    path = Path(path)
+    return path.with_name(path.stem + METADATA_SUFFIX)
+
+
+def write_raw(
+    path: Union[str, Path],
+    records: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    compression: str = 'zstd'
+) -> Path:
+    """
+    Write extracted records and their metadata in the compact raw format.
+
+    Args:
+        path: Target data file; the ``.arrow`` suffix is enforced
+        records: Extracted records (nested dictionaries become struct columns)
+        metadata: Run metadata and metrics, stored in the JSON sidecar
+        compression: Arrow IPC buffer compression ('zstd', 'lz4' or 'uncompressed')
+
+    Returns:
+        Path of the written data file
+    """
+    path = Path(path).with_suffix(RAW_SUFFIX)
+    feather.write_feather(pa.Table.from_pylist(records), path, compression=compression)
+    with open(metadata_path(path), 'w') as f:
+        json.dump(metadata, f, default=str)
+    return path
+
+
+def read_raw(path: Union[str, Path]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Read a raw landing file into a DataFrame of records and its metadata.
+
+    Both the Arrow format and the legacy JSON documents
+    (``{'extracted_data': [...], 'metadata': {...}}``) are accepted.
+
+    Args:
+        path: Raw data file
+
+    Returns:
+        Tuple of (records DataFrame, metadata dictionary)
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r') as f:
+            raw_data = json.load(f)
+        metadata = {key: value for key, value in raw_data.items() if key != 'extracted_data'}
+        return pd.DataFrame(raw_data['extracted_data']), metadata
+
+    df = feather.read_table(path, memory_map=True).to_pandas()
+    sidecar = metadata_path(path)
+    metadata: Dict[str, Any] = {}
+    if sidecar.exists():
+        with open(sidecar, 'r') as f:
+            metadata = json.load(f)
+    else:
+        logger.warning(f"No metadata sidecar found for {path}")
+    return df, metadata
@@ -1,30 +1,162 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List, BinaryIO, Iterator, Set, Tuple, Union
+from contextlib import contextmanager
+from io import BytesIO
 from datetime import datetime
 import logging
 from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+from src.extractors.async_engine import AsyncFetchEngine
+from src.extractors.http_cache import ResponseCache
+from src.extractors.http_session import HTTPSessionManager
+from src.extractors.watermarks import WatermarkStore, incremental_start
+from src.extractors.bronze_writer import BronzeWriter
+from src.extractors.columnar import ColumnarBuilder
 
 class BaseExtractor(ABC):
     """Base class for all data extractors."""
-    
+
+    # Name used for bronze files and the extractor's watermark store
+    source_name = 'base'
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.extraction_config = config.get('extraction', {})
+        self.http = HTTPSessionManager.shared(config)
+        self.response_cache = ResponseCache.from_config(config.get('http_cache'))
+        self.bronze_row_group_size = self.extraction_config.get('bronze_row_group_size', 100_000)
         self._setup_bronze_storage()
-    
+        self.watermarks = self._setup_watermarks()
+        # (source, country, indicator) of series landed for the first time in this run
+        self._new_series = set()
+
     def _setup_bronze_storage(self) -> None:
         """Set up bronze (raw) data storage."""
         self.bronze_path = Path(self.config['data_paths']['bronze'])
         self.bronze_path.mkdir(parents=True, exist_ok=True)
-    
+
+    def _setup_watermarks(self) -> Optional[WatermarkStore]:
+        """Open the watermark store when incremental extraction is enabled."""
+        if not self.extraction_config.get('incremental', False):
+            return None
+        watermark_dir = Path(self.extraction_config.get('watermark_dir', 'data/watermarks'))
+        return WatermarkStore(watermark_dir / f"{self.source_name}.json")
+
+    def _incremental_start(self, source: str, default_start: str,
+                           countries: Optional[List[str]] = None, indicator: Optional[str] = None) -> str:
+        """
+        Start period for a request, narrowed by the watermark store when enabled.
+
+        A request without ``countries`` covers every country; it is recorded
+        in the store so the next such request can be narrowed too.
+        """
+        if self.watermarks is None:
+            return str(default_start)
+        watermark = self.watermarks.low_watermark(source, countries, indicator)
+        if not countries:
+            self.watermarks.mark_all_countries(source, indicator)
+        return incremental_start(watermark, default_start,
+                                 self.extraction_config.get('revision_lookback_years', 2))
+
+    def _advance_watermarks(self, source: str, data: Union[pd.DataFrame, pa.Table]) -> None:
+        """Record the periods landed in bronze for the next incremental run."""
+        if self.watermarks is None:
+            return
+        if isinstance(data, pa.Table):
+            data = data.select(['country', 'indicator', 'date', 'value']).to_pandas()
+        for country, indicator in self.watermarks.advance_from_frame(source, data):
+            self._new_series.add((source, country, indicator))
+
+    def _new_series_of(self, source: str) -> List[Tuple[str, str]]:
+        """(country, indicator) series of ``source`` landed for the first time in this run."""
+        return sorted((country, indicator) for series_source, country, indicator in self._new_series
+                      if series_source == source)
+
+    def _new_countries(self, source: str, indicator: Optional[str] = None) -> List[str]:
+        """Countries with a series (of ``indicator``, if given) landed for the first time in this run."""
+        return sorted({country for country, series_indicator in self._new_series_of(source)
+                       if indicator in (None, series_indicator)})
+
+    def _discard_watermarks(self) -> None:
+        """Drop the watermark advances of a failed run by reloading the persisted store."""
+        if self.watermarks is not None:
+            self.watermarks = self._setup_watermarks()
+        self._new_series.clear()
+
+    def _commit_watermarks(self) -> None:
+        """Persist advanced watermarks once the bronze file has been published."""
+        if self.watermarks is not None:
+            self.watermarks.save()
+        self._new_series.clear()
+
     @abstractmethod
     def extract(self, **kwargs) -> Dict[str, Any]:
         """Extract data from source."""
         pass
-    
-    def _save_bronze_data(self, data: Dict[str, Any], source: str) -> Path:
-        """Save raw data to bronze layer."""
+
+    def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Issue a GET request and return the decoded JSON body."""
+        if self.response_cache is not None:
+            response = self.response_cache.fetch(
+                url, params, lambda headers: self.http.get(url, params=params, headers=headers))
+        else:
+            response = self.http.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @contextmanager
+    def _open_stream(self, url: str, params: Optional[Dict[str, Any]] = None) -> Iterator[BinaryIO]:
+        """Issue a GET request and yield the (decompressed) response body as a binary stream."""
+        if self.response_cache is not None:
+            response = self.response_cache.fetch(
+                url, params, lambda headers: self.http.get(url, params=params, headers=headers))
+            response.raise_for_status()
+            yield BytesIO(response.content)
+            return
+
+        with self.http.get(url, params=params, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
+
+    def _extraction_mode(self, kwargs: Dict[str, Any]) -> str:
+        """Resolve the extraction mode ('sync' or 'async') from kwargs or config."""
+        mode = kwargs.get('mode', self.extraction_config.get('mode', 'sync'))
+        if mode not in ('sync', 'async'):
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        return mode
+
+    def _build_fetch_engine(self, fetch: Callable[[str, Dict[str, Any]], Any]) -> AsyncFetchEngine:
+        """Build an async fan-out engine configured from the extraction settings."""
+        return AsyncFetchEngine(
+            fetch,
+            max_concurrency=self.extraction_config.get('max_concurrency', 16),
+            per_host_limit=self.extraction_config.get('per_host_limit', 4),
+            per_host_limits=self.extraction_config.get('per_host_limits')
+        )
+
+    def _open_bronze_writer(self, schema: pa.Schema) -> BronzeWriter:
+        """Open a streaming writer for this run's bronze file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = self.bronze_path / f"{source}_{timestamp}.parquet"
-        pd.DataFrame(data).to_parquet(filepath, index=False)
-        return filepath
\ No newline at end of file
+        filepath = self.bronze_path / f"{self.source_name}_{timestamp}.parquet"
+        return BronzeWriter(filepath, schema, self.bronze_row_group_size)
+
+    def _flush_builder(self, builder: ColumnarBuilder, writer: BronzeWriter, watermark_source: str,
+                       series: Optional[Set[Tuple[str, str]]] = None) -> None:
+        """
+        Hand the builder's pending rows to the bronze writer and the watermark store.
+
+        When ``series`` is given, only rows of those (country, indicator) pairs are landed.
+        """
+        if len(builder) == 0:
+            return
+        table = builder.drain()
+        if series is not None:
+            keys = pd.MultiIndex.from_frame(table.select(['country', 'indicator']).to_pandas().astype(str))
+            table = table.filter(pa.array(keys.isin(list(series))))
+            if table.num_rows == 0:
+                return
+        writer.write(table)
+        self._advance_watermarks(watermark_source, table)
@@ -0,0 +1,93 @@
+"""
+Streaming Bronze Writer
+
+Writes extracted batches to a bronze Parquet file as they arrive, flushing a
+row group whenever enough rows are buffered. The file is written under a
+temporary name and atomically renamed on success, so readers never see a
+half-written bronze file. On failure, the row groups already flushed are
+kept in a ``.partial`` file for inspection.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.extractors.columnar import concat_tables
+
+logger = logging.getLogger(__name__)
+
+
+class BronzeWriter:
+    """
+    Thread-safe incremental Parquet writer for one bronze file.
+
+    Args:
+        path: Final bronze file path
+        schema: Arrow schema every written table must match
+        row_group_size: Rows buffered before a row group is flushed
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema, row_group_size: int = 100_000):
+        self.path = Path(path)
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._buffer: List[pa.Table] = []
+        self._buffered_rows = 0
+        self._lock = threading.Lock()
+        self._writer: Optional[pq.ParquetWriter] = pq.ParquetWriter(self._tmp_path, schema)
+
+    def write(self, table: pa.Table) -> None:
+        """Buffer a batch, flushing a row group once ``row_group_size`` rows are pending."""
+        if table.num_rows == 0:
+            return
+        with self._lock:
+            self._buffer.append(table)
+            self._buffered_rows += table.num_rows
+            if self._buffered_rows >= self.row_group_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        table = concat_tables(self._buffer)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += table.num_rows
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def close(self) -> Path:
+        """Flush remaining rows and atomically publish the file."""
+        with self._lock:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+            os.replace(self._tmp_path, self.path)
+        logger.info(f"Wrote {self.rows_written} rows to {self.path}")
+        return self.path
+
+    def abort(self) -> Optional[Path]:
+        """Close without publishing; keep flushed row groups as a .partial file."""
+        with self._lock:
+            if self._writer is None:
+                return None
+            self._writer.close()
+            self._writer = None
+            partial_path = self.path.with_name(self.path.name + '.partial')
+            os.replace(self._tmp_path, partial_path)
+        logger.warning(f"Bronze write aborted after {self.rows_written} rows; partial data in {partial_path}")
+        return partial_path
+
+    def __enter__(self) -> 'BronzeWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,122 @@
+"""
+Columnar Record Builder
+
+Accumulates extracted observations column by column instead of as a list of
+per-row dicts. Numeric columns are kept in typed arrays and string columns
+are dictionary-encoded as they arrive, so repeated values such as country,
+indicator names and source labels are stored once per distinct value.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+FLOAT = 'float64'
+DICTIONARY = 'dictionary'
+
+
+class ColumnarBuilder:
+    """
+    Append-only builder producing an Arrow table.
+
+    Args:
+        schema: Ordered (column, kind) pairs where kind is ``'float64'`` or
+            ``'dictionary'``. Missing or None values become nulls.
+    """
+
+    def __init__(self, schema: List[Tuple[str, str]]):
+        self.schema = schema
+        self._floats: Dict[str, array] = {}
+        self._indices: Dict[str, array] = {}
+        self._dictionaries: Dict[str, Dict[str, int]] = {}
+        for name, kind in schema:
+            if kind == FLOAT:
+                self._floats[name] = array('d')
+            elif kind == DICTIONARY:
+                self._indices[name] = array('i')
+                self._dictionaries[name] = {}
+            else:
+                raise ValueError(f"Unknown column kind for {name}: {kind}")
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _code(self, column: str, value: Any) -> int:
+        if value is None:
+            return -1
+        dictionary = self._dictionaries[column]
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        return code
+
+    def encode(self, values: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Pre-encode dictionary column values shared by many rows.
+
+        The result can be passed to ``append`` as ``encoded`` so that, for
+        example, series-level attributes are looked up once per series rather
+        than once per observation.
+        """
+        return {column: self._code(column, value) for column, value in values.items() if column in self._indices}
+
+    def append(self, row: Dict[str, Any], encoded: Optional[Dict[str, int]] = None) -> None:
+        """Append one record; ``encoded`` overrides dictionary columns with codes from ``encode``."""
+        encoded = encoded or {}
+        for column, values in self._floats.items():
+            value = row.get(column)
+            values.append(float('nan') if value is None else value)
+        for column, indices in self._indices.items():
+            code = encoded.get(column)
+            indices.append(code if code is not None else self._code(column, row.get(column)))
+        self._rows += 1
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def arrow_schema(self) -> pa.Schema:
+        """Arrow schema of the tables produced by ``to_arrow``."""
+        return pa.schema([
+            (name, pa.float64() if kind == FLOAT else pa.dictionary(pa.int32(), pa.string()))
+            for name, kind in self.schema
+        ])
+
+    def drain(self) -> pa.Table:
+        """
+        Return the accumulated rows as a table and clear them.
+
+        Dictionaries are kept, so codes obtained from ``encode`` stay valid
+        across drains.
+        """
+        table = self.to_arrow()
+        for name in self._floats:
+            self._floats[name] = array('d')
+        for name in self._indices:
+            self._indices[name] = array('i')
+        self._rows = 0
+        return table
+
+    def to_arrow(self) -> pa.Table:
+        """Materialise the accumulated columns as an Arrow table."""
+        columns = {}
+        for name, kind in self.schema:
+            if kind == FLOAT:
+                values = np.frombuffer(self._floats[name], dtype=np.float64)
+                columns[name] = pa.array(values, mask=np.isnan(values))
+            else:
+                indices = np.frombuffer(self._indices[name], dtype=np.int32)
+                dictionary = pa.array(list(self._dictionaries[name]), type=pa.string())
+                columns[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(indices, mask=indices < 0), dictionary)
+        return pa.table(columns, schema=self.arrow_schema())
+
+
+def concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """Concatenate builder tables sharing a schema, unifying their dictionaries."""
+    if not tables:
+        raise ValueError("No tables to concatenate")
+    return pa.concat_tables(tables).unify_dictionaries().combine_chunks()
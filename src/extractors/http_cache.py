@@ -0,0 +1,230 @@
+"""
+HTTP Response Cache Module
+
+On-disk cache for API responses shared by all extractors. Entries are keyed
+by URL and query parameters and support:
+- TTL-based freshness
+- ETag / Last-Modified conditional revalidation
+- LRU eviction within a size budget
+- Offline replay (serve only from cache, never touch the network)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a request has no cached response."""
+    pass
+
+
+@dataclass
+class CachedResponse:
+    """Minimal response object returned from the cache."""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class ResponseCache:
+    """
+    Thread-safe on-disk HTTP response cache.
+
+    Each entry is stored as a ``<key>.body`` file holding the raw payload and a
+    ``<key>.json`` file holding the validators and fetch time. The body file's
+    access time (set explicitly on every hit) drives LRU eviction.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: int = 86400,
+        max_size_bytes: int = 512 * 1024 * 1024,
+        offline: bool = False
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['ResponseCache']:
+        """Build a cache from an ``http_cache`` config section, or None if disabled."""
+        if not config or not config.get('enabled', False):
+            return None
+        return cls(
+            cache_dir=config.get('cache_dir', 'data/http_cache'),
+            ttl_seconds=config.get('ttl_seconds', 86400),
+            max_size_bytes=int(config.get('max_size_mb', 512)) * 1024 * 1024,
+            offline=config.get('offline', False)
+        )
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Stable cache key for a URL and its query parameters."""
+        canonical = json.dumps({'url': url, 'params': params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> Dict[str, list]:
+        """Scan the cache directory into a {key: [size, last_access]} index."""
+        index = {}
+        for body in self.cache_dir.glob('*.body'):
+            stat = body.stat()
+            index[body.stem] = [stat.st_size, stat.st_atime]
+        return index
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[tuple]:
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            content = body_path.read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return meta, content
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        tmp_path = path.with_suffix(path.suffix + f".tmp{threading.get_ident()}")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        _, meta_path = self._paths(key)
+        self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _store(self, key: str, url: str, response: requests.Response) -> None:
+        body_path, _ = self._paths(key)
+        meta = {
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type')
+        }
+        self._atomic_write(body_path, response.content)
+        self._write_meta(key, meta)
+        with self._lock:
+            self._index[key] = [len(response.content), time.time()]
+        self._evict()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _touch(self, key: str) -> None:
+        body_path, _ = self._paths(key)
+        now = time.time()
+        try:
+            os.utime(body_path, (now, body_path.stat().st_mtime))
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = now
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its size budget."""
+        with self._lock:
+            total = sum(size for size, _ in self._index.values())
+            if total <= self.max_size_bytes:
+                return
+            victims = []
+            for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if total <= self.max_size_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            for key in victims:
+                del self._index[key]
+                self.stats['evictions'] += 1
+
+        for key in victims:
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+
+    def _to_response(self, url: str, meta: Dict[str, Any], content: bytes) -> CachedResponse:
+        headers = {'Content-Type': meta.get('content_type') or ''}
+        return CachedResponse(url=url, status_code=200, content=content, headers=headers, from_cache=True)
+
+    def fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        send: Callable[[Dict[str, str]], requests.Response]
+    ) -> Any:
+        """
+        Return the response for ``url``/``params``, using the cache where possible.
+
+        Args:
+            url: Request URL
+            params: Query parameters (part of the cache key)
+            send: Callable issuing the real request with the given extra headers
+
+        Returns:
+            A CachedResponse on cache hits, otherwise the live response
+        """
+        key = self.make_key(url, params)
+        cached = self._read(key)
+
+        if self.offline:
+            if cached is None:
+                raise CacheMissError(f"No cached response for {url} {params}")
+            self._count('hits')
+            self._touch(key)
+            return self._to_response(url, *cached)
+
+        headers = {}
+        if cached is not None:
+            meta, content = cached
+            if time.time() - meta['fetched_at'] < self.ttl_seconds:
+                self._count('hits')
+                self._touch(key)
+                return self._to_response(url, meta, content)
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = send(headers)
+
+        if response.status_code == 304 and cached is not None:
+            meta, content = cached
+            meta['fetched_at'] = time.time()
+            self._write_meta(key, meta)
+            self._touch(key)
+            self._count('revalidated')
+            logger.debug(f"Revalidated cached response for {url}")
+            return self._to_response(url, meta, content)
+
+        response.raise_for_status()
+        self._count('misses')
+        self._store(key, url, response)
+        return response
@@ -0,0 +1,134 @@
+"""
+Shared HTTP Session Manager
+
+Single transport layer for all extractors. Connection pools live in
+``HTTPAdapter`` instances that are created once per process and shared, so
+TCP connections and TLS sessions are kept alive and reused across
+extractors and threads. Each thread gets its own lightweight ``Session``
+mounted on those shared adapters, which keeps per-session state such as
+cookies out of cross-thread contention.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.extractors.rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionManager:
+    """
+    Pooled, retrying HTTP transport built from the ``http`` and
+    ``extraction`` config sections.
+
+    Pool sizes follow the configured concurrency: the default pool holds
+    ``extraction.max_concurrency`` connections per host, and hosts listed
+    in ``extraction.per_host_limits`` get a dedicated pool of that size.
+
+    When the ``rate_limit`` section is enabled, every request first takes a
+    token from the shared adaptive limiter and 429 responses are handled
+    here (feeding the limiter) rather than retried blindly by urllib3.
+    """
+
+    _shared: Dict[str, 'HTTPSessionManager'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        http_config = config.get('http', {})
+        extraction_config = config.get('extraction', {})
+
+        self.timeout: Tuple[float, float] = (
+            http_config.get('connect_timeout', 10),
+            http_config.get('read_timeout', http_config.get('timeout', 60))
+        )
+        self.rate_limiter = AdaptiveRateLimiter.from_config(config.get('rate_limit'))
+        self.throttle_retries = http_config.get('retry_attempts', 3)
+
+        # With a limiter, 429s (and their Retry-After) are handled in get() so
+        # that all threads back off together; urllib3 must not retry them itself
+        status_forcelist = http_config.get('retry_status_forcelist', [429, 500, 502, 503, 504])
+        if self.rate_limiter is not None:
+            status_forcelist = [status for status in status_forcelist if status != 429]
+        self.retry = Retry(
+            total=http_config.get('retry_attempts', 3),
+            backoff_factor=http_config.get('retry_backoff_factor', 0.3),
+            status_forcelist=status_forcelist,
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=self.rate_limiter is None
+        )
+
+        pool_maxsize = http_config.get('pool_maxsize', extraction_config.get('max_concurrency', 16))
+        self._default_adapter = HTTPAdapter(
+            pool_connections=http_config.get('pool_connections', 10),
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry
+        )
+        self._host_adapters = {
+            host: HTTPAdapter(pool_connections=1, pool_maxsize=limit, max_retries=self.retry)
+            for host, limit in (extraction_config.get('per_host_limits') or {}).items()
+        }
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls, config: Optional[Dict[str, Any]] = None) -> 'HTTPSessionManager':
+        """Return the process-wide manager for this transport configuration."""
+        config = config or {}
+        key = json.dumps({section: config.get(section, {}) for section in ('http', 'extraction', 'rate_limit')},
+                         sort_keys=True, default=str)
+        with cls._shared_lock:
+            manager = cls._shared.get(key)
+            if manager is None:
+                manager = cls._shared[key] = cls(config)
+            return manager
+
+    def session(self) -> requests.Session:
+        """Return the calling thread's session, mounted on the shared pools."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._default_adapter)
+            session.mount("https://", self._default_adapter)
+            for host, adapter in self._host_adapters.items():
+                session.mount(f"http://{host}", adapter)
+                session.mount(f"https://{host}", adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, stream: bool = False,
+            timeout: Optional[Any] = None) -> requests.Response:
+        """GET through the shared pools with the configured timeout, retry policy and rate limit."""
+        if self.rate_limiter is None:
+            return self.session().get(url, params=params, headers=headers, stream=stream,
+                                      timeout=timeout or self.timeout)
+
+        host = urlparse(url).netloc
+        for attempt in range(self.throttle_retries + 1):
+            self.rate_limiter.acquire(host)
+            response = self.session().get(url, params=params, headers=headers, stream=stream,
+                                          timeout=timeout or self.timeout)
+            if response.status_code != 429:
+                self.rate_limiter.on_success(host)
+                return response
+            self.rate_limiter.on_throttle(host, response.headers.get('Retry-After'))
+            if attempt < self.throttle_retries:
+                response.close()
+        return response
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Rate limiter metrics per host (empty when rate limiting is disabled)."""
+        return self.rate_limiter.metrics() if self.rate_limiter is not None else {}
+
+    def close(self) -> None:
+        """Close the shared connection pools."""
+        self._default_adapter.close()
+        for adapter in self._host_adapters.values():
+            adapter.close()
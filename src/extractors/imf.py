@@ -1,98 +1,276 @@
-from typing import Dict, Any, List
-import pandas as pd
+from typing import Dict, Any, List, Optional, BinaryIO, Callable, Set, Tuple
 import requests
 from datetime import datetime
 from pathlib import Path
 from src.extractors.base import BaseExtractor
+from src.extractors.async_engine import FetchRequest
+from src.extractors.imf_structure import DataStructureCache, DataStructureDefinition
+from src.extractors.sdmx_stream import iter_compact_observations
+from src.extractors.columnar import ColumnarBuilder, DICTIONARY, FLOAT
+from src.extractors.bronze_writer import BronzeWriter
 
 class IMFExtractor(BaseExtractor):
     """Extract economic indicators data from IMF API."""
-    
+
+    source_name = 'imf'
+
+    bronze_schema = [
+        ('country', DICTIONARY),
+        ('indicator', DICTIONARY),
+        ('frequency', DICTIONARY),
+        ('source', DICTIONARY),
+        ('country_name', DICTIONARY),
+        ('indicator_name', DICTIONARY),
+        ('date', DICTIONARY),
+        ('value', FLOAT),
+        ('status', DICTIONARY)
+    ]
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.base_url = "http://dataservices.imf.org/REST/SDMX_JSON.svc"
+        self.base_url = config['imf_params'].get('base_url', "http://dataservices.imf.org/REST/SDMX_JSON.svc")
         self.datasets = config['imf_params']['datasets']
-    
+        self.structure_cache = DataStructureCache(
+            config['imf_params'].get('structure_cache_dir', 'data/cache/imf_dsd'),
+            max_age_seconds=config['imf_params'].get('structure_max_age_days', 30) * 86400,
+            max_entries=config['imf_params'].get('structure_max_entries', 64)
+        )
+        self.stream_parse = config['imf_params'].get('stream_parse', True)
+
     def extract(self, **kwargs) -> Path:
         """
         Extract data from IMF API.
-        
+
         Args:
             **kwargs: Additional parameters including:
                 - start_period: Start period for data extraction
                 - end_period: End period for data extraction
                 - countries: List of country codes
+                - mode: 'sync' (default) or 'async' to fetch all datasets concurrently
         """
         self.logger.info("Starting IMF data extraction")
-        
-        all_data = []
+
         countries = kwargs.get('countries', [])
         start_period = kwargs.get('start_period', '2000')
         end_period = kwargs.get('end_period', str(datetime.now().year))
+        mode = self._extraction_mode(kwargs)
 
         try:
+            structures = self._load_structures(mode)
+
+            data_requests = {}
             for dataset in self.datasets:
-                self.logger.info(f"Fetching dataset: {dataset}")
-                
-                # First, get the data structure definition
-                url = f"{self.base_url}/DataStructure/{dataset}"
-                response = requests.get(url)
-                response.raise_for_status()
-                
-                # Then fetch the actual data
-                data_url = f"{self.base_url}/CompactData/{dataset}"
-                params = {
-                    'startPeriod': start_period,
-                    'endPeriod': end_period
-                }
-                
-                if countries:
-                    params['references'] = 'all'
-                    params['countries'] = '+'.join(countries)
-                
-                response = requests.get(data_url, params=params)
-                response.raise_for_status()
-                
-                # Parse IMF's SDMX-JSON format
-                data = response.json()
-                series = data['CompactData']['DataSet']['Series']
-                
-                # Handle both single series and multiple series cases
-                if not isinstance(series, list):
-                    series = [series]
-                
-                for serie in series:
-                    base_attributes = {
-                        'country': serie.get('@REF_AREA', ''),
-                        'indicator': serie.get('@INDICATOR', ''),
-                        'frequency': serie.get('@FREQ', ''),
-                        'source': 'IMF'
-                    }
-                    
-                    # Handle observations
-                    observations = serie.get('Obs', [])
-                    if not isinstance(observations, list):
-                        observations = [observations]
-                    
-                    for obs in observations:
-                        entry = base_attributes.copy()
-                        entry.update({
-                            'date': obs.get('@TIME_PERIOD', ''),
-                            'value': float(obs.get('@OBS_VALUE', 0)) if obs.get('@OBS_VALUE') is not None else None,
-                            'status': obs.get('@STATUS', '')
-                        })
-                        all_data.append(entry)
-            
-            # Create DataFrame and save to bronze layer
-            df = pd.DataFrame(all_data)
-            filepath = self._save_bronze_data(df, 'imf')
-            
+                dataset_countries = self._validate_countries(dataset, countries, structures[dataset])
+                if countries and not dataset_countries:
+                    self.logger.warning(f"Skipping dataset {dataset}: no valid country codes")
+                    continue
+                dataset_start = self._incremental_start(f"IMF/{dataset}", start_period, dataset_countries)
+                data_requests[dataset] = self._data_request(dataset, dataset_countries, dataset_start, end_period)
+
+            schema = ColumnarBuilder(self.bronze_schema).arrow_schema()
+            with self._open_bronze_writer(schema) as writer:
+                self._fetch_requests(data_requests, structures, writer, mode)
+                backfill_requests, backfill_series = self._backfill_requests(data_requests, start_period)
+                self._fetch_requests(backfill_requests, structures, writer, mode, backfill_series)
+
+            filepath = writer.path
+            self._commit_watermarks()
+
             self.logger.info(f"IMF data extraction completed: {filepath}")
             return filepath
-            
+
         except requests.RequestException as e:
             self.logger.error(f"Error fetching IMF data: {str(e)}")
+            self._discard_watermarks()
             raise
         except Exception as e:
             self.logger.error(f"Error processing IMF data: {str(e)}")
-            raise
\ No newline at end of file
+            self._discard_watermarks()
+            raise
+
+    def _fetch_requests(self, data_requests: Dict[str, FetchRequest], structures: Dict[str, DataStructureDefinition],
+                        writer: BronzeWriter, mode: str,
+                        series: Optional[Dict[str, Set[Tuple[str, str]]]] = None) -> None:
+        """
+        Fetch one CompactData request per dataset into the bronze writer.
+
+        ``series`` optionally restricts the rows landed per dataset to the
+        given (country, indicator) pairs.
+        """
+        series = series or {}
+        if mode == 'async':
+            structure_for = {request.url: (dataset, structures[dataset])
+                             for dataset, request in data_requests.items()}
+            engine = self._build_fetch_engine(
+                lambda url, params: self._fetch_dataset(url, params, writer, *structure_for[url],
+                                                        series.get(structure_for[url][0])))
+            engine.run(list(data_requests.values()))
+        else:
+            for dataset, request in data_requests.items():
+                self.logger.info(f"Fetching dataset: {dataset}")
+                self._fetch_dataset(request.url, request.params, writer, dataset, structures[dataset],
+                                    series.get(dataset))
+
+    def _backfill_requests(self, data_requests: Dict[str, FetchRequest],
+                           start_period: str) -> Tuple[Dict[str, FetchRequest], Dict[str, Set[Tuple[str, str]]]]:
+        """
+        Requests for the earlier history of series first seen in a narrowed all-countries request.
+
+        Such a request starts at the low watermark of the dataset's landed
+        series, so a country or indicator it returns for the first time only
+        arrived with the look-back window. The new series are requested from
+        ``start_period`` up to the narrowed start, keyed on their countries
+        and indicators; rows of other series in that cross product were
+        landed by earlier runs and are filtered out.
+
+        Returns:
+            Tuple of (requests per dataset, new (country, indicator) series per dataset)
+        """
+        backfill, backfill_series = {}, {}
+        for dataset, request in data_requests.items():
+            request_start = request.params['startPeriod']
+            if 'countries' in request.params or request_start == str(start_period):
+                continue
+            series = self._new_series_of(f"IMF/{dataset}")
+            if series:
+                countries = sorted({country for country, _ in series})
+                indicators = sorted({indicator for _, indicator in series})
+                end_period = str(int(request_start) - 1)
+                backfill[dataset] = self._data_request(dataset, countries, start_period, end_period, indicators)
+                backfill_series[dataset] = set(series)
+                self.logger.info(f"Backfilling {len(series)} new series of {dataset}")
+        return backfill, backfill_series
+
+    def _load_structures(self, mode: str) -> Dict[str, DataStructureDefinition]:
+        """Load data structure definitions, fetching only those missing from the cache."""
+        structures = {dataset: self.structure_cache.get(dataset) for dataset in self.datasets}
+        missing = [dataset for dataset, structure in structures.items() if structure is None]
+        structure_requests = [FetchRequest(f"{self.base_url}/DataStructure/{dataset}") for dataset in missing]
+
+        if missing:
+            self.logger.info(f"Fetching data structure definitions: {', '.join(missing)}")
+
+        if mode == 'async':
+            payloads = self._build_fetch_engine(self._get_json).run(structure_requests)
+        else:
+            payloads = [self._get_json(request.url, request.params) for request in structure_requests]
+
+        for dataset, payload in zip(missing, payloads):
+            structures[dataset] = self.structure_cache.put(dataset, payload)
+
+        return structures
+
+    def _validate_countries(self, dataset: str, countries: List[str], structure: DataStructureDefinition) -> List[str]:
+        """Drop country codes that are not in the dataset's REF_AREA codelist."""
+        invalid = structure.invalid_codes('REF_AREA', countries)
+        if invalid:
+            self.logger.warning(f"Unknown country codes for {dataset}, skipping: {', '.join(invalid)}")
+        return [country for country in countries if country not in invalid]
+
+    def _data_request(self, dataset: str, countries: List[str], start_period: str, end_period: str,
+                      indicators: Optional[List[str]] = None) -> FetchRequest:
+        """Build the CompactData request for a dataset, optionally limited to some indicators."""
+        params = {
+            'startPeriod': start_period,
+            'endPeriod': end_period
+        }
+
+        if countries:
+            params['references'] = 'all'
+            params['countries'] = '+'.join(countries)
+        if indicators:
+            params['indicators'] = '+'.join(indicators)
+
+        return FetchRequest(f"{self.base_url}/CompactData/{dataset}", params)
+
+    def _fetch_dataset(self, url: str, params: Dict[str, Any], writer: BronzeWriter, dataset: str,
+                       structure: Optional[DataStructureDefinition] = None,
+                       series: Optional[Set[Tuple[str, str]]] = None) -> int:
+        """Fetch a CompactData request and stream its rows (of ``series`` only, if given) into the bronze writer."""
+        builder = ColumnarBuilder(self.bronze_schema)
+        if not self.stream_parse:
+            builder.extend(self._parse_compact_data(self._get_json(url, params), structure))
+        else:
+            with self._open_stream(url, params) as stream:
+                flush = lambda: self._flush_builder(builder, writer, f"IMF/{dataset}", series)
+                self._append_compact_stream(builder, stream, structure, flush)
+        rows = len(builder)
+        self._flush_builder(builder, writer, f"IMF/{dataset}", series)
+        return rows
+
+    def _append_compact_stream(self, builder: ColumnarBuilder, stream: BinaryIO,
+                               structure: Optional[DataStructureDefinition] = None,
+                               flush: Optional[Callable[[], None]] = None) -> None:
+        """
+        Incrementally parse a CompactData response body into the column builder.
+
+        Equivalent to ``_parse_compact_data`` but never materialises the JSON
+        document; series attributes are encoded once per series and each
+        observation only appends its own date, value and status. ``flush`` is
+        called whenever the builder reaches the bronze row group size.
+        """
+        current_serie = None
+        series_codes = {}
+        for serie, obs in iter_compact_observations(stream):
+            if serie is not current_serie:
+                current_serie = serie
+                attributes = {
+                    'country': serie.get('@REF_AREA', ''),
+                    'indicator': serie.get('@INDICATOR', ''),
+                    'frequency': serie.get('@FREQ', ''),
+                    'source': 'IMF'
+                }
+                if structure is not None:
+                    attributes['country_name'] = structure.label('REF_AREA', attributes['country'])
+                    attributes['indicator_name'] = structure.label('INDICATOR', attributes['indicator'])
+                series_codes = builder.encode(attributes)
+
+            builder.append({
+                'date': obs.get('@TIME_PERIOD', ''),
+                'value': float(obs.get('@OBS_VALUE', 0)) if obs.get('@OBS_VALUE') is not None else None,
+                'status': obs.get('@STATUS', '')
+            }, series_codes)
+            if flush is not None and len(builder) >= self.bronze_row_group_size:
+                flush()
+
+    def _parse_compact_data(self, data: Dict[str, Any],
+                            structure: Optional[DataStructureDefinition] = None) -> List[Dict[str, Any]]:
+        """
+        Parse IMF's SDMX-JSON CompactData format into bronze rows.
+
+        When a data structure definition is given, country and indicator
+        labels are resolved from its codelists.
+        """
+        rows = []
+        series = data['CompactData']['DataSet']['Series']
+
+        # Handle both single series and multiple series cases
+        if not isinstance(series, list):
+            series = [series]
+
+        for serie in series:
+            base_attributes = {
+                'country': serie.get('@REF_AREA', ''),
+                'indicator': serie.get('@INDICATOR', ''),
+                'frequency': serie.get('@FREQ', ''),
+                'source': 'IMF'
+            }
+            if structure is not None:
+                base_attributes['country_name'] = structure.label('REF_AREA', base_attributes['country'])
+                base_attributes['indicator_name'] = structure.label('INDICATOR', base_attributes['indicator'])
+
+            # Handle observations
+            observations = serie.get('Obs', [])
+            if not isinstance(observations, list):
+                observations = [observations]
+
+            for obs in observations:
+                entry = base_attributes.copy()
+                entry.update({
+                    'date': obs.get('@TIME_PERIOD', ''),
+                    'value': float(obs.get('@OBS_VALUE', 0)) if obs.get('@OBS_VALUE') is not None else None,
+                    'status': obs.get('@STATUS', '')
+                })
+                rows.append(entry)
+
+        return rows
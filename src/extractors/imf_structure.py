@@ -0,0 +1,161 @@
+"""
+IMF Data Structure Definition Cache
+
+IMF DataStructure (DSD) responses are large and change rarely, so they are
+parsed once into a compact form (dimension -> codelist, codelist -> code
+labels) and persisted per dataset. Cached definitions are used to validate
+dimension codes and resolve labels without further API round trips.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older entries are then treated as misses
+CACHE_FORMAT_VERSION = 1
+
+
+def _as_list(value: Any) -> List[Any]:
+    """SDMX-JSON collapses single-element lists into objects; undo that."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _text(description: Any) -> str:
+    """Extract the (preferably English) text of an SDMX description node."""
+    if isinstance(description, str):
+        return description
+    entries = _as_list(description)
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get('@xml:lang', 'en') == 'en':
+            return entry.get('#text', '')
+    return entries[0].get('#text', '') if entries and isinstance(entries[0], dict) else ''
+
+
+@dataclass
+class DataStructureDefinition:
+    """Compact, parsed view of an IMF DSD."""
+    dataset: str
+    version: str
+    dimensions: Dict[str, str] = field(default_factory=dict)
+    codelists: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(cls, dataset: str, payload: Dict[str, Any]) -> 'DataStructureDefinition':
+        """Build a definition from a raw DataStructure SDMX-JSON response."""
+        structure = payload['Structure']
+        key_family = _as_list(structure['KeyFamilies']['KeyFamily'])[0]
+
+        dimensions = {
+            dimension['@conceptRef']: dimension.get('@codelist', '')
+            for dimension in _as_list(key_family.get('Components', {}).get('Dimension'))
+        }
+        codelists = {
+            codelist['@id']: {code['@value']: _text(code.get('Description')) for code in _as_list(codelist.get('Code'))}
+            for codelist in _as_list(structure.get('CodeLists', {}).get('CodeList'))
+        }
+
+        return cls(
+            dataset=dataset,
+            version=key_family.get('@version', ''),
+            dimensions=dimensions,
+            codelists=codelists
+        )
+
+    def codes(self, dimension: str) -> Optional[Dict[str, str]]:
+        """Return the {code: label} mapping for a dimension, or None if unknown."""
+        codelist = self.dimensions.get(dimension)
+        if codelist is None:
+            return None
+        return self.codelists.get(codelist)
+
+    def label(self, dimension: str, code: str) -> str:
+        """Resolve a dimension code to its label, falling back to the code itself."""
+        return (self.codes(dimension) or {}).get(code, code)
+
+    def invalid_codes(self, dimension: str, codes: List[str]) -> List[str]:
+        """Return the codes not present in the dimension's codelist."""
+        valid = self.codes(dimension)
+        if valid is None:
+            return []
+        return [code for code in codes if code not in valid]
+
+
+class DataStructureCache:
+    """
+    Persistent per-dataset cache of parsed DSDs.
+
+    Entries older than ``max_age_seconds`` are refetched; a changed DSD version
+    is logged on refresh. At most ``max_entries`` definitions are kept, evicting
+    the least recently used ones (tracked via file mtime).
+    """
+
+    def __init__(self, cache_dir: str, max_age_seconds: int = 30 * 86400, max_entries: int = 64):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: Dict[str, DataStructureDefinition] = {}
+
+    def _path(self, dataset: str) -> Path:
+        return self.cache_dir / f"{dataset}.json"
+
+    def _read(self, dataset: str) -> Optional[DataStructureDefinition]:
+        path = self._path(dataset)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry.get('format_version') != CACHE_FORMAT_VERSION:
+            return None
+        return DataStructureDefinition(**entry['definition'])
+
+    def get(self, dataset: str) -> Optional[DataStructureDefinition]:
+        """Return a fresh cached definition, or None if missing or expired."""
+        with self._lock:
+            definition = self._memory.get(dataset) or self._read(dataset)
+            if definition is None or time.time() - definition.fetched_at >= self.max_age_seconds:
+                return None
+            self._memory[dataset] = definition
+            try:
+                os.utime(self._path(dataset))
+            except FileNotFoundError:
+                # Evicted or removed by another process; the in-memory copy is still valid
+                pass
+            return definition
+
+    def put(self, dataset: str, payload: Dict[str, Any]) -> DataStructureDefinition:
+        """Parse a raw DSD response, persist it and return the definition."""
+        definition = DataStructureDefinition.from_response(dataset, payload)
+
+        with self._lock:
+            previous = self._memory.get(dataset) or self._read(dataset)
+            if previous is not None and previous.version != definition.version:
+                logger.info(f"DSD for {dataset} changed version: {previous.version} -> {definition.version}")
+
+            path = self._path(dataset)
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'format_version': CACHE_FORMAT_VERSION, 'definition': asdict(definition)}, f)
+            os.replace(tmp_path, path)
+            self._memory[dataset] = definition
+            self._evict()
+
+        return definition
+
+    def _evict(self) -> None:
+        entries = sorted(self.cache_dir.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.stem, None)
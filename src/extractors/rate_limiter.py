@@ -0,0 +1,173 @@
+"""
+Adaptive Rate Limiter
+
+Process-wide token-bucket governor shared by every extraction thread. Each
+host gets its own bucket whose rate adapts to the provider's feedback:
+successful requests increase the rate additively, 429 responses cut it
+multiplicatively and pause the bucket for the ``Retry-After`` period. All
+threads therefore back off together instead of retrying independently.
+"""
+
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket state for a single host."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AdaptiveRateLimiter:
+    """
+    Shared per-host token buckets with AIMD rate adaptation.
+
+    Args:
+        initial_rate: Starting requests per second for each host
+        min_rate: Floor for the rate after repeated throttling
+        max_rate: Ceiling for the rate after sustained success
+        burst: Bucket capacity (maximum back-to-back requests)
+        increase: Requests/second added after each successful request
+        decrease: Multiplier applied to the rate on a 429
+        host_rates: Optional per-host initial rates
+    """
+
+    _shared: Dict[str, 'AdaptiveRateLimiter'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        initial_rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        burst: float = 10.0,
+        increase: float = 0.2,
+        decrease: float = 0.5,
+        host_rates: Optional[Dict[str, float]] = None
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.host_rates = host_rates or {}
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['AdaptiveRateLimiter']:
+        """Return the process-wide limiter for a ``rate_limit`` config section, or None if disabled."""
+        if not config or not config.get('enabled', False):
+            return None
+        key = json.dumps(config, sort_keys=True, default=str)
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls._shared[key] = cls(
+                    initial_rate=config.get('initial_rate', 10.0),
+                    min_rate=config.get('min_rate', 0.5),
+                    max_rate=config.get('max_rate', 50.0),
+                    burst=config.get('burst', 10.0),
+                    increase=config.get('increase', 0.2),
+                    decrease=config.get('decrease', 0.5),
+                    host_rates=config.get('host_rates')
+                )
+            return limiter
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.initial_rate)
+            bucket = self._buckets[host] = _Bucket(rate, max(1.0, self.burst))
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to ``host`` may be sent; returns the time waited."""
+        waited = 0.0
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    if now < bucket.blocked_until:
+                        delay = bucket.blocked_until - now
+                    elif bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        bucket.requests += 1
+                        return waited
+                    else:
+                        delay = (1 - bucket.tokens) / bucket.rate
+                time.sleep(delay)
+                waited += delay
+        finally:
+            with self._lock:
+                bucket.waiting -= 1
+
+    def on_success(self, host: str) -> None:
+        """Additively raise the host's rate after a successful request."""
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def on_throttle(self, host: str, retry_after: Optional[str] = None) -> None:
+        """Cut the host's rate and pause its bucket after a 429."""
+        delay = parse_retry_after(retry_after)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.throttled += 1
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            bucket.tokens = 0
+            if delay:
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+        logger.warning(f"Throttled by {host}: rate now {bucket.rate:.2f} req/s"
+                       + (f", pausing {delay:.1f}s" if delay else ""))
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Current rate, queue depth and counters per host."""
+        with self._lock:
+            return {
+                host: {
+                    'rate': round(bucket.rate, 3),
+                    'queue_depth': bucket.waiting,
+                    'requests': bucket.requests,
+                    'throttled': bucket.throttled
+                }
+                for host, bucket in self._buckets.items()
+            }
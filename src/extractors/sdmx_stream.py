@@ -0,0 +1,52 @@
+"""
+Streaming SDMX-JSON CompactData Parser
+
+Walks a CompactData response as a stream of JSON events instead of loading
+the whole document, yielding one observation at a time together with the
+attributes of the series it belongs to. Memory use is bounded by a single
+series' attributes and a single observation, regardless of payload size.
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, Tuple
+
+import ijson
+
+_SERIES_PREFIX = 'CompactData.DataSet.Series'
+
+
+def iter_compact_observations(stream: BinaryIO) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Yield ``(series_attributes, observation)`` pairs from a CompactData stream.
+
+    Both the single-object and list forms of ``Series`` and ``Obs`` are
+    handled. Series attributes are expected before the ``Obs`` member, which
+    is how the IMF service serialises them.
+    """
+    series_prefixes = (_SERIES_PREFIX, f"{_SERIES_PREFIX}.item")
+    series_prefix = None
+    obs_prefix = None
+    series: Dict[str, Any] = {}
+    obs: Dict[str, Any] = {}
+
+    for prefix, event, value in ijson.parse(stream):
+        if obs_prefix is not None:
+            if event == 'end_map' and prefix == obs_prefix:
+                yield series, obs
+                obs_prefix = None
+            elif prefix.startswith(obs_prefix + '.') and event not in ('map_key', 'start_map', 'end_map'):
+                obs[prefix[len(obs_prefix) + 1:]] = value
+            continue
+
+        if series_prefix is None:
+            if event == 'start_map' and prefix in series_prefixes:
+                series_prefix = prefix
+                series = {}
+            continue
+
+        if event == 'end_map' and prefix == series_prefix:
+            series_prefix = None
+        elif event == 'start_map' and prefix in (f"{series_prefix}.Obs", f"{series_prefix}.Obs.item"):
+            obs_prefix = prefix
+            obs = {}
+        elif prefix.startswith(series_prefix + '.@') and event not in ('map_key', 'start_map', 'end_map'):
+            series[prefix[len(series_prefix) + 1:]] = value
@@ -0,0 +1,177 @@
+"""
+Extraction Watermark Store
+
+Persists, per (source, country, indicator), the latest period already
+landed in bronze so that extractors can request only newer periods plus a
+revision look-back window instead of the full history.
+
+Requests for every country can only be narrowed once such a request has
+been recorded for the source and indicator, and series they return for the
+first time are reported so that extractors can backfill their history.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Top-level key of the all-countries request marks in the JSON file
+ALL_COUNTRIES_KEY = '_all_countries'
+
+# Indicator key of an all-countries mark covering every indicator of a source
+ALL_INDICATORS = '*'
+
+_PERIOD_PATTERN = re.compile(r'^(\d{4})(?:-?([QM])?(\d{1,2}))?')
+
+
+def period_key(period: str) -> Tuple[int, int]:
+    """
+    Sortable key for World Bank / IMF period strings.
+
+    Handles annual ('2020'), quarterly ('2020Q1', '2020-Q1') and monthly
+    ('2020M01', '2020-01') periods. Sub-periods are mapped to an end month so
+    that an annual period sorts after all of its quarters and months.
+    """
+    match = _PERIOD_PATTERN.match(str(period))
+    if not match:
+        raise ValueError(f"Unrecognised period: {period}")
+    year, kind, number = match.groups()
+    if number is None:
+        return int(year), 12
+    return int(year), int(number) * 3 if kind == 'Q' else int(number)
+
+
+class WatermarkStore:
+    """
+    JSON-backed {source: {country: {indicator: period}}} high-water marks.
+
+    ``_all_countries`` records, per source, the indicators (``*`` for all of
+    them) for which a request covering every country has been made.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._marks: Dict[str, Dict[str, Dict[str, str]]] = self._load()
+        self._all_countries: Dict[str, List[str]] = self._marks.pop(ALL_COUNTRIES_KEY, {})
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def covers_all_countries(self, source: str, indicator: Optional[str] = None) -> bool:
+        """Whether a request for every country has been recorded for ``indicator``."""
+        return (indicator or ALL_INDICATORS) in self._all_countries.get(source, [])
+
+    def mark_all_countries(self, source: str, indicator: Optional[str] = None) -> None:
+        """Record a request covering every country (persisted by ``save``)."""
+        with self._lock:
+            indicators = self._all_countries.setdefault(source, [])
+            if (indicator or ALL_INDICATORS) not in indicators:
+                indicators.append(indicator or ALL_INDICATORS)
+
+    def get(self, source: str, country: str, indicator: str) -> Optional[str]:
+        """Return the latest landed period for a series, if any."""
+        return self._marks.get(source, {}).get(country, {}).get(indicator)
+
+    def low_watermark(
+        self,
+        source: str,
+        countries: Optional[List[str]] = None,
+        indicator: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Return the oldest watermark across the matching series.
+
+        When ``countries`` is given, every country must already have a
+        watermark (for ``indicator``, if given); otherwise None is returned
+        so a country seen for the first time still receives its full history.
+
+        Without ``countries`` the request covers every country, including
+        ones without a watermark. None is returned until a request for every
+        country has been recorded with ``mark_all_countries``; after that,
+        series the narrowed request returns for the first time are reported
+        by ``advance_from_frame`` and must be backfilled by the caller.
+        """
+        by_country = self._marks.get(source, {})
+        if not countries and not self.covers_all_countries(source, indicator):
+            return None
+        selected = countries if countries else list(by_country)
+
+        periods = []
+        for country in selected:
+            indicators = by_country.get(country, {})
+            if indicator is not None:
+                if indicator not in indicators:
+                    if countries:
+                        return None
+                    continue
+                periods.append(indicators[indicator])
+            elif indicators:
+                periods.extend(indicators.values())
+            elif countries:
+                return None
+
+        return min(periods, key=period_key) if periods else None
+
+    def advance(self, source: str, country: str, indicator: str, period: str) -> bool:
+        """
+        Move a series' watermark forward; older periods are ignored.
+
+        Returns:
+            True when the series had no watermark yet
+        """
+        with self._lock:
+            indicators = self._marks.setdefault(source, {}).setdefault(country, {})
+            current = indicators.get(indicator)
+            if current is None or period_key(period) > period_key(current):
+                indicators[indicator] = period
+            return current is None
+
+    def advance_from_frame(self, source: str, df: pd.DataFrame) -> List[Tuple[str, str]]:
+        """
+        Advance watermarks from landed bronze rows that carry a value.
+
+        Returns:
+            (country, indicator) pairs of the series seen for the first time
+        """
+        if df.empty:
+            return []
+        landed = df.dropna(subset=['value'])
+        new_series = []
+        for (country, indicator), dates in landed.groupby(['country', 'indicator'], observed=True)['date']:
+            if self.advance(source, country, indicator, max(dates, key=period_key)):
+                new_series.append((country, indicator))
+        return new_series
+
+    def save(self) -> None:
+        """Atomically persist the store."""
+        with self._lock:
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({**self._marks, ALL_COUNTRIES_KEY: self._all_countries}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def incremental_start(watermark: Optional[str], default_start: str, lookback_years: int) -> str:
+    """
+    Start year for an incremental request.
+
+    Re-requests ``lookback_years`` before the watermark to pick up revisions,
+    but never earlier than the configured start.
+    """
+    if watermark is None:
+        return str(default_start)
+    start = period_key(watermark)[0] - lookback_years
+    return str(max(start, int(default_start)))
@@ -1,75 +1,295 @@
-from typing import Dict, Any, List
-import pandas as pd
+from typing import Dict, Any, List, Tuple, Iterator
+from urllib.parse import urlencode
 import requests
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from src.extractors.base import BaseExtractor
+from src.extractors.async_engine import FetchRequest
+from src.extractors.bronze_writer import BronzeWriter
+from src.extractors.columnar import ColumnarBuilder, DICTIONARY, FLOAT
 
 class WorldBankExtractor(BaseExtractor):
     """Extract economic indicators data from World Bank API."""
-    
+
+    source_name = 'world_bank'
+
+    bronze_schema = [
+        ('country', DICTIONARY),
+        ('country_name', DICTIONARY),
+        ('indicator', DICTIONARY),
+        ('indicator_name', DICTIONARY),
+        ('value', FLOAT),
+        ('date', DICTIONARY),
+        ('source', DICTIONARY)
+    ]
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.base_url = "https://api.worldbank.org/v2"
+        self.base_url = config['world_bank_params'].get('base_url', "https://api.worldbank.org/v2")
         self.indicators = config['world_bank_params']['indicators']
-    
+        self.per_page = config['world_bank_params'].get('per_page', 1000)
+        self.max_page_workers = config['world_bank_params'].get('max_page_workers', 4)
+        self.max_batch_countries = config['world_bank_params'].get('max_batch_countries', 50)
+        self.max_batch_pages = config['world_bank_params'].get('max_batch_pages', 5)
+        self.max_url_length = config['world_bank_params'].get('max_url_length', 2000)
+        self.async_chunk_size = self.extraction_config.get('async_chunk_size', 64)
+
     def extract(self, **kwargs) -> Path:
         """
         Extract data from World Bank API.
-        
+
         Args:
             **kwargs: Additional parameters including:
                 - start_year: Start year for data extraction
                 - end_year: End year for data extraction
-                - countries: List of country codes
+                - countries: List of country codes, batched into
+                  semicolon-joined requests
+                - mode: 'sync' (default) or 'async' to fan out the whole
+                  indicator x country matrix concurrently
         """
         self.logger.info("Starting World Bank data extraction")
-        
-        all_data = []
+
         countries = kwargs.get('countries', ['all'])
         start_year = kwargs.get('start_year', '2000')
         end_year = kwargs.get('end_year', str(datetime.now().year))
+        mode = self._extraction_mode(kwargs)
 
         try:
-            for indicator in self.indicators:
-                self.logger.info(f"Fetching indicator: {indicator}")
-                
-                for country in countries:
-                    url = f"{self.base_url}/countries/{country}/indicators/{indicator}"
-                    params = {
-                        'format': 'json',
-                        'per_page': 1000,
-                        'date': f"{start_year}:{end_year}",
-                    }
-                    
-                    response = requests.get(url, params=params)
-                    response.raise_for_status()
-                    
-                    # World Bank API returns a list where [0] is metadata and [1] is data
-                    data = response.json()[1]
-                    
-                    # Transform to flat structure
-                    for entry in data:
-                        all_data.append({
-                            'country': entry['country']['id'],
-                            'country_name': entry['country']['value'],
-                            'indicator': indicator,
-                            'indicator_name': entry['indicator']['value'],
-                            'value': float(entry['value']) if entry['value'] is not None else None,
-                            'date': entry['date'],
-                            'source': 'World Bank'
-                        })
-                        
-            # Create DataFrame and save to bronze layer
-            df = pd.DataFrame(all_data)
-            filepath = self._save_bronze_data(df, 'world_bank')
-            
+            plan = self._plan_requests(countries, start_year, end_year)
+            builder = ColumnarBuilder(self.bronze_schema)
+
+            # Stream batches into the bronze file as responses arrive
+            with self._open_bronze_writer(builder.arrow_schema()) as writer:
+                self._write_results(plan, mode, builder, writer)
+                self._write_results(self._backfill_plan(plan, start_year), mode, builder, writer)
+
+            filepath = writer.path
+            self._commit_watermarks()
+
             self.logger.info(f"World Bank data extraction completed: {filepath}")
             return filepath
-            
+
         except requests.RequestException as e:
             self.logger.error(f"Error fetching World Bank data: {str(e)}")
+            self._discard_watermarks()
             raise
         except Exception as e:
             self.logger.error(f"Error processing World Bank data: {str(e)}")
-            raise
\ No newline at end of file
+            self._discard_watermarks()
+            raise
+
+    def _plan_requests(self, countries: List[str], start_year: str,
+                       end_year: str) -> List[Tuple[str, List[str], FetchRequest]]:
+        """
+        Build the (indicator, countries, request) plan for an extraction run.
+
+        Countries sharing a start year are grouped into semicolon-joined
+        batches, so one request covers many countries. See ``_batch_countries``
+        for the limits applied to each batch.
+        """
+        plan = []
+        for indicator in self.indicators:
+            if 'all' in countries:
+                request_start = self._incremental_start('World Bank', start_year, None, indicator)
+                plan.append((indicator, ['all'], self._indicator_request(indicator, ['all'], request_start, end_year)))
+                continue
+
+            by_start = {}
+            for country in countries:
+                request_start = self._incremental_start('World Bank', start_year, [country], indicator)
+                by_start.setdefault(request_start, []).append(country)
+
+            for request_start, start_countries in by_start.items():
+                for batch in self._batch_countries(indicator, start_countries, request_start, end_year):
+                    plan.append((indicator, batch, self._indicator_request(indicator, batch, request_start, end_year)))
+
+        self.logger.info(f"Planned {len(plan)} requests for {len(self.indicators)} indicators "
+                         f"x {len(countries)} countries")
+        return plan
+
+    def _backfill_plan(self, plan: List[Tuple[str, List[str], FetchRequest]],
+                       start_year: str) -> List[Tuple[str, List[str], FetchRequest]]:
+        """
+        Requests for the earlier history of countries first seen in a narrowed all-countries request.
+
+        Such a request starts at the low watermark of the countries already
+        landed, so a country it returns for the first time only arrived with
+        the look-back window; its periods from ``start_year`` up to the
+        narrowed start are requested here.
+        """
+        backfill = []
+        for indicator, batch, request in plan:
+            request_start = request.params['date'].split(':')[0]
+            if batch != ['all'] or int(request_start) <= int(start_year):
+                continue
+            countries = self._new_countries('World Bank', indicator)
+            end_year = str(int(request_start) - 1)
+            for countries_batch in self._batch_countries(indicator, countries, start_year, end_year):
+                backfill.append((indicator, countries_batch,
+                                 self._indicator_request(indicator, countries_batch, start_year, end_year)))
+
+        if backfill:
+            self.logger.info(f"Planned {len(backfill)} backfill requests for countries new to the watermark store")
+        return backfill
+
+    def _write_results(self, plan: List[Tuple[str, List[str], FetchRequest]], mode: str,
+                       builder: ColumnarBuilder, writer: BronzeWriter) -> None:
+        """Fetch a request plan and stream its records into the bronze writer."""
+        for (indicator, batch, _), data in self._iter_results(plan, mode):
+            for country_records in self._split_by_country(indicator, batch, data).values():
+                self._append_records(builder, indicator, country_records)
+            if len(builder) >= self.bronze_row_group_size:
+                self._flush_builder(builder, writer, 'World Bank')
+        self._flush_builder(builder, writer, 'World Bank')
+
+    def _indicator_request(self, indicator: str, countries: List[str], start_year: str, end_year: str) -> FetchRequest:
+        """Build the request for one indicator over a batch of countries."""
+        url = f"{self.base_url}/countries/{';'.join(countries)}/indicators/{indicator}"
+        params = {
+            'format': 'json',
+            'per_page': self.per_page,
+            'date': f"{start_year}:{end_year}",
+        }
+        return FetchRequest(url, params)
+
+    def _batch_countries(self, indicator: str, countries: List[str], start_year: str, end_year: str) -> List[List[str]]:
+        """
+        Split countries into request batches.
+
+        A batch is closed when adding a country would exceed
+        ``max_batch_countries``, push the URL past ``max_url_length``, or make
+        the expected row count (countries x years) need more than
+        ``max_batch_pages`` result pages.
+        """
+        years = max(1, int(end_year) - int(start_year) + 1)
+        max_by_pages = max(1, (self.per_page * self.max_batch_pages) // years)
+        max_countries = max(1, min(self.max_batch_countries, max_by_pages))
+
+        batches, batch = [], []
+        for country in countries:
+            candidate = batch + [country]
+            request = self._indicator_request(indicator, candidate, start_year, end_year)
+            url_length = len(request.url) + 1 + len(urlencode({**request.params, 'page': 1}))
+            if batch and (len(candidate) > max_countries or url_length > self.max_url_length):
+                batches.append(batch)
+                candidate = [country]
+            batch = candidate
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _split_by_country(self, indicator: str, countries: List[str],
+                          data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Split a batched response back into per-country record lists.
+
+        Records are matched to the requested codes by either the 2-letter id
+        or ``countryiso3code``; requested countries without any records are
+        reported.
+        """
+        split = {country: [] for country in countries if country != 'all'}
+        for entry in data:
+            country_id = entry['country']['id']
+            iso3 = entry.get('countryiso3code')
+            key = iso3 if iso3 in split and country_id not in split else country_id
+            split.setdefault(key, []).append(entry)
+
+        missing = [country for country in countries if country != 'all' and not split[country]]
+        if missing:
+            self.logger.warning(f"No {indicator} records returned for: {', '.join(missing)}")
+        return split
+
+    def _append_records(self, builder: ColumnarBuilder, indicator: str, data: List[Dict[str, Any]]) -> None:
+        """Flatten World Bank API records into the bronze column builder."""
+        fixed = builder.encode({'indicator': indicator, 'source': 'World Bank'})
+        for entry in data:
+            builder.append({
+                'country': entry['country']['id'],
+                'country_name': entry['country']['value'],
+                'indicator_name': entry['indicator']['value'],
+                'value': float(entry['value']) if entry['value'] is not None else None,
+                'date': entry['date']
+            }, fixed)
+
+    def _fetch_page(self, url: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Fetch a single result page, returning its metadata and records."""
+        # World Bank API returns a list where [0] is metadata and [1] is data
+        payload = self._get_json(url, params)
+        metadata = payload[0] if payload else {}
+        records = payload[1] if len(payload) > 1 and payload[1] else []
+        return metadata, records
+
+    def _check_total(self, url: str, metadata: Dict[str, Any], records: List[Dict[str, Any]]) -> None:
+        """Warn when the merged record count disagrees with the reported total."""
+        total = int(metadata.get('total') or 0)
+        if total and len(records) != total:
+            self.logger.warning(f"Expected {total} records from {url}, received {len(records)}")
+
+    def _fetch_all_pages(self, url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a World Bank query.
+
+        The first page is fetched on its own to read the ``pages``/``total``
+        metadata; remaining pages are fetched concurrently and merged in page order.
+        """
+        metadata, records = self._fetch_page(url, {**params, 'page': 1})
+        pages = int(metadata.get('pages') or 1)
+
+        if pages > 1:
+            workers = max(1, min(self.max_page_workers, pages - 1))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # executor.map yields in submission order, so pages stay sorted
+                for _, page_records in executor.map(
+                        lambda page: self._fetch_page(url, {**params, 'page': page}), range(2, pages + 1)):
+                    records.extend(page_records)
+
+        self._check_total(url, metadata, records)
+        return records
+
+    def _iter_results(self, plan: List[Tuple[str, List[str], FetchRequest]],
+                      mode: str) -> Iterator[Tuple[Tuple[str, List[str], FetchRequest], List[Dict[str, Any]]]]:
+        """
+        Yield (plan entry, records) pairs in plan order.
+
+        Async mode fetches the plan in chunks of ``async_chunk_size`` requests
+        so only one chunk of responses is held in memory at a time.
+        """
+        if mode == 'async':
+            for start in range(0, len(plan), self.async_chunk_size):
+                chunk = plan[start:start + self.async_chunk_size]
+                yield from zip(chunk, self._fetch_plan_async(chunk))
+            return
+
+        for entry in plan:
+            indicator, _, request = entry
+            self.logger.info(f"Fetching indicator: {indicator} ({request.url})")
+            yield entry, self._fetch_all_pages(request.url, request.params)
+
+    def _fetch_plan_async(self, plan: List[Tuple[str, List[str], FetchRequest]]) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch the whole request plan through the async fan-out engine.
+
+        First pages for every request are scheduled together; the remaining
+        pages they report are then scheduled as a second batch.
+        """
+        engine = self._build_fetch_engine(self._fetch_page)
+
+        first_pages = engine.run([
+            FetchRequest(request.url, {**request.params, 'page': 1}) for _, _, request in plan
+        ])
+
+        follow_ups = []
+        for index, ((_, _, request), (metadata, _)) in enumerate(zip(plan, first_pages)):
+            for page in range(2, int(metadata.get('pages') or 1) + 1):
+                follow_ups.append((index, FetchRequest(request.url, {**request.params, 'page': page})))
+
+        results = [records for _, records in first_pages]
+        follow_up_pages = engine.run([request for _, request in follow_ups])
+        for (index, _), (_, records) in zip(follow_ups, follow_up_pages):
+            results[index].extend(records)
+
+        for (_, _, request), (metadata, _), records in zip(plan, first_pages, results):
+            self._check_total(request.url, metadata, records)
+
+        return results
@@ -1,11 +1,13 @@
 # src/pipeline/orchestrator.py
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from src.extractors.world_bank import WorldBankExtractor
+from src.extractors.imf import IMFExtractor
 
 @dataclass
 class PipelineMetrics:
@@ -67,13 +69,21 @@ class PipelineOrchestrator:
     
     def _run_extraction(self) -> List[Path]:
         """Run all extractors in parallel."""
+        # 'sync' issues requests one at a time per extractor, 'async' fans out
+        # each extractor's full request matrix on an event loop
+        mode = self.config.get('extraction', {}).get('mode', 'sync')
         extractors = [
-            (WorldBankExtractor(self.config), self.config['world_bank_params']),
-            (IMFExtractor(self.config), self.config['imf_params'])
+            (WorldBankExtractor(self.config), {**self.config['world_bank_params'], 'mode': mode}),
+            (IMFExtractor(self.config), {**self.config['imf_params'], 'mode': mode})
         ]
         
         with ThreadPoolExecutor() as executor:
-         results = executor.map(self._extract_data, extractors)
+         results = list(executor.map(self._extract_data, extractors))
+
+        # All extractors share one transport, so one limiter snapshot covers them
+        rate_metrics = extractors[0][0].http.metrics()
+        if rate_metrics:
+            self.logger.info(f"Rate limiter metrics: {rate_metrics}")
     
         return [result for result in results if result is not None]
 
@@ -0,0 +1,126 @@
+"""
+Materialized Gold Aggregates
+
+Persists the gold rollups as Parquet datasets partitioned by year::
+
+    <root>/country_year/year=2020/part-0.parquet
+    <root>/indicator_year/year=2020/part-0.parquet
+
+Alongside them, ``<root>/_members/year=YYYY`` keeps the gold rows that feed
+each year (keys and measures only), so a refresh can recompute exact
+statistics, medians included, for just the (country, year) and
+(indicator, year) partitions touched by new data. A full run replaces the
+members of the (country, indicator, year) series it covers, so runs over
+different sources or indicators do not drop each other's rows. Years that receive no new
+rows are never read or rewritten.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+MEMBER_COLUMNS = ['country', 'indicator', 'value', 'yoy_change', 'zscore']
+
+# Members replaced together by a full refresh (within a year)
+SERIES_COLUMNS = ['country', 'indicator']
+
+# table name -> (partition key within a year, aggregations)
+AGGREGATE_TABLES = {
+    'country_year': ('country', {
+        'value': ['mean', 'std', 'min', 'max'],
+        'yoy_change': 'mean',
+        'zscore': 'mean'
+    }),
+    'indicator_year': ('indicator', {
+        'value': ['mean', 'median', 'std']
+    })
+}
+
+
+def aggregate(df: pd.DataFrame, key: str, aggregations: Dict[str, object]) -> pd.DataFrame:
+    """Group by ``key`` and flatten the aggregate columns to ``<column>_<stat>``."""
+    result = df.groupby(key, observed=True).agg(aggregations)
+    result.columns = [f"{column}_{stat}" for column, stat in result.columns]
+    return result.reset_index()
+
+
+class GoldAggregateStore:
+    """Year-partitioned aggregate tables with partition-level refresh."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, table: str, year: int) -> Path:
+        """Partition file of ``table`` for ``year``."""
+        return self.root / table / f"year={year}" / "part-0.parquet"
+
+    def _read(self, table: str, year: int) -> pd.DataFrame:
+        path = self.path(table, year)
+        return pd.read_parquet(path) if path.exists() else None
+
+    def _write(self, df: pd.DataFrame, table: str, year: int) -> Path:
+        return self.write_table(pa.Table.from_pandas(df, preserve_index=False), table, year)
+
+    def write_table(self, data: pa.Table, table: str, year: int) -> Path:
+        """Atomically replace one partition file, with the key columns dictionary-encoded."""
+        path = self.path(table, year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for column in ('country', 'indicator'):
+            if column in data.column_names:
+                data = data.set_column(data.schema.get_field_index(column), column,
+                                       pc.dictionary_encode(data.column(column).cast(pa.string())))
+        tmp_path = path.with_name(path.name + '.tmp')
+        pq.write_table(data, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def refresh(self, df: pd.DataFrame, replace: bool = False) -> Dict[str, List[Path]]:
+        """
+        Fold new gold rows into the aggregate tables.
+
+        Args:
+            df: Gold rows with country, indicator, year and the member measures
+            replace: True when ``df`` holds the complete data for every
+                (country, indicator, year) it contains, so their stored
+                members are replaced; False when it only holds new rows,
+                which are appended
+
+        Returns:
+            Rewritten partition files per table
+        """
+        written: Dict[str, List[Path]] = {table: [] for table in AGGREGATE_TABLES}
+        rows = df.dropna(subset=['year'])
+        for year, new_members in rows.groupby('year', observed=True):
+            year = int(year)
+            new_members = new_members[MEMBER_COLUMNS]
+            members = self._read('_members', year)
+            if members is not None:
+                if replace:
+                    series = pd.MultiIndex.from_frame(members[SERIES_COLUMNS].astype(str))
+                    members = members[~series.isin(pd.MultiIndex.from_frame(new_members[SERIES_COLUMNS].astype(str)))]
+                members = pd.concat([members.astype({'country': str, 'indicator': str}),
+                                     new_members.astype({'country': str, 'indicator': str})], ignore_index=True)
+            else:
+                members = new_members.reset_index(drop=True)
+            self._write(members, '_members', year)
+
+            for table, (key, aggregations) in AGGREGATE_TABLES.items():
+                touched = new_members[key].astype(str).unique()
+                fresh = aggregate(members[members[key].astype(str).isin(touched)], key, aggregations)
+                existing = self._read(table, year)
+                if existing is not None:
+                    kept = existing[~existing[key].astype(str).isin(touched)]
+                    fresh = pd.concat([kept.astype({key: str}), fresh.astype({key: str})], ignore_index=True)
+                fresh = fresh.sort_values(key, key=lambda column: column.astype(str), ignore_index=True)
+                written[table].append(self._write(fresh, table, year))
+
+        logger.info(f"Refreshed {len(written['country_year'])} year partitions of the gold aggregates")
+        return written
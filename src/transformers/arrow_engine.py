@@ -0,0 +1,266 @@
+"""
+Arrow Bronze-to-Silver Engine
+
+Columnar implementation of the bronze→silver cleaning steps of
+``BronzeToSilverTransformer``. The pandas path casts each column with
+``astype``, parses dates twice, calls ``dropna`` once per column and copies
+the frame between steps. Here every step works on Arrow arrays:
+
+- distinct date labels are parsed once and mapped back through dictionary
+  indices, and year/quarter are derived from the parsed timestamps
+- the null rules become one combined filter mask
+- duplicate detection packs per-column codes (dictionary indices instead
+  of strings) into one integer key per row and keeps the first occurrence
+
+The result is the same as the pandas pipeline, including the pandas dtypes
+seen when the silver file is read back.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality dimension columns, kept dictionary-encoded (pandas 'category')
+# from bronze through gold
+DIMENSION_COLUMNS = ('country', 'country_name', 'indicator', 'indicator_name', 'source', 'data_source')
+
+# Rows with a null in any of these columns are dropped
+REQUIRED_COLUMNS = ('value', 'indicator', 'country')
+
+# Gold growth_category labels, in pd.cut bin order
+GROWTH_CATEGORIES = ('Contraction', 'Stable', 'Growth')
+
+# Chunked mode: estimated peak bytes per decoded input byte, and batch floor
+WORKING_SET_FACTOR = 8
+MIN_BATCH_ROWS = 1024
+
+
+def encode_dimension(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Dictionary-encode a dimension column as ``astype('category')`` would.
+
+    Dictionary columns are kept as they are; plain strings get a sorted
+    dictionary, matching the category order pandas assigns.
+    """
+    if pa.types.is_dictionary(column.type):
+        return column
+    encoded = pc.dictionary_encode(column.cast(pa.string()))
+    if encoded.num_chunks == 0:
+        return encoded
+    encoded = encoded.unify_dictionaries()
+    dictionary = encoded.chunk(0).dictionary
+    order = pc.sort_indices(dictionary)
+    remap = np.empty(len(dictionary), dtype=np.int32)
+    remap[order.to_numpy()] = np.arange(len(dictionary), dtype=np.int32)
+    sorted_dictionary = dictionary.take(order)
+    return pa.chunked_array([
+        pa.DictionaryArray.from_arrays(pa.array(remap).take(chunk.indices), sorted_dictionary)
+        for chunk in encoded.chunks
+    ])
+
+
+def parse_dates(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Parse date labels to ``timestamp[ns]`` the way ``astype('datetime64[ns]')`` does.
+
+    Each distinct label is parsed once; the parsed values are then gathered
+    through the dictionary indices.
+    """
+    if pa.types.is_timestamp(column.type):
+        return column.cast(pa.timestamp('ns'))
+    if pa.types.is_dictionary(column.type):
+        encoded = column.unify_dictionaries() if column.num_chunks > 1 else column
+    else:
+        encoded = pc.dictionary_encode(column)
+    if encoded.num_chunks == 0:
+        return pa.chunked_array([], type=pa.timestamp('ns'))
+
+    labels = encoded.chunk(0).dictionary
+    parsed = pa.array(pd.Series(labels.to_pandas(), dtype=object).astype('datetime64[ns]'),
+                      type=pa.timestamp('ns'))
+    return pa.chunked_array([parsed.take(chunk.indices) for chunk in encoded.chunks], type=pa.timestamp('ns'))
+
+
+def derive_date_parts(dates: pa.ChunkedArray, part_type: Optional[pa.DataType] = None) -> Dict[str, pa.ChunkedArray]:
+    """
+    Year and quarter columns typed as pandas' ``dt.year`` / ``dt.quarter`` would be.
+
+    pandas falls back to float64 (NaN) when any date is missing; pass
+    ``part_type`` when that depends on rows outside ``dates`` (chunked runs).
+    """
+    if part_type is None:
+        part_type = pa.int32() if dates.null_count == 0 else pa.float64()
+    return {
+        'year': pc.year(dates).cast(part_type),
+        'quarter': pc.quarter(dates).cast(part_type)
+    }
+
+
+def standardize(table: pa.Table, date_part_type: Optional[pa.DataType] = None) -> pa.Table:
+    """Cast value/dimension columns, parse dates and append year/quarter."""
+    # Bronze pandas metadata describes the old types and would override the new ones
+    table = table.replace_schema_metadata(None)
+    for name in table.column_names:
+        column = table.column(name)
+        if name == 'date':
+            column = parse_dates(column)
+        elif name == 'value':
+            column = column.cast(pa.float64())
+        elif name in DIMENSION_COLUMNS:
+            column = encode_dimension(column)
+        else:
+            continue
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+
+    if 'date' in table.column_names:
+        for name, column in derive_date_parts(table.column('date'), date_part_type).items():
+            table = table.append_column(name, column)
+    return table
+
+
+def null_mask(table: pa.Table) -> pa.ChunkedArray:
+    """Mask of rows that pass every null rule (NaN counts as null for floats)."""
+    mask = None
+    for name in REQUIRED_COLUMNS:
+        if name not in table.column_names:
+            continue
+        valid = pc.invert(pc.is_null(table.column(name), nan_is_null=True))
+        mask = valid if mask is None else pc.and_(mask, valid)
+    return mask
+
+
+def _column_codes(column: pa.ChunkedArray) -> Tuple[np.ndarray, int]:
+    """
+    Dense integer codes for a column and their cardinality.
+
+    Dictionary and string columns reuse (unified) dictionary indices, so no
+    string is hashed; other columns are factorized. Nulls get their own code.
+    """
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.dictionary_encode(column)
+    if pa.types.is_dictionary(column.type):
+        if column.num_chunks > 1:
+            column = column.unify_dictionaries()
+        if column.num_chunks == 0:
+            return np.zeros(0, dtype=np.int64), 1
+        indices = pa.chunked_array([chunk.indices for chunk in column.chunks], type=column.type.index_type)
+        codes = indices.fill_null(-1).to_numpy().astype(np.int64) + 1
+        return codes, len(column.chunk(0).dictionary) + 1
+    if pa.types.is_timestamp(column.type):
+        column = column.cast(pa.int64())
+    codes, uniques = pd.factorize(column.to_numpy(zero_copy_only=False), use_na_sentinel=True)
+    return codes.astype(np.int64) + 1, len(uniques) + 1
+
+
+def drop_duplicate_rows(table: pa.Table) -> pa.Table:
+    """
+    Drop rows identical in every column, keeping the first occurrence in order.
+
+    Per-column codes are packed into a single int64 row key (re-densified
+    whenever the combined cardinality would overflow), so duplicates are
+    found by hashing one integer per row.
+    """
+    if table.num_rows == 0:
+        return table
+    key, cardinality = np.zeros(table.num_rows, dtype=np.int64), 1
+    for column in table.columns:
+        codes, column_cardinality = _column_codes(column)
+        if cardinality * column_cardinality >= 2 ** 62:
+            key, uniques = pd.factorize(key)
+            cardinality = len(uniques)
+        key = key * column_cardinality + codes
+        cardinality *= column_cardinality
+    duplicated = pd.Series(key).duplicated(keep='first').to_numpy()
+    if not duplicated.any():
+        return table
+    return table.filter(~duplicated)
+
+
+def clean(table: pa.Table, date_part_type: Optional[pa.DataType] = None) -> pa.Table:
+    """Standardize types and apply the null rules (every step except deduplication)."""
+    table = standardize(table, date_part_type)
+    mask = null_mask(table)
+    return table.filter(mask) if mask is not None else table
+
+
+def pandas_metadata(table: pa.Table) -> pa.Table:
+    """Attach the pandas schema metadata the pandas path would have written."""
+    empty = table.slice(0, 0).to_pandas()
+    return table.replace_schema_metadata(pa.Schema.from_pandas(empty, preserve_index=False).metadata)
+
+
+def encode_gold(table: pa.Table) -> pa.Table:
+    """
+    Gold table with the pandas path's column types.
+
+    Dimensions are dictionary-encoded and the integer ``growth_category``
+    codes (0..2, null outside every bin) become an ordered dictionary of
+    ``GROWTH_CATEGORIES``.
+    """
+    for name in DIMENSION_COLUMNS:
+        if name in table.column_names:
+            table = table.set_column(table.schema.get_field_index(name), name, encode_dimension(table.column(name)))
+    position = table.schema.get_field_index('growth_category')
+    codes = table.column(position).combine_chunks().cast(pa.int8())
+    categories = pa.DictionaryArray.from_arrays(codes, pa.array(GROWTH_CATEGORIES), ordered=True)
+    return table.set_column(position, 'growth_category', categories)
+
+
+def bronze_to_silver(table: pa.Table) -> Tuple[pa.Table, Dict[str, int]]:
+    """
+    Run the bronze→silver cleaning steps on an Arrow table.
+
+    Args:
+        table: Bronze data
+
+    Returns:
+        Tuple of (silver table, row statistics)
+    """
+    stats = {'rows_in': table.num_rows}
+    stats.update({f"nulls_{name}": table.column(name).null_count for name in table.column_names})
+
+    table = clean(table)
+    stats['rows_after_nulls'] = table.num_rows
+
+    table = drop_duplicate_rows(table)
+    stats['duplicates_removed'] = stats['rows_after_nulls'] - table.num_rows
+    stats['rows_out'] = table.num_rows
+
+    return pandas_metadata(table), stats
+
+
+def date_part_type(parquet_file: pq.ParquetFile) -> pa.DataType:
+    """Year/quarter type for a whole bronze file, from column statistics when available."""
+    if 'date' not in parquet_file.schema_arrow.names:
+        return pa.int32()
+    metadata = parquet_file.metadata
+    column_index = parquet_file.schema_arrow.get_field_index('date')
+    null_count = 0
+    for row_group in range(metadata.num_row_groups):
+        statistics = metadata.row_group(row_group).column(column_index).statistics
+        if statistics is None or not statistics.has_null_count:
+            null_count = parquet_file.read(columns=['date']).column('date').null_count
+            break
+        null_count += statistics.null_count
+    return pa.int32() if null_count == 0 else pa.float64()
+
+
+def plan_batch_rows(parquet_file: pq.ParquetFile, budget_bytes: int) -> int:
+    """
+    Rows per record batch so that one batch's working set fits in half the budget.
+
+    The other half is left for the cross-chunk key index. The working set is
+    estimated from the uncompressed size of the bronze file times
+    ``WORKING_SET_FACTOR`` (decoded input, cast columns, filtered copy and hashes).
+    """
+    metadata = parquet_file.metadata
+    uncompressed = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    bytes_per_row = max(1, uncompressed // max(1, metadata.num_rows)) * WORKING_SET_FACTOR
+    return max(MIN_BATCH_ROWS, (budget_bytes // 2) // bytes_per_row)
@@ -1,9 +1,17 @@
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List
+from src.transformers.key_index import SilverKeyIndex
+
 class BaseTransformer(ABC):
     """Base class for all data transformers."""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.transformation_config = config.get('transformation', {})
         self._setup_storage()
     
     def _setup_storage(self) -> None:
@@ -13,6 +21,38 @@ class BaseTransformer(ABC):
         self.silver_path.mkdir(parents=True, exist_ok=True)
         self.gold_path.mkdir(parents=True, exist_ok=True)
     
+    def _engine(self, kwargs: Dict[str, Any], supported: tuple = ('pandas', 'arrow'), key: str = 'engine') -> str:
+        """Resolve the execution engine from kwargs or the ``transformation.<key>`` config entry."""
+        engine = kwargs.get('engine', self.transformation_config.get(key, 'pandas'))
+        if engine not in supported:
+            raise ValueError(f"Unknown transformation engine for {self.__class__.__name__}: {engine}")
+        return engine
+    
+    def _workers(self, kwargs: Dict[str, Any]) -> int:
+        """Resolve the number of worker processes for partitioned execution."""
+        return max(int(kwargs.get('workers', self.transformation_config.get('workers', 1)) or 1), 1)
+    
+    def _partitions(self, workers: int) -> int:
+        """Number of hash partitions (defaults to one per worker)."""
+        return int(self.transformation_config.get('partitions', workers))
+    
+    def _partition_keys(self) -> List[str]:
+        """Columns hashed to assign rows to partitions."""
+        return list(self.transformation_config.get('partition_keys', ['country']))
+    
+    def _partition_workdir(self, output_path: Path) -> tempfile.TemporaryDirectory:
+        """Scratch directory for partition files, next to the output so the merge stays on one disk."""
+        return tempfile.TemporaryDirectory(prefix='.partitions_', dir=output_path.parent)
+    
+    def _silver_dedup(self, kwargs: Dict[str, Any]) -> bool:
+        """Whether silver files are deduplicated by row key across runs (``transformation.silver_dedup``)."""
+        return bool(kwargs.get('dedup', self.transformation_config.get('silver_dedup', False)))
+    
+    def _silver_key_index(self, source: str) -> SilverKeyIndex:
+        """Persistent row-key index of one source's silver files."""
+        index_dir = Path(self.transformation_config.get('silver_index_path', 'data/state/silver_keys'))
+        return SilverKeyIndex(index_dir / f"{source}.parquet")
+    
     @abstractmethod
     def transform(self, input_path: Path, **kwargs) -> Path:
         """Transform data from one layer to another."""
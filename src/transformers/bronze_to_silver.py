@@ -1,13 +1,25 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
 from src.transformers.base import BaseTransformer
-from src.utils.validation import DataValidator
+from src.transformers.arrow_engine import DIMENSION_COLUMNS, bronze_to_silver, clean, pandas_metadata, date_part_type, plan_batch_rows
+from src.transformers.key_index import RowHashIndex, row_hashes
+from src.transformers.partitioned import shard_files, run_partitioned, merge_parquet
+from src.utils.validation import DataValidator, QuarantineWriter
+
+# A silver row is identified by these columns; later runs replace revised values
+SILVER_KEY_COLUMNS = ('source', 'country', 'indicator', 'date')
 
 class BronzeToSilverTransformer(BaseTransformer):
     """Transform raw data from bronze to silver layer with cleaning and standardization."""
     
+    ENGINES = ('pandas', 'arrow', 'polars')
+    
     def transform(self, input_path: Path, **kwargs) -> Path:
         """
         Transform bronze (raw) data to silver (cleaned) format.
@@ -19,36 +31,286 @@ class BronzeToSilverTransformer(BaseTransformer):
         - Null handling
         - Duplicate removal
         - Basic validation
-        """
-        self.logger.info(f"Starting bronze to silver transformation for {input_path}")
-        
-        # Read bronze data
-        df = pd.read_parquet(input_path)
         
-        # Apply transformations
-        transformed_df = (df.pipe(self._standardize_datatypes)
-                          .pipe(self._normalize_dates)
-                          .pipe(self._handle_nulls)
-                          .pipe(self._remove_duplicates)
-                          .pipe(self._validate_data))
+        Args:
+            input_path: Bronze Parquet file
+            engine: 'pandas', 'arrow' or 'polars' (defaults to ``transformation.engine``)
+            chunked: Process the file in record batches within
+                ``transformation.memory_budget_mb`` (defaults to ``transformation.chunked``)
+            workers: Run hash partitions of the file in this many processes
+                (defaults to ``transformation.workers``; 1 runs in-process)
+            dedup: Deduplicate against earlier silver files by row key
+                (defaults to ``transformation.silver_dedup``)
+        """
+        engine = self._engine(kwargs, supported=self.ENGINES)
+        chunked = kwargs.get('chunked', self.transformation_config.get('chunked', False))
+        workers = self._workers(kwargs)
+        self.logger.info(f"Starting bronze to silver transformation for {input_path} "
+                         f"({'chunked' if chunked else engine} engine"
+                         f"{f', {workers} workers' if workers > 1 else ''})")
         
         # Save to silver layer
         source = input_path.stem.split('_')[0]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Microseconds keep back-to-back runs of a source from sharing a file the key index points at
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         output_path = self.silver_path / f"{source}_silver_{timestamp}.parquet"
+        if output_path.exists():
+            raise FileExistsError(f"Silver file already exists: {output_path}")
+        
+        if workers > 1:
+            self._transform_partitioned(input_path, output_path, engine, chunked, workers)
+        else:
+            self._transform_file(input_path, output_path, engine, chunked)
         
-        transformed_df.to_parquet(output_path, index=False)
+        if self._silver_dedup(kwargs):
+            self._deduplicate_across_runs(output_path, source)
         
         self.logger.info(f"Completed bronze to silver transformation: {output_path}")
         return output_path
     
+    def _transform_file(self, input_path: Path, output_path: Path, engine: str, chunked: bool) -> None:
+        """Transform one bronze file in this process, quarantining rows that fail validation."""
+        quarantine = QuarantineWriter(self._quarantine_path(output_path))
+        try:
+            self._run_engine(input_path, output_path, engine, chunked, quarantine)
+        except Exception:
+            quarantine.abort()
+            raise
+        quarantined = quarantine.close()
+        if quarantined:
+            self.logger.warning(f"Quarantined {quarantined} rows failing validation: {quarantine.path}")
+    
+    def _quarantine_path(self, output_path: Path) -> Path:
+        """Quarantine file matching a silver output file."""
+        quarantine_dir = Path(self.transformation_config.get('quarantine_path', 'data/quarantine'))
+        return quarantine_dir / output_path.name.replace('_silver_', '_quarantine_')
+    
+    def _run_engine(self, input_path: Path, output_path: Path, engine: str, chunked: bool,
+                    quarantine: QuarantineWriter) -> None:
+        if chunked:
+            self._transform_chunked(input_path, output_path, quarantine)
+        elif engine == 'arrow':
+            self._transform_arrow(input_path, output_path, quarantine)
+        elif engine == 'polars':
+            self._transform_polars(input_path, output_path, quarantine)
+        else:
+            # Read bronze data
+            df = pd.read_parquet(input_path)
+            
+            # Apply transformations
+            transformed_df = (df.pipe(self._standardize_datatypes)
+                              .pipe(self._normalize_dates)
+                              .pipe(self._handle_nulls)
+                              .pipe(self._remove_duplicates)
+                              .pipe(self._validate_data, quarantine))
+            
+            transformed_df.to_parquet(output_path, index=False)
+    
+    def _transform_partitioned(self, input_path: Path, output_path: Path, engine: str, chunked: bool,
+                               workers: int) -> None:
+        """
+        Shard the bronze file by the partition keys and transform the shards in a process pool.
+        
+        Duplicate rows share their partition keys, so per-partition
+        deduplication removes the same rows as a single pass.
+        """
+        with self._partition_workdir(output_path) as workdir:
+            # Workers quarantine into the scratch directory; their files are merged below
+            quarantine_dir = Path(workdir) / 'quarantine'
+            worker_config = {**self.config, 'transformation': {**self.transformation_config, 'engine': engine,
+                                                               'chunked': chunked, 'quarantine_path': str(quarantine_dir)}}
+            shards = shard_files([input_path], workdir, self._partitions(workers), self._partition_keys())
+            if not shards:
+                # Empty bronze file: nothing to distribute
+                return self._transform_file(input_path, output_path, engine, chunked)
+            outputs = run_partitioned(_transform_partition, worker_config, shards, workdir, workers)
+            rows = merge_parquet(outputs, output_path)
+            quarantined = sorted(quarantine_dir.glob('*.parquet'))
+            if quarantined:
+                quarantine_path = self._quarantine_path(output_path)
+                quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+                self.logger.warning(f"Quarantined {merge_parquet(quarantined, quarantine_path)} rows "
+                                    f"failing validation: {quarantine_path}")
+        self.logger.info(f"Partitioned transformation merged {len(outputs)} partitions ({rows} rows)")
+    
+    def _deduplicate_across_runs(self, output_path: Path, source: str) -> None:
+        """
+        Key-based deduplication of a new silver file against earlier runs.
+        
+        Rows are identified by ``SILVER_KEY_COLUMNS``. A persistent
+        ``SilverKeyIndex`` per source holds the key hash, full-row hash and
+        file of every silver row, so the new file is checked in O(new rows)
+        without reading earlier silver files:
+        
+        - keys repeated within the file keep their first row
+        - unchanged rows (same key and row hash) are dropped
+        - revised rows are kept and their previous version is removed from
+          the file that held it, so gold never sees both
+        
+        The new file then only holds new and revised rows; a full gold run
+        reads every silver file of the source listed in the index.
+        
+        The new file is streamed in batches sized from ``memory_budget_mb``.
+        """
+        index = self._silver_key_index(source)
+        parquet_file = pq.ParquetFile(output_path)
+        key_columns = [c for c in SILVER_KEY_COLUMNS if c in parquet_file.schema_arrow.names]
+        budget_bytes = int(self.transformation_config.get('memory_budget_mb', 1024) * 2 ** 20)
+        
+        seen = RowHashIndex()
+        kept_keys, kept_hashes, superseded = [], [], []
+        unchanged = 0
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            with pq.ParquetWriter(tmp_path, parquet_file.schema_arrow) as writer:
+                for batch in parquet_file.iter_batches(batch_size=plan_batch_rows(parquet_file, budget_bytes)):
+                    table = pa.Table.from_batches([batch])
+                    h1, h2 = row_hashes(table, key_columns)
+                    content, _ = row_hashes(table)
+                    keep = seen.add_new(h1, h2)
+                    positions = index.lookup(h1, h2)
+                    found = positions >= 0
+                    same = np.zeros(len(keep), dtype=bool)
+                    same[found] = index.row_hash[positions[found]] == content[found]
+                    unchanged += int((keep & same).sum())
+                    keep &= ~same
+                    
+                    revised = keep & found
+                    if revised.any():
+                        superseded.append((index.files(positions[revised]), h1[revised], h2[revised]))
+                    kept_keys.append((h1[keep], h2[keep]))
+                    kept_hashes.append(content[keep])
+                    writer.write_table(table.filter(pa.array(keep)))
+            os.replace(tmp_path, output_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        revised_count = self._remove_superseded(superseded, output_path.name)
+        if kept_keys:
+            index.update(np.concatenate([h1 for h1, _ in kept_keys]), np.concatenate([h2 for _, h2 in kept_keys]),
+                         np.concatenate(kept_hashes), output_path.name)
+        index.save()
+        
+        written = sum(len(hashes) for hashes in kept_hashes)
+        self.logger.info(f"Key dedup: {written - revised_count} new, {revised_count} revised, "
+                         f"{unchanged} unchanged rows skipped ({len(index)} keys indexed)")
+    
+    def _remove_superseded(self, superseded: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], current_file: str) -> int:
+        """
+        Drop the previous versions of revised rows from the silver files holding them.
+        
+        Returns:
+            Number of revised keys
+        """
+        if not superseded:
+            return 0
+        files = np.concatenate([names for names, _, _ in superseded])
+        h1 = np.concatenate([h1 for _, h1, _ in superseded])
+        h2 = np.concatenate([h2 for _, _, h2 in superseded])
+        for file_name in np.unique(files):
+            path = self.silver_path / file_name
+            if file_name == current_file:
+                continue
+            if not path.exists():
+                self.logger.warning(f"Silver file {file_name} of revised rows not found; skipping")
+                continue
+            stale = RowHashIndex()
+            in_file = files == file_name
+            stale.add_new(h1[in_file], h2[in_file])
+            table = pq.read_table(path)
+            key_columns = [c for c in SILVER_KEY_COLUMNS if c in table.column_names]
+            keep = ~stale.contains(*row_hashes(table, key_columns))
+            tmp_path = path.with_name(path.name + '.tmp')
+            pq.write_table(table.filter(pa.array(keep)), tmp_path)
+            os.replace(tmp_path, path)
+            self.logger.info(f"Removed {int((~keep).sum())} superseded rows from {file_name}")
+        return len(h1)
+    
+    def _transform_arrow(self, input_path: Path, output_path: Path, quarantine: QuarantineWriter) -> None:
+        """Run the same cleaning steps in a single pass over Arrow columns."""
+        table, stats = bronze_to_silver(pq.read_table(input_path))
+        null_stats = {key[len('nulls_'):]: count for key, count in stats.items() if key.startswith('nulls_')}
+        self.logger.info(f"Null statistics before handling: {null_stats}")
+        if stats['duplicates_removed']:
+            self.logger.warning(f"Removed {stats['duplicates_removed']} duplicate records")
+        
+        pq.write_table(self._validate_table(table, quarantine), output_path)
+    
+    def _transform_polars(self, input_path: Path, output_path: Path, quarantine: QuarantineWriter) -> None:
+        """Run the cleaning steps as one optimized Polars lazy query over the bronze file."""
+        # Imported here so polars is only required when this engine is selected
+        from src.transformers import polars_engine
+        
+        table, stats = polars_engine.bronze_to_silver(input_path)
+        null_stats = {key[len('nulls_'):]: count for key, count in stats.items() if key.startswith('nulls_')}
+        self.logger.info(f"Null statistics before handling: {null_stats}")
+        if stats['duplicates_removed']:
+            self.logger.warning(f"Removed {stats['duplicates_removed']} duplicate records")
+        
+        pq.write_table(self._validate_table(table, quarantine), output_path)
+    
+    def _transform_chunked(self, input_path: Path, output_path: Path, quarantine: QuarantineWriter) -> None:
+        """
+        Out-of-core variant of the Arrow engine.
+        
+        Bronze is read in record batches sized from the memory budget; each
+        batch is cleaned, deduplicated against a row-hash index of every row
+        already written, validated and appended to the silver file. The file
+        is written under a temporary name and renamed once complete.
+        """
+        budget_bytes = int(self.transformation_config.get('memory_budget_mb', 1024) * 2 ** 20)
+        parquet_file = pq.ParquetFile(input_path)
+        batch_rows = plan_batch_rows(parquet_file, budget_bytes)
+        part_type = date_part_type(parquet_file)
+        index = RowHashIndex()
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        writer = None
+        rows_in = rows_out = rows_after_nulls = 0
+        index_warned = False
+        
+        self.logger.info(f"Chunked transformation: {parquet_file.metadata.num_rows} rows in batches "
+                         f"of {batch_rows} (budget {budget_bytes // 2 ** 20} MB)")
+        try:
+            for batch in parquet_file.iter_batches(batch_size=batch_rows):
+                rows_in += batch.num_rows
+                table = clean(pa.Table.from_batches([batch]), part_type)
+                rows_after_nulls += table.num_rows
+                table = pandas_metadata(table.filter(index.add_new(*row_hashes(table))))
+                table = self._validate_table(table, quarantine)
+                
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                rows_out += table.num_rows
+                
+                if not index_warned and index.nbytes > budget_bytes // 2:
+                    self.logger.warning(f"Deduplication index ({index.nbytes // 2 ** 20} MB) exceeds "
+                                        f"half of the memory budget")
+                    index_warned = True
+            
+            if writer is None:
+                # Empty bronze file: write an empty silver file with the cleaned schema
+                writer = pq.ParquetWriter(tmp_path, pandas_metadata(clean(parquet_file.schema_arrow.empty_table(), part_type)).schema)
+            writer.close()
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if writer is not None:
+                writer.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        if rows_after_nulls != rows_out:
+            self.logger.warning(f"Removed {rows_after_nulls - rows_out} duplicate records")
+        self.logger.info(f"Chunked transformation wrote {rows_out} of {rows_in} rows")
+    
     def _standardize_datatypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """Standardize data types across columns."""
         type_mappings = {
             'date': 'datetime64[ns]',
             'value': 'float64',
-            'indicator': 'string',
-            'country': 'string'
+            # Dimensions stay dictionary-encoded instead of one string per row
+            **{col: 'category' for col in DIMENSION_COLUMNS}
         }
         
         for col, dtype in type_mappings.items():
@@ -96,18 +358,68 @@ class BronzeToSilverTransformer(BaseTransformer):
         
         return df
     
-    def _validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Validate transformed data."""
-        validator = DataValidator()
-        validation_rules = {
+    def _validation_rules(self) -> Dict[str, Dict[str, Any]]:
+        """Range rules for silver data."""
+        return {
             'date': {'min_year': 1960, 'max_year': datetime.now().year},
             'value': {'min_value': -100, 'max_value': 1000000}
         }
+    
+    def _rejected_rows(self, df: pd.DataFrame,
+                       quarantine: Optional[QuarantineWriter]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Evaluate the validation rules in one pass.
         
-        validation_results = validator.validate(df, validation_rules)
+        Args:
+            df: Data to validate
+            quarantine: Writer for rejected rows; without one, violations raise
+        
+        Returns:
+            None when every row passes, else (mask of rejected rows, violated rule names per rejected row)
+        
+        Raises:
+            ValueError: On violations when ``transformation.validation_mode`` is 'fail'
+                or no quarantine writer is given
+        """
+        validator = DataValidator(self._validation_rules())
+        validation_results = validator.validate(df, sample_rows=self.transformation_config.get('validation_sample_rows'))
+        if validation_results['is_valid']:
+            return None
         
-        if not validation_results['is_valid']:
+        if self.transformation_config.get('validation_mode', 'quarantine') == 'fail' or quarantine is None:
             self.logger.error(f"Data validation failed: {validation_results['errors']}")
             raise ValueError("Data validation failed")
         
-        return df
\ No newline at end of file
+        self.logger.warning(f"Data validation: {validation_results['errors']}")
+        violations = validation_results['violations']
+        rejected = violations != 0
+        return rejected, validator.labels(violations[rejected])
+    
+    def _validate_data(self, df: pd.DataFrame, quarantine: Optional[QuarantineWriter] = None) -> pd.DataFrame:
+        """Validate transformed data, moving failing rows to ``quarantine``."""
+        rejected = self._rejected_rows(df, quarantine)
+        if rejected is None:
+            return df
+        
+        mask, labels = rejected
+        quarantine.write(pa.Table.from_pandas(df[mask], preserve_index=False), labels)
+        return df[~mask]
+    
+    def _validate_table(self, table: pa.Table, quarantine: Optional[QuarantineWriter] = None) -> pa.Table:
+        """Arrow counterpart of ``_validate_data``."""
+        # Only the validated columns are materialized in pandas
+        rules = self._validation_rules()
+        rejected = self._rejected_rows(table.select([c for c in rules if c in table.column_names]).to_pandas(), quarantine)
+        if rejected is None:
+            return table
+        
+        mask, labels = rejected
+        quarantine.write(table.filter(pa.array(mask)), labels)
+        return table.filter(pa.array(~mask))
+
+
+def _transform_partition(config: Dict[str, Any], shard_paths: List[Path], output_path: Path) -> None:
+    """Process-pool worker: transform one bronze shard with the configured engine."""
+    transformer = BronzeToSilverTransformer(config)
+    transformer._transform_file(shard_paths[0], output_path, transformer._engine({}, supported=transformer.ENGINES),
+                                transformer.transformation_config.get('chunked', False))
@@ -0,0 +1,194 @@
+"""
+DuckDB Silver-to-Gold Engine
+
+SQL implementation of ``SilverToGoldTransformer`` on an embedded DuckDB
+connection. Silver Parquet files are scanned in place instead of being
+loaded and concatenated in pandas; the series metrics become window
+functions, the business rules CASE expressions and the gold aggregates
+GROUP BY queries. DuckDB runs these multi-threaded and spills to
+``temp_directory`` once ``memory_limit`` is reached.
+
+The gold file holds the same rows, in the same order, as the pandas path:
+dimension columns and ``growth_category`` are written dictionary-encoded and
+``is_anomaly`` is False where the z-score is undefined.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.transformers.aggregates import AGGREGATE_TABLES, MEMBER_COLUMNS, GoldAggregateStore
+from src.transformers.arrow_engine import encode_gold
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from DuckDB per record batch while writing gold
+FETCH_BATCH_ROWS = 1_000_000
+
+# pandas aggregation name -> DuckDB aggregate function
+SQL_AGGREGATES = {'mean': 'avg', 'median': 'median', 'std': 'stddev_samp', 'min': 'min', 'max': 'max'}
+
+
+def connect(memory_limit_mb: Optional[int] = None, threads: Optional[int] = None,
+            temp_directory: Optional[Path] = None) -> duckdb.DuckDBPyConnection:
+    """In-memory DuckDB connection with the given resource limits."""
+    config: Dict[str, Any] = {}
+    if memory_limit_mb:
+        config['memory_limit'] = f"{int(memory_limit_mb)}MB"
+    if threads:
+        config['threads'] = int(threads)
+    if temp_directory:
+        Path(temp_directory).mkdir(parents=True, exist_ok=True)
+        config['temp_directory'] = str(temp_directory)
+    return duckdb.connect(config=config)
+
+
+def _literal(value: Any) -> str:
+    """SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def silver_query(input_paths: Sequence[Path]) -> str:
+    """
+    Union of the silver files tagged with ``data_source`` (file name prefix).
+
+    ``__file``/``__row`` carry the position of each row in the pandas
+    concatenation, used to break date ties and to restore the row order.
+    """
+    selects = [
+        f"SELECT * EXCLUDE (file_row_number), {_literal(Path(path).stem.split('_')[0])} AS data_source, "
+        f"{number} AS __file, file_row_number AS __row "
+        f"FROM read_parquet({_literal(path)}, file_row_number = true)"
+        for number, path in enumerate(input_paths)
+    ]
+    # BY NAME: World Bank and IMF silver files have different columns
+    return "\nUNION ALL BY NAME\n".join(selects)
+
+
+def gold_query(input_paths: Sequence[Path], yoy_periods: int, ma_window: int) -> str:
+    """Metrics and business rules over the silver union, in the pandas row order."""
+    return f"""
+        WITH silver AS ({silver_query(input_paths)}),
+        metrics AS (
+            SELECT *,
+                value / lag(value, {yoy_periods}) OVER series - 1 AS yoy_change,
+                CASE WHEN count(value) OVER ma_frame = {ma_window} THEN avg(value) OVER ma_frame END AS ma_3year,
+                (value - avg(value) OVER series_all) / stddev_samp(value) OVER series_all AS zscore
+            FROM silver
+            WINDOW series AS (PARTITION BY country, indicator ORDER BY date NULLS FIRST, __file, __row),
+                   ma_frame AS (series ROWS BETWEEN {ma_window - 1} PRECEDING AND CURRENT ROW),
+                   series_all AS (PARTITION BY country, indicator)
+        )
+        SELECT * EXCLUDE (__file, __row),
+            -- pd.cut bins (-inf, -0.02], (-0.02, 0.02], (0.02, inf]; NaN compares greater than
+            -- everything in DuckDB, so it is excluded explicitly
+            CASE WHEN yoy_change > '-inf'::DOUBLE AND yoy_change <= -0.02 THEN 0
+                 WHEN yoy_change > -0.02 AND yoy_change <= 0.02 THEN 1
+                 WHEN yoy_change > 0.02 AND NOT isnan(yoy_change) THEN 2
+            END::TINYINT AS growth_category,
+            coalesce(abs(zscore) > 3 AND NOT isnan(zscore), false) AS is_anomaly
+        FROM metrics
+        ORDER BY __file, __row
+    """
+
+
+def write_gold(con: duckdb.DuckDBPyConnection, input_paths: Sequence[Path], output_path: Path,
+               yoy_periods: int, ma_window: int) -> int:
+    """
+    Run the gold query and stream its result into ``output_path``.
+
+    Returns:
+        Number of rows written
+    """
+    reader = con.execute(gold_query(input_paths, yoy_periods, ma_window)).to_arrow_reader(FETCH_BATCH_ROWS)
+    writer = None
+    rows = 0
+    try:
+        for batch in reader:
+            table = encode_gold(pa.Table.from_batches([batch]))
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += table.num_rows
+        if writer is None:
+            # No silver rows: keep the gold schema
+            writer = pq.ParquetWriter(output_path, encode_gold(reader.schema.empty_table()).schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _aggregate_query(source: str, key: str, aggregations: Dict[str, object]) -> str:
+    """GROUP BY (year, ``key``) producing the same ``<column>_<stat>`` columns as ``aggregates.aggregate``."""
+    expressions = []
+    for column, stats in aggregations.items():
+        for stat in [stats] if isinstance(stats, str) else stats:
+            expressions.append(f"{SQL_AGGREGATES[stat]}({column}) AS {column}_{stat}")
+    return f"SELECT year, {key}, {', '.join(expressions)} FROM {source} GROUP BY year, {key}"
+
+
+def _existing(store: GoldAggregateStore, table: str, years: Sequence[int]) -> Optional[str]:
+    """Scan of the stored partitions of ``table`` for ``years`` (None when there are none)."""
+    paths = [str(store.path(table, year)) for year in years if store.path(table, year).exists()]
+    if not paths:
+        return None
+    return (f"read_parquet([{', '.join(_literal(path) for path in paths)}], "
+            f"hive_partitioning = true, hive_types = {{'year': BIGINT}}, union_by_name = true)")
+
+
+def _write_by_year(store: GoldAggregateStore, result: pa.Table, table: str) -> List[Path]:
+    """Split a result ordered by year into one partition file per year."""
+    years = result.column('year').to_numpy()
+    boundaries = np.flatnonzero(np.diff(years)) + 1
+    paths = []
+    for start, end in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [len(years)]])):
+        partition = result.slice(start, end - start)
+        paths.append(store.write_table(partition.drop_columns(['year']), table, int(years[start])))
+    return paths
+
+
+def refresh_aggregates(con: duckdb.DuckDBPyConnection, gold_path: Path, store: GoldAggregateStore,
+                       replace: bool = False) -> Dict[str, List[Path]]:
+    """
+    SQL counterpart of ``GoldAggregateStore.refresh`` reading the gold file in place.
+
+    Only the year partitions present in the gold file are rewritten, and
+    within them only the touched countries and indicators are recomputed.
+    All touched years are handled by one query per table.
+    """
+    member_columns = ', '.join(MEMBER_COLUMNS)
+    con.execute(f"""CREATE OR REPLACE TEMP TABLE new_members AS
+                    SELECT CAST(year AS BIGINT) AS year, {member_columns}
+                    FROM read_parquet({_literal(gold_path)})
+                    WHERE year IS NOT NULL AND NOT isnan(year)""")
+    years = [year for (year,) in con.execute("SELECT DISTINCT year FROM new_members ORDER BY 1").fetchall()]
+
+    members = "SELECT * FROM new_members"
+    stored_members = _existing(store, '_members', years)
+    if stored_members is not None:
+        kept = f"SELECT year, {member_columns} FROM {stored_members}"
+        if replace:
+            kept += (" WHERE (year, country, indicator) NOT IN "
+                     "(SELECT DISTINCT year, country, indicator FROM new_members)")
+        members = f"{kept} UNION ALL {members}"
+    con.execute(f"CREATE OR REPLACE TEMP TABLE members AS {members}")
+
+    written: Dict[str, List[Path]] = {
+        '_members': _write_by_year(store, con.execute("SELECT * FROM members ORDER BY year").to_arrow_table(), '_members')
+    } if years else {'_members': []}
+    for table, (key, aggregations) in AGGREGATE_TABLES.items():
+        touched = f"(year, {key}) IN (SELECT DISTINCT year, {key} FROM new_members)"
+        fresh = _aggregate_query(f"members WHERE {touched}", key, aggregations)
+        stored = _existing(store, table, years)
+        if stored is not None:
+            fresh = f"SELECT * FROM {stored} WHERE NOT {touched} UNION ALL BY NAME {fresh}"
+        result = con.execute(f"SELECT * FROM ({fresh}) ORDER BY year, {key}").to_arrow_table()
+        written[table] = _write_by_year(store, result, table) if years else []
+
+    logger.info(f"Refreshed {len(years)} year partitions of the gold aggregates")
+    return written
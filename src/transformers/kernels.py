@@ -0,0 +1,116 @@
+"""
+Sorted-Segment Series Kernels
+
+Vectorized NumPy kernels for per-series time-series metrics. Rows are
+sorted once by (country, indicator, date) so that every series occupies a
+contiguous segment; each metric is then a handful of array operations over
+the whole column, with segment boundaries handled by masks instead of a
+Python call per group.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def segment_starts(group_codes: np.ndarray) -> np.ndarray:
+    """Start offsets of the runs of equal codes in an already grouped array."""
+    if len(group_codes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate([[True], group_codes[1:] != group_codes[:-1]]))
+
+
+def positions_in_segment(starts: np.ndarray, size: int) -> np.ndarray:
+    """Offset of every row from the start of its segment."""
+    lengths = np.diff(np.append(starts, size))
+    return np.arange(size) - np.repeat(starts, lengths)
+
+
+def pct_change(values: np.ndarray, positions: np.ndarray, periods: int) -> np.ndarray:
+    """``x / x.shift(periods) - 1`` within each segment."""
+    result = np.full(len(values), np.nan)
+    valid = positions >= periods
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[valid] = values[valid] / values[np.flatnonzero(valid) - periods] - 1
+    return result
+
+
+def rolling_mean(values: np.ndarray, positions: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` rows within each segment (NaN until the window is full)."""
+    result = np.full(len(values), np.nan)
+    if len(values) < window:
+        return result
+    # Summing each window directly avoids the cancellation error of differenced cumsums
+    sums = sliding_window_view(values, window).sum(axis=1)
+    valid = positions >= window - 1
+    result[valid] = sums[np.flatnonzero(valid) - (window - 1)] / window
+    return result
+
+
+def zscore(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """``(x - mean) / std`` per segment with the sample standard deviation (ddof=1)."""
+    if len(values) == 0:
+        return np.zeros(0)
+    lengths = np.diff(np.append(starts, len(values)))
+    means = np.add.reduceat(values, starts) / lengths
+    deviations = values - np.repeat(means, lengths)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stds = np.sqrt(np.add.reduceat(deviations ** 2, starts) / (lengths - 1))
+        return deviations / np.repeat(stds, lengths)
+
+
+def group_codes(keys: Sequence[pd.Series]) -> np.ndarray:
+    """One int64 code per row identifying its series (codes sort like the keys)."""
+    group = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        codes, uniques = pd.factorize(key, sort=True)
+        group = group * (len(uniques) + 1) + (codes + 1)
+    return group
+
+
+def series_order(group: np.ndarray, dates: pd.Series) -> np.ndarray:
+    """Stable row order grouping each series together in date order."""
+    date_codes, date_uniques = pd.factorize(dates, sort=True)
+    key = group * (len(date_uniques) + 1) + (date_codes + 1)
+    rows = len(key)
+    if rows == 0 or (int(key.max()) + 1) * rows >= 2 ** 63:
+        return np.argsort(key, kind='stable')
+    # The row number breaks ties, so the faster unstable sort yields the stable order
+    return np.argsort(key * rows + np.arange(rows))
+
+
+def series_metrics(
+    keys: Sequence[pd.Series],
+    dates: pd.Series,
+    values: np.ndarray,
+    yoy_periods: int,
+    ma_window: int
+) -> Dict[str, np.ndarray]:
+    """
+    yoy_change, ma_3year and zscore for every row, returned in the input row order.
+
+    Args:
+        keys: Series key columns, e.g. country and indicator
+        dates: Period of each row (defines order within a series)
+        values: Observation values
+        yoy_periods: Periods for the percentage change
+        ma_window: Rolling mean window
+    """
+    group = group_codes(keys)
+    order = series_order(group, dates)
+    sorted_values = np.asarray(values, dtype='float64')[order]
+    starts = segment_starts(group[order])
+    positions = positions_in_segment(starts, len(order))
+
+    metrics = {
+        'yoy_change': pct_change(sorted_values, positions, yoy_periods),
+        'ma_3year': rolling_mean(sorted_values, positions, ma_window),
+        'zscore': zscore(sorted_values, starts)
+    }
+    for name, sorted_metric in metrics.items():
+        metric = np.empty_like(sorted_metric)
+        metric[order] = sorted_metric
+        metrics[name] = metric
+    return metrics
@@ -0,0 +1,242 @@
+"""
+Row Hash Key Index
+
+Compact set of 128-bit row hashes used to drop duplicates that span chunk
+boundaries when data is processed out of core. Each row is reduced to two
+independent 64-bit hashes, so the index costs 16 bytes per distinct row
+regardless of how wide the rows are.
+
+Hashes are kept in sorted runs that are merged geometrically (like a
+binary counter), which keeps both insertion and lookup at O(log n) per
+key amortized without ever re-sorting the whole index.
+
+``SilverKeyIndex`` is the persistent variant used across runs: it maps the
+hash of a row's key columns to the hash of the whole row and the silver
+file that holds it.
+"""
+
+import os
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Seeds for the two hash chains and the matching string hash keys (16 bytes each)
+_SEEDS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+_STRING_KEYS = ('etl-row-hash-k01', 'etl-row-hash-k02')
+_NULL = np.uint64(0x7FF8DEADBEEF0001)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer over a uint64 array (wrapping arithmetic)."""
+    with np.errstate(over='ignore'):
+        values = values ^ (values >> np.uint64(30))
+        values = values * np.uint64(0xBF58476D1CE4E5B9)
+        values = values ^ (values >> np.uint64(27))
+        values = values * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+
+def _column_hashes(column: pa.ChunkedArray, string_key: str) -> np.ndarray:
+    """Per-row uint64 value hash; strings are hashed once per distinct value."""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.dictionary_encode(column)
+    if pa.types.is_dictionary(column.type):
+        parts = []
+        for chunk in column.chunks:
+            labels = chunk.dictionary.to_numpy(zero_copy_only=False).astype(object)
+            label_hashes = np.append(pd.util.hash_array(labels, hash_key=string_key), _NULL)
+            indices = chunk.indices.fill_null(len(labels)).to_numpy(zero_copy_only=False)
+            parts.append(label_hashes[indices])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint64)
+
+    if pa.types.is_floating(column.type):
+        # Normalize -0.0 and NaN payloads so equal values hash equally
+        values = column.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        bits = np.where(np.isnan(values), np.nan, values + 0.0).view(np.uint64)
+    else:
+        # Integers, booleans and timestamps hash by their int64 value in every batch
+        bits = column.cast(pa.int64()).fill_null(0).to_numpy(zero_copy_only=False).view(np.uint64)
+    if column.null_count:
+        bits = np.where(column.is_null().to_numpy(zero_copy_only=False), _NULL, bits)
+    return bits
+
+
+def row_hashes(table: pa.Table, columns: Sequence[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two independent 64-bit hashes per row over the given columns (all by default).
+
+    Returns:
+        Tuple of uint64 arrays (h1, h2)
+    """
+    columns = list(columns) if columns is not None else table.column_names
+    chains = []
+    for seed, string_key in zip(_SEEDS, _STRING_KEYS):
+        hashes = np.full(table.num_rows, seed, dtype=np.uint64)
+        for name in columns:
+            hashes = _mix(hashes ^ _mix(_column_hashes(table.column(name), string_key) ^ seed))
+        chains.append(hashes)
+    return chains[0], chains[1]
+
+
+class RowHashIndex:
+    """
+    Set of (h1, h2) row hashes stored as uint64 runs sorted by h1.
+
+    Use ``add_new`` to test a batch against everything seen so far and
+    record the batch's new keys in one step.
+    """
+
+    def __init__(self):
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return sum(len(h1) for h1, _ in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index."""
+        return sum(h1.nbytes + h2.nbytes for h1, h2 in self._runs)
+
+    def contains(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """Boolean mask of keys already present in the index."""
+        # Probing in sorted order keeps the binary searches cache friendly
+        order = np.argsort(h1)
+        h1, h2 = h1[order], h2[order]
+        found = np.zeros(len(h1), dtype=bool)
+        for run_h1, run_h2 in self._runs:
+            position = np.searchsorted(run_h1, h1)
+            clipped = np.minimum(position, len(run_h1) - 1)
+            first_hit = (position < len(run_h1)) & (run_h1[clipped] == h1)
+            found |= first_hit & (run_h2[clipped] == h2)
+
+            # Rare h1 collisions: scan the equal-h1 range for the matching h2
+            for row in np.flatnonzero(first_hit & ~found):
+                end = np.searchsorted(run_h1, h1[row], side='right')
+                found[row] = bool((run_h2[position[row]:end] == h2[row]).any())
+
+        result = np.empty_like(found)
+        result[order] = found
+        return result
+
+    def add_new(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """
+        Record a batch of keys and return the mask of rows to keep.
+
+        A row is kept when its key was not in the index and it is the first
+        occurrence of that key within the batch.
+        """
+        keep = ~pd.DataFrame({'h1': h1, 'h2': h2}).duplicated(keep='first').to_numpy()
+        if self._runs:
+            keep &= ~self.contains(h1, h2)
+        if keep.any():
+            self._add_run(h1[keep], h2[keep])
+        return keep
+
+    def _add_run(self, h1: np.ndarray, h2: np.ndarray) -> None:
+        # Runs are sorted by h1 only; contains() scans equal-h1 ranges for h2
+        order = np.argsort(h1)
+        self._runs.append((h1[order], h2[order]))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            (a1, a2), (b1, b2) = self._runs[-2], self._runs.pop()
+            merged_h1, merged_h2 = np.concatenate([a1, b1]), np.concatenate([a2, b2])
+            # Stable sort merges the two sorted runs in linear time
+            order = np.argsort(merged_h1, kind='stable')
+            self._runs[-1] = (merged_h1[order], merged_h2[order])
+
+
+class SilverKeyIndex:
+    """
+    Persistent index of the silver rows of one source, keyed by row key.
+
+    For every (h1, h2) key hash it keeps the hash of the full row and the
+    silver file holding that version, sorted by h1 so a batch of keys is
+    looked up with binary searches. File names are stored once each, as a
+    Parquet dictionary column.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.h1 = np.zeros(0, dtype=np.uint64)
+        self.h2 = np.zeros(0, dtype=np.uint64)
+        self.row_hash = np.zeros(0, dtype=np.uint64)
+        self.file_codes = np.zeros(0, dtype=np.int32)
+        self.file_names: List[str] = []
+        if self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.h1)
+
+    def _load(self) -> None:
+        table = pq.read_table(self.path)
+        # Copies: Arrow-backed arrays are read-only and update() writes in place
+        self.h1 = table.column('h1').to_numpy().copy()
+        self.h2 = table.column('h2').to_numpy().copy()
+        self.row_hash = table.column('row_hash').to_numpy().copy()
+        files = table.column('file').combine_chunks()
+        if not pa.types.is_dictionary(files.type):
+            files = pc.dictionary_encode(files)
+        self.file_names = files.dictionary.to_pylist()
+        self.file_codes = files.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+
+    def lookup(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """Index position of every key, or -1 for keys not in the index."""
+        positions = np.full(len(h1), -1, dtype=np.int64)
+        if len(self.h1) == 0:
+            return positions
+        start = np.searchsorted(self.h1, h1)
+        clipped = np.minimum(start, len(self.h1) - 1)
+        hit = (start < len(self.h1)) & (self.h1[clipped] == h1)
+        match = hit & (self.h2[clipped] == h2)
+        positions[match] = clipped[match]
+
+        # Rare h1 collisions: scan the equal-h1 range for the matching h2
+        for row in np.flatnonzero(hit & ~match):
+            end = np.searchsorted(self.h1, h1[row], side='right')
+            candidates = np.flatnonzero(self.h2[start[row]:end] == h2[row])
+            if len(candidates):
+                positions[row] = start[row] + candidates[0]
+        return positions
+
+    def files(self, positions: np.ndarray) -> np.ndarray:
+        """Silver file names at the given index positions."""
+        return np.asarray(self.file_names, dtype=object)[self.file_codes[positions]]
+
+    def live_files(self) -> List[str]:
+        """Names of the silver files holding at least one indexed row, in name (creation) order."""
+        return sorted(self.file_names[code] for code in np.unique(self.file_codes))
+
+    def update(self, h1: np.ndarray, h2: np.ndarray, row_hash: np.ndarray, file_name: str) -> None:
+        """Record (or move) keys as stored in ``file_name`` with the given row hashes."""
+        if file_name not in self.file_names:
+            self.file_names.append(file_name)
+        code = self.file_names.index(file_name)
+        positions = self.lookup(h1, h2)
+        found = positions >= 0
+        self.row_hash[positions[found]] = row_hash[found]
+        self.file_codes[positions[found]] = code
+
+        new = ~found
+        if new.any():
+            h1_all = np.concatenate([self.h1, h1[new]])
+            order = np.argsort(h1_all, kind='stable')
+            self.h1 = h1_all[order]
+            self.h2 = np.concatenate([self.h2, h2[new]])[order]
+            self.row_hash = np.concatenate([self.row_hash, row_hash[new]])[order]
+            self.file_codes = np.concatenate([self.file_codes, np.full(int(new.sum()), code, dtype=np.int32)])[order]
+
+    def save(self) -> None:
+        """Atomically persist the index, dropping file names no longer referenced."""
+        used, codes = np.unique(self.file_codes, return_inverse=True)
+        files = pa.DictionaryArray.from_arrays(pa.array(codes.astype(np.int32), type=pa.int32()),
+                                               pa.array([self.file_names[code] for code in used], type=pa.string()))
+        table = pa.table({'h1': self.h1, 'h2': self.h2, 'row_hash': self.row_hash, 'file': files})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,153 @@
+"""
+Gold Metric Window State
+
+Persists, per (country, indicator) series, what the silver→gold metrics
+need to continue from where the previous run stopped:
+
+- ``last_date``: latest period already emitted to gold
+- ``count`` / ``mean`` / ``m2``: Welford running moments of the full
+  history, for the z-score
+- ``window``: trailing values needed by pct_change and the rolling mean
+
+With this state a run only computes metrics for periods newer than
+``last_date`` instead of the whole history of every series.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.transformers.kernels import group_codes, segment_starts, positions_in_segment, pct_change, rolling_mean
+
+logger = logging.getLogger(__name__)
+
+SERIES_KEYS = ['country', 'indicator']
+
+STATE_SCHEMA = pa.schema([
+    ('country', pa.string()),
+    ('indicator', pa.string()),
+    ('last_date', pa.timestamp('ns')),
+    ('count', pa.int64()),
+    ('mean', pa.float64()),
+    ('m2', pa.float64()),
+    ('window', pa.list_(pa.float64()))
+])
+
+
+class MetricStateStore:
+    """Parquet-backed per-series metric state, indexed by (country, indicator)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = self._load()
+
+    def _load(self) -> pd.DataFrame:
+        if not self.path.exists():
+            return STATE_SCHEMA.empty_table().to_pandas().set_index(SERIES_KEYS)
+        return pq.read_table(self.path).to_pandas().set_index(SERIES_KEYS)
+
+    def save(self) -> None:
+        """Atomically persist the state."""
+        table = pa.Table.from_pandas(self.state.reset_index(), schema=STATE_SCHEMA, preserve_index=False)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
+
+
+def _series_index(df: pd.DataFrame) -> pd.MultiIndex:
+    """(country, indicator) index with plain string levels, matching the stored state."""
+    return pd.MultiIndex.from_arrays([df[key].astype(str).to_numpy() for key in SERIES_KEYS], names=SERIES_KEYS)
+
+
+def incremental_metrics(
+    df: pd.DataFrame,
+    state: pd.DataFrame,
+    yoy_periods: int,
+    ma_window: int
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute yoy_change, ma_3year and zscore for periods newer than the state.
+
+    Rows at or before a series' ``last_date`` are treated as already
+    emitted and dropped. The z-score of new rows uses the running moments
+    after this batch, i.e. the full history as of this run.
+
+    Args:
+        df: Combined silver rows
+        state: Current state (see ``MetricStateStore``)
+        yoy_periods: Periods for pct_change
+        ma_window: Rolling mean window
+
+    Returns:
+        Tuple of (new rows with metrics, updated state)
+    """
+    window_size = max(yoy_periods, ma_window - 1)
+    series = _series_index(df)
+    last_date = state['last_date'].reindex(series).to_numpy()
+    is_new = pd.isna(last_date) | (df['date'].to_numpy() > last_date)
+    new_rows = df[is_new]
+    if new_rows.empty:
+        return new_rows.assign(yoy_change=np.float64(), ma_3year=np.float64(), zscore=np.float64()), state
+
+    # Trailing values from the previous run go in front of each touched series
+    new_rows = new_rows.sort_values(SERIES_KEYS + ['date'], kind='stable',
+                                    key=lambda column: column.astype(str) if column.name in SERIES_KEYS else column)
+    new_series = _series_index(new_rows)
+    by_series = [new_series.get_level_values(key) for key in SERIES_KEYS]
+    touched = new_series.unique()
+    windows = state['window'].reindex(touched).dropna()
+    prefix = windows.explode().dropna().astype('float64')
+    history = pd.DataFrame({
+        'country': np.concatenate([prefix.index.get_level_values(0), new_series.get_level_values(0)]),
+        'indicator': np.concatenate([prefix.index.get_level_values(1), new_series.get_level_values(1)]),
+        'value': np.concatenate([prefix.to_numpy(), new_rows['value'].to_numpy(dtype='float64')]),
+        'is_new': np.concatenate([np.zeros(len(prefix), dtype=bool), np.ones(len(new_rows), dtype=bool)])
+    })
+    # Stable sort keeps each series' prefix ahead of its new rows
+    history = history.sort_values(SERIES_KEYS, kind='stable', ignore_index=True)
+
+    history_values = history['value'].to_numpy()
+    positions = positions_in_segment(segment_starts(group_codes([history[key] for key in SERIES_KEYS])), len(history))
+    history['yoy_change'] = pct_change(history_values, positions, yoy_periods)
+    history['ma_3year'] = rolling_mean(history_values, positions, ma_window)
+
+    # Welford merge of this batch's moments into the running ones
+    batch = new_rows.groupby(by_series)['value'].agg(['count', 'mean', 'var'])
+    previous = state.reindex(batch.index)
+    n_a = previous['count'].fillna(0).to_numpy(dtype='float64')
+    mean_a = previous['mean'].fillna(0).to_numpy(dtype='float64')
+    m2_a = previous['m2'].fillna(0).to_numpy(dtype='float64')
+    n_b = batch['count'].to_numpy(dtype='float64')
+    mean_b = batch['mean'].to_numpy(dtype='float64')
+    m2_b = (batch['var'].fillna(0) * (batch['count'] - 1)).to_numpy(dtype='float64')
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+
+    position = batch.index.get_indexer(new_series)
+    new_metrics = history[history['is_new']]
+    result = new_rows.assign(
+        yoy_change=new_metrics['yoy_change'].to_numpy(),
+        ma_3year=new_metrics['ma_3year'].to_numpy(),
+        zscore=(new_rows['value'].to_numpy(dtype='float64') - mean[position]) / std[position]
+    ).sort_index()
+
+    updates = pd.DataFrame({
+        'last_date': new_rows.groupby(by_series)['date'].max().to_numpy(),
+        'count': n.astype('int64'),
+        'mean': mean,
+        'm2': m2,
+        'window': history.groupby(SERIES_KEYS, sort=False).tail(window_size)
+                         .groupby(SERIES_KEYS, sort=False)['value'].agg(list).reindex(batch.index).to_numpy()
+    }, index=batch.index)
+    state = pd.concat([state.drop(batch.index, errors='ignore'), updates])
+    return result, state
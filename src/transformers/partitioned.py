@@ -0,0 +1,122 @@
+"""
+Partitioned Process-Pool Execution
+
+Runs a transformer step over hash partitions of its input in separate
+processes, so CPU-bound pandas/Arrow work scales with cores instead of being
+serialized by the GIL. Rows are assigned to a partition by hashing the
+partition key columns (``country`` by default), which keeps every
+(country, indicator) series and every duplicate row inside one partition.
+
+Partitions are exchanged through Parquet files on local disk rather than
+pickled DataFrames: the parent shards each input file into
+``<workdir>/part-NNN/<input name>``, each worker reads its shard files and
+writes one output file, and the parent merges the outputs with a streaming
+Parquet writer. Merged rows are grouped by partition.
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.transformers.key_index import row_hashes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION_KEYS = ('country',)
+
+# Rows read per batch while sharding
+SHARD_BATCH_ROWS = 1_000_000
+
+
+def partition_ids(table: pa.Table, key_columns: Sequence[str], partitions: int) -> np.ndarray:
+    """Partition number of every row, from a hash of its key columns."""
+    h1, _ = row_hashes(table, key_columns)
+    return (h1 % np.uint64(partitions)).astype(np.int64)
+
+
+def shard_files(input_paths: Sequence[Path], workdir: Path, partitions: int,
+                key_columns: Sequence[str] = DEFAULT_PARTITION_KEYS) -> List[List[Path]]:
+    """
+    Split input Parquet files into hash partitions.
+
+    Each input file is sharded separately (inputs may have different
+    schemas) and keeps its file name inside the partition directory.
+
+    Returns:
+        Shard files per partition; partitions that received no rows are omitted
+    """
+    workdir = Path(workdir)
+    shards: Dict[int, List[Path]] = {}
+    for input_path in input_paths:
+        parquet_file = pq.ParquetFile(input_path)
+        writers: Dict[int, pq.ParquetWriter] = {}
+        try:
+            for batch in parquet_file.iter_batches(batch_size=SHARD_BATCH_ROWS):
+                table = pa.Table.from_batches([batch])
+                ids = partition_ids(table, key_columns, partitions)
+                order = np.argsort(ids, kind='stable')
+                table = table.take(order)
+                counts = np.bincount(ids, minlength=partitions)
+                offset = 0
+                for partition in np.flatnonzero(counts):
+                    if partition not in writers:
+                        path = workdir / f"part-{partition:03d}" / Path(input_path).name
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        writers[partition] = pq.ParquetWriter(path, table.schema)
+                        shards.setdefault(partition, []).append(path)
+                    writers[partition].write_table(table.slice(offset, counts[partition]))
+                    offset += counts[partition]
+        finally:
+            for writer in writers.values():
+                writer.close()
+    return [shards[partition] for partition in sorted(shards)]
+
+
+def run_partitioned(worker: Callable[[Dict[str, Any], List[Path], Path], Any], config: Dict[str, Any],
+                    shards: List[List[Path]], workdir: Path, workers: int) -> List[Path]:
+    """
+    Run ``worker(config, shard_paths, output_path)`` for every partition in a process pool.
+
+    ``worker`` must be a module-level function so it can be sent to the
+    worker processes; it builds its own transformer from ``config``.
+
+    Returns:
+        Output file of each partition, in partition order
+    """
+    output_paths = [Path(workdir) / f"out-{number:03d}.parquet" for number in range(len(shards))]
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(shards), 1))) as executor:
+        # list() re-raises the first worker exception in the parent
+        list(executor.map(worker, [config] * len(shards), shards, output_paths))
+    return output_paths
+
+
+def merge_parquet(input_paths: Sequence[Path], output_path: Path) -> int:
+    """
+    Concatenate partition outputs into one Parquet file, one partition in memory at a time.
+
+    Schemas are unified first (e.g. int32 years in one partition and float64
+    in another), so every partition is cast to the common schema.
+
+    Returns:
+        Number of rows written
+    """
+    schema = pa.unify_schemas([pq.read_schema(path) for path in input_paths], promote_options='permissive')
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    rows = 0
+    try:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for path in input_paths:
+                table = pq.read_table(path)
+                writer.write_table(table.select(schema.names).cast(schema)
+                                   if table.schema != schema else table)
+                rows += table.num_rows
+        os.replace(tmp_path, output_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return rows
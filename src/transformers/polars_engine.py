@@ -0,0 +1,148 @@
+"""
+Polars Lazy Engine
+
+``BronzeToSilverTransformer`` and ``SilverToGoldTransformer`` steps
+expressed as Polars LazyFrame plans. Each stage is built from
+``scan_parquet`` and collected once, so the query optimizer pushes the
+column projection and the null filters into the Parquet scan, shares
+common subplans between the statistics and the result, and runs the plan
+multi-threaded.
+
+Results are converted to Arrow and written with the same schema helpers as
+the Arrow engine, so silver and gold read back with the pandas path's rows,
+row order and dtypes.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.transformers.arrow_engine import (DIMENSION_COLUMNS, REQUIRED_COLUMNS, encode_dimension, encode_gold,
+                                           pandas_metadata)
+
+logger = logging.getLogger(__name__)
+
+SERIES_KEYS = ['country', 'indicator']
+
+
+def _date_expression(lf: pl.LazyFrame) -> pl.Expr:
+    """
+    Parse ``date`` the way ``astype('datetime64[ns]')`` does.
+
+    Labels such as ``2001`` or ``2001-Q3`` are not all understood by Polars'
+    parser, so each distinct label is parsed once by pandas and mapped back.
+    """
+    if lf.collect_schema()['date'].is_temporal():
+        return pl.col('date').cast(pl.Datetime('ns'))
+    labels = lf.select(pl.col('date').cast(pl.String).unique().drop_nulls()).collect().to_series()
+    parsed = pd.Series(labels.to_list(), dtype=object).astype('datetime64[ns]')
+    return pl.col('date').cast(pl.String).replace_strict(
+        labels, pl.Series(parsed.to_numpy(), dtype=pl.Datetime('ns')), default=None, return_dtype=pl.Datetime('ns')
+    )
+
+
+def bronze_to_silver(input_path: Path) -> Tuple[pa.Table, Dict[str, int]]:
+    """
+    Lazy bronze→silver plan: cast, parse dates, apply null rules, drop duplicates.
+
+    Returns:
+        Tuple of (silver table with pandas metadata, row statistics)
+    """
+    lf = pl.scan_parquet(input_path)
+    schema = lf.collect_schema()
+    columns = []
+    for name, dtype in schema.items():
+        if name == 'date':
+            columns.append(_date_expression(lf).alias('date'))
+        elif name == 'value':
+            columns.append(pl.col('value').cast(pl.Float64))
+        else:
+            columns.append(pl.col(name))
+    standardized = lf.select(columns)
+    if 'date' in schema:
+        standardized = standardized.with_columns(pl.col('date').dt.year().cast(pl.Int32).alias('year'),
+                                                 pl.col('date').dt.quarter().cast(pl.Int32).alias('quarter'))
+
+    # NaN counts as null for the value rule, as in pandas' dropna
+    rules = [pl.col(name).is_not_null() & (pl.col(name).is_not_nan() if schema[name].is_float() else True)
+             for name in REQUIRED_COLUMNS if name in schema]
+    cleaned = standardized.filter(pl.all_horizontal(rules)) if rules else standardized
+    silver = cleaned.unique(keep='first', maintain_order=True)
+
+    nulls, after_nulls, result = pl.collect_all([
+        lf.select(pl.all().null_count()),
+        cleaned.select(pl.len()),
+        silver
+    ])
+    stats = {f"nulls_{name}": count for name, count in nulls.row(0, named=True).items()}
+    stats.update({'rows_in': pq.ParquetFile(input_path).metadata.num_rows,
+                  'rows_after_nulls': after_nulls.item(), 'rows_out': result.height})
+    stats['duplicates_removed'] = stats['rows_after_nulls'] - stats['rows_out']
+    return pandas_metadata(_to_arrow(result)), stats
+
+
+def _to_arrow(df: pl.DataFrame) -> pa.Table:
+    """Arrow table with the pandas path's types (years as int32/float64, sorted dictionaries)."""
+    table = df.to_arrow()
+    for name in table.column_names:
+        column = table.column(name)
+        if name in DIMENSION_COLUMNS:
+            column = encode_dimension(column.cast(pa.string()) if not pa.types.is_dictionary(column.type)
+                                      else column.cast(pa.dictionary(pa.int32(), pa.string())))
+        elif pa.types.is_large_string(column.type):
+            column = column.cast(pa.string())
+        elif name in ('year', 'quarter') and column.null_count:
+            # pandas falls back to float64 when a date is missing
+            column = column.cast(pa.float64())
+        else:
+            continue
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+    return table
+
+
+def silver_frame(input_paths: Sequence[Path]) -> pl.LazyFrame:
+    """
+    Lazy union of the silver files tagged with ``data_source``.
+
+    ``__file``/``__row`` record each row's position in the pandas
+    concatenation, used to break date ties and to restore the row order.
+    """
+    frames = [
+        pl.scan_parquet(path)
+        .with_row_index('__row')
+        .with_columns(pl.lit(Path(path).stem.split('_')[0]).alias('data_source'), pl.lit(number).alias('__file'))
+        for number, path in enumerate(input_paths)
+    ]
+    # Diagonal: World Bank and IMF silver files have different columns
+    return pl.concat(frames, how='diagonal_relaxed')
+
+
+def gold_frame(input_paths: Sequence[Path], yoy_periods: int, ma_window: int) -> pl.LazyFrame:
+    """Lazy plan for the gold metrics and business rules, in the pandas row order."""
+    value = pl.col('value')
+    lf = silver_frame(input_paths).sort(SERIES_KEYS + ['date', '__file', '__row'])
+    lf = lf.with_columns(
+        (value / value.shift(yoy_periods) - 1).over(SERIES_KEYS).alias('yoy_change'),
+        value.rolling_mean(ma_window).over(SERIES_KEYS).alias('ma_3year'),
+        ((value - value.mean()) / value.std(ddof=1)).over(SERIES_KEYS).alias('zscore')
+    )
+    yoy, zscore = pl.col('yoy_change'), pl.col('zscore')
+    # pd.cut bins (-inf, -0.02], (-0.02, 0.02], (0.02, inf]; NaN/-inf fall outside every bin
+    growth = (pl.when(yoy.is_nan()).then(None)
+              .when((yoy > float('-inf')) & (yoy <= -0.02)).then(0)
+              .when((yoy > -0.02) & (yoy <= 0.02)).then(1)
+              .when(yoy > 0.02).then(2)
+              .otherwise(None).cast(pl.Int8))
+    anomaly = ((zscore.abs() > 3) & zscore.is_not_nan()).fill_null(False)
+    return (lf.with_columns(growth.alias('growth_category'), anomaly.alias('is_anomaly'))
+            .sort(['__file', '__row'])
+            .drop(['__file', '__row']))
+
+
+def silver_to_gold(input_paths: Sequence[Path], yoy_periods: int, ma_window: int) -> pa.Table:
+    """Collect the gold plan into an Arrow table ready to be written."""
+    return encode_gold(_to_arrow(gold_frame(input_paths, yoy_periods, ma_window).collect()))
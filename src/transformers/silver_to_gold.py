@@ -1,6 +1,26 @@
+from typing import Dict, Any, List
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+from datetime import datetime
+from src.transformers.base import BaseTransformer
+from src.transformers.arrow_engine import DIMENSION_COLUMNS
+from src.transformers.kernels import series_metrics
+from src.transformers.metric_state import MetricStateStore, incremental_metrics
+from src.transformers.aggregates import GoldAggregateStore, MEMBER_COLUMNS
+from src.transformers.partitioned import shard_files, run_partitioned, merge_parquet
+
+# Periods for the year-over-year change (quarterly data) and the 3-year moving average
+YOY_PERIODS = 4
+MA_WINDOW = 12
+
 class SilverToGoldTransformer(BaseTransformer):
     """Transform silver data to gold layer with business logic and aggregations."""
     
+    ENGINES = ('pandas', 'duckdb', 'polars')
+    
     def transform(self, input_paths: List[Path], **kwargs) -> Path:
         """
         Transform silver data to gold format.
@@ -8,65 +28,211 @@ class SilverToGoldTransformer(BaseTransformer):
         Transformations include:
         - Joining different sources
         - Calculating business metrics
-        - Creating aggregations
         - Applying business rules
+        - Refreshing the country-year and indicator-year aggregate tables
+        
+        Args:
+            input_paths: Silver Parquet files
+            incremental: Only emit periods newer than the persisted metric
+                state (defaults to ``transformation.incremental_gold``)
+            workers: Compute metrics for hash partitions of the series in this
+                many processes (defaults to ``transformation.workers``)
+            engine: 'pandas', 'duckdb' or 'polars' (defaults to ``transformation.gold_engine``)
+            dedup: Silver files were deduplicated across runs, so a full run
+                reads every live silver file of the input sources instead of
+                only ``input_paths`` (defaults to ``transformation.silver_dedup``)
         """
-        self.logger.info("Starting silver to gold transformation")
+        incremental = kwargs.get('incremental', self.transformation_config.get('incremental_gold', False))
+        if self._silver_dedup(kwargs) and not incremental:
+            input_paths = self._live_silver_files(input_paths)
+        engine = self._engine(kwargs, supported=self.ENGINES, key='gold_engine')
+        if engine == 'duckdb' and not incremental:
+            return self._transform_duckdb(input_paths)
+        if engine == 'polars' and not incremental:
+            return self._transform_polars(input_paths)
+        if engine != 'pandas':
+            # The metric window state is maintained by the pandas path
+            self.logger.info(f"Incremental gold runs on the pandas engine; ignoring gold_engine={engine}")
+        workers = self._workers(kwargs)
+        if incremental and workers > 1:
+            # Every partition would update the shared window state; keep it in one process
+            self.logger.info("Incremental gold runs in-process; ignoring partitioned execution")
+            workers = 1
+        self.logger.info(f"Starting {'incremental ' if incremental else ''}silver to gold transformation"
+                         f"{f' ({workers} workers)' if workers > 1 else ''}")
         
-        # Read and combine silver datasets
-        dfs = []
-        for path in input_paths:
-            df = pd.read_parquet(path)
-            source = path.stem.split('_')[0]
-            df['data_source'] = source
-            dfs.append(df)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = self.gold_path / f"economic_indicators_gold_{timestamp}.parquet"
         
-        combined_df = pd.concat(dfs, ignore_index=True)
+        if workers > 1 and self._transform_partitioned(input_paths, output_path, workers):
+            self._create_aggregations(pd.read_parquet(output_path, columns=MEMBER_COLUMNS + ['year']), incremental)
+            self.logger.info(f"Completed silver to gold transformation: {output_path}")
+            return output_path
+        
+        # Read and combine silver datasets
+        combined_df = self._read_silver(input_paths)
         
         # Apply transformations
-        transformed_df = (combined_df
-                        .pipe(self._calculate_metrics)
-                        .pipe(self._create_aggregations)
-                        .pipe(self._apply_business_rules))
+        state_store = None
+        if incremental:
+            state_store = MetricStateStore(self.transformation_config.get('gold_state_path', 'data/state/gold_metrics.parquet'))
+            metrics_df = self._calculate_metrics_incremental(combined_df, state_store)
+        else:
+            metrics_df = self._calculate_metrics(combined_df)
+        transformed_df = metrics_df.pipe(self._apply_business_rules)
         
         # Save to gold layer
+        transformed_df.to_parquet(output_path, index=False)
+        self._create_aggregations(transformed_df, incremental)
+        if state_store is not None:
+            state_store.save()
+        
+        self.logger.info(f"Completed silver to gold transformation: {output_path}")
+        return output_path
+    
+    def _live_silver_files(self, input_paths: List[Path]) -> List[Path]:
+        """
+        Every silver file holding current rows of the sources of ``input_paths``.
+        
+        With key dedup a silver file only holds the rows that were new or
+        revised in its run, so series are complete only across all of the
+        source's files, as listed by its ``SilverKeyIndex``. Input files are
+        kept even when the index does not list them.
+        """
+        live = []
+        for source in dict.fromkeys(Path(path).stem.split('_')[0] for path in input_paths):
+            files = {name: self.silver_path / name for name in self._silver_key_index(source).live_files()}
+            files.update({Path(path).name: Path(path) for path in input_paths if Path(path).stem.split('_')[0] == source})
+            files = [files[name] for name in sorted(files)]
+            missing = [path for path in files if not path.exists()]
+            if missing:
+                raise FileNotFoundError(f"Silver files listed in the {source} key index are missing: "
+                                        f"{', '.join(path.name for path in missing)}")
+            live.extend(files)
+        if len(live) > len(input_paths):
+            self.logger.info(f"Silver dedup: reading {len(live)} live silver files for {len(input_paths)} inputs")
+        return live
+    
+    def _transform_duckdb(self, input_paths: List[Path]) -> Path:
+        """
+        Run metrics, business rules and aggregations as SQL in an embedded DuckDB.
+        
+        Silver files are scanned directly and gold is streamed to Parquet, so
+        the combined data never has to fit in pandas; DuckDB spills to
+        ``transformation.duckdb_temp_dir`` beyond ``memory_budget_mb``.
+        """
+        # Imported here so duckdb is only required when this engine is selected
+        from src.transformers import duckdb_engine
+        
+        self.logger.info("Starting silver to gold transformation (duckdb engine)")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = self.gold_path / f"economic_indicators_gold_{timestamp}.parquet"
         
-        transformed_df.to_parquet(output_path, index=False)
+        con = duckdb_engine.connect(
+            memory_limit_mb=self.transformation_config.get('memory_budget_mb'),
+            threads=self.transformation_config.get('duckdb_threads'),
+            temp_directory=self.transformation_config.get('duckdb_temp_dir', self.gold_path / '.duckdb_tmp')
+        )
+        try:
+            rows = duckdb_engine.write_gold(con, input_paths, output_path, YOY_PERIODS, MA_WINDOW)
+            store = GoldAggregateStore(self.transformation_config.get('gold_aggregates_path', self.gold_path / 'aggregates'))
+            duckdb_engine.refresh_aggregates(con, output_path, store, replace=True)
+        finally:
+            con.close()
         
-        self.logger.info(f"Completed silver to gold transformation: {output_path}")
+        self.logger.info(f"Completed silver to gold transformation: {output_path} ({rows} rows)")
         return output_path
     
-    def _calculate_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate business metrics."""
-        # Calculate year-over-year changes
-        df['yoy_change'] = df.groupby(['country', 'indicator'])['value'].pct_change(periods=4)
+    def _transform_polars(self, input_paths: List[Path]) -> Path:
+        """
+        Compute metrics and business rules as one Polars lazy query over the silver files.
         
-        # Calculate moving averages
-        df['ma_3year'] = df.groupby(['country', 'indicator'])['value'].rolling(window=12).mean().reset_index(0, drop=True)
+        Only the needed columns are read and the plan runs multi-threaded;
+        the aggregates are refreshed from a projection of the gold file.
+        """
+        # Imported here so polars is only required when this engine is selected
+        from src.transformers import polars_engine
         
-        # Calculate z-scores for anomaly detection
-        df['zscore'] = df.groupby(['country', 'indicator'])['value'].transform(lambda x: (x - x.mean()) / x.std())
+        self.logger.info("Starting silver to gold transformation (polars engine)")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = self.gold_path / f"economic_indicators_gold_{timestamp}.parquet"
         
-        return df
+        table = polars_engine.silver_to_gold(input_paths, YOY_PERIODS, MA_WINDOW)
+        pq.write_table(table, output_path)
+        self._create_aggregations(pd.read_parquet(output_path, columns=MEMBER_COLUMNS + ['year']))
+        
+        self.logger.info(f"Completed silver to gold transformation: {output_path} ({table.num_rows} rows)")
+        return output_path
     
-    def _create_aggregations(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create relevant aggregations."""
-        # Create country-level aggregations
-        country_aggs = df.groupby(['country', 'year']).agg({
-            'value': ['mean', 'std', 'min', 'max'],
-            'yoy_change': 'mean',
-            'zscore': 'mean'
-        }).reset_index()
-        
-        # Create global aggregations
-        global_aggs = df.groupby(['year', 'indicator']).agg({
-            'value': ['mean', 'median', 'std']
-        }).reset_index()
+    def _read_silver(self, input_paths: List[Path]) -> pd.DataFrame:
+        """Read and combine silver files, tagging each row with its source."""
+        dfs = []
+        for path in input_paths:
+            df = pd.read_parquet(path)
+            source = path.stem.split('_')[0]
+            df['data_source'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[source])
+            dfs.append(df)
+        
+        return pd.concat(self._unify_categories(dfs), ignore_index=True)
+    
+    def _transform_partitioned(self, input_paths: List[Path], output_path: Path, workers: int) -> bool:
+        """
+        Compute gold rows for hash partitions of the silver data in a process pool.
+        
+        Partitions are keyed on country (optionally with indicator), so each
+        (country, indicator) series is complete within one partition.
+        
+        Returns:
+            False when the silver data is empty and nothing was written
+        """
+        with self._partition_workdir(output_path) as workdir:
+            shards = shard_files(input_paths, workdir, self._partitions(workers), self._partition_keys())
+            if not shards:
+                return False
+            outputs = run_partitioned(_transform_partition, self.config, shards, workdir, workers)
+            rows = merge_parquet(outputs, output_path)
+        self.logger.info(f"Partitioned transformation merged {len(outputs)} partitions ({rows} rows)")
+        return True
+    
+    def _unify_categories(self, dfs: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """Give dimension columns the same categories in every frame so concat keeps them categorical."""
+        for col in DIMENSION_COLUMNS:
+            columns = [df[col] for df in dfs if col in df.columns]
+            if not columns:
+                continue
+            categories = union_categoricals([column.astype('category') for column in columns]).categories
+            for df in dfs:
+                if col in df.columns:
+                    df[col] = df[col].astype(pd.CategoricalDtype(categories))
+        return dfs
+    
+    def _calculate_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate business metrics over each (country, indicator) series in date order."""
+        # Year-over-year change, 3-year moving average and z-score for anomaly detection
+        metrics = series_metrics([df['country'], df['indicator']], df['date'], df['value'].to_numpy(dtype='float64'),
+                                 YOY_PERIODS, MA_WINDOW)
+        for name, values in metrics.items():
+            df[name] = values
         
         return df
     
+    def _calculate_metrics_incremental(self, df: pd.DataFrame, state_store: MetricStateStore) -> pd.DataFrame:
+        """Calculate the same metrics for new periods only, continuing from the persisted state."""
+        new_df, state_store.state = incremental_metrics(df, state_store.state, YOY_PERIODS, MA_WINDOW)
+        self.logger.info(f"Incremental metrics: {len(new_df)} new of {len(df)} silver rows")
+        return new_df
+    
+    def _create_aggregations(self, df: pd.DataFrame, incremental: bool = False) -> Dict[str, List[Path]]:
+        """
+        Refresh the persisted country-year and indicator-year aggregates.
+        
+        Only the year partitions present in ``df`` are rewritten. A full run
+        replaces the stored rows of every (country, indicator, year) it covers; an
+        incremental run appends its new periods to them.
+        """
+        store = GoldAggregateStore(self.transformation_config.get('gold_aggregates_path', self.gold_path / 'aggregates'))
+        return store.refresh(df, replace=not incremental)
+    
     def _apply_business_rules(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply business rules and categorizations."""
         # Categorize growth rates
@@ -77,4 +243,13 @@ class SilverToGoldTransformer(BaseTransformer):
         # Flag anomalies
         df['is_anomaly'] = abs(df['zscore']) > 3
         
-        return df
\ No newline at end of file
+        return df
+
+
+def _transform_partition(config: Dict[str, Any], shard_paths: List[Path], output_path: Path) -> None:
+    """Process-pool worker: metrics and business rules for one partition of the silver data."""
+    transformer = SilverToGoldTransformer(config)
+    (transformer._read_silver(shard_paths)
+     .pipe(transformer._calculate_metrics)
+     .pipe(transformer._apply_business_rules)
+     .to_parquet(output_path, index=False))
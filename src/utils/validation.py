@@ -0,0 +1,213 @@
+"""
+Data Validation
+
+Range checks applied to transformed data before it is written to the silver
+layer.
+
+Rule dictionaries are compiled once into bound checks on NumPy arrays: year
+rules become timestamp bounds (no per-row year extraction) and every rule
+of a column is evaluated against the same array. The result is one bitmask
+per row with a bit set for each violated rule, so a single pass yields both
+the rows to quarantine and the per-rule counts. Violating rows can be
+collected with ``QuarantineWriter`` instead of failing the run.
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# rule name -> (bound side, applies to the year of a datetime column)
+RULE_TYPES = {
+    'min_year': ('min', True),
+    'max_year': ('max', True),
+    'min_value': ('min', False),
+    'max_value': ('max', False)
+}
+
+# Rules are reported through bits of a uint32 mask
+MAX_RULES = 32
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One bound check on a column."""
+    column: str
+    name: str
+    side: str
+    bound: Any
+    threshold: Any
+
+    @property
+    def label(self) -> str:
+        return f"{self.column}.{self.name}"
+
+    def violated(self, values: np.ndarray) -> np.ndarray:
+        # NaN and NaT compare False, so missing values never violate a bound
+        return values < self.threshold if self.side == 'min' else values > self.threshold
+
+
+def compile_rules(rules: Dict[str, Dict[str, Any]]) -> List[CompiledRule]:
+    """
+    Turn ``{column: {rule: bound}}`` into bound checks.
+
+    Year bounds are rewritten as timestamp thresholds: ``min_year=1960`` is
+    ``date < 1960-01-01`` and ``max_year=2024`` is ``date > 2024-12-31 23:59:59.999999999``.
+
+    Raises:
+        ValueError: For an unknown rule or more than ``MAX_RULES`` rules
+    """
+    compiled = []
+    for column, column_rules in rules.items():
+        for name, bound in column_rules.items():
+            if name not in RULE_TYPES:
+                raise ValueError(f"Unknown validation rule for {column}: {name}")
+            side, on_year = RULE_TYPES[name]
+            threshold = bound
+            if on_year:
+                year = int(bound) if side == 'min' else int(bound) + 1
+                threshold = np.datetime64(f"{year:04d}-01-01", 'ns')
+                if side == 'max':
+                    threshold = threshold - np.timedelta64(1, 'ns')
+            compiled.append(CompiledRule(column, name, side, bound, threshold))
+    if len(compiled) > MAX_RULES:
+        raise ValueError(f"At most {MAX_RULES} validation rules are supported, got {len(compiled)}")
+    return compiled
+
+
+def _column_values(column: pd.Series, on_year: bool) -> np.ndarray:
+    """NumPy view of a column in the domain its rules compare against."""
+    if on_year:
+        if not pd.api.types.is_datetime64_any_dtype(column):
+            column = pd.to_datetime(column, errors='coerce')
+        return column.to_numpy(dtype='datetime64[ns]')
+    return column.to_numpy(dtype='float64', na_value=np.nan)
+
+
+class DataValidator:
+    """
+    Validates a DataFrame against per-column rule dictionaries.
+
+    Supported rules:
+        min_year / max_year: bounds on the year of a datetime column
+        min_value / max_value: bounds on a numeric column
+
+    Args:
+        rules: Rules to compile once; ``validate`` may also be given rules per call
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.rules = compile_rules(rules) if rules is not None else None
+
+    def violations(self, df: pd.DataFrame, rules: Optional[List[CompiledRule]] = None) -> np.ndarray:
+        """
+        Evaluate every rule in one pass over the columns.
+
+        Returns:
+            uint32 array with bit ``i`` set where rule ``i`` is violated
+        """
+        rules = rules if rules is not None else self.rules
+        mask = np.zeros(len(df), dtype=np.uint32)
+        arrays: Dict[tuple, np.ndarray] = {}
+        for bit, rule in enumerate(rules):
+            if rule.column not in df.columns:
+                continue
+            key = (rule.column, RULE_TYPES[rule.name][1])
+            if key not in arrays:
+                arrays[key] = _column_values(df[rule.column], key[1])
+            mask |= rule.violated(arrays[key]).astype(np.uint32) << np.uint32(bit)
+        return mask
+
+    def labels(self, mask: np.ndarray, rules: Optional[List[CompiledRule]] = None) -> np.ndarray:
+        """Comma-separated names of the violated rules for every row (decoded once per distinct mask)."""
+        rules = rules if rules is not None else self.rules
+        distinct, inverse = np.unique(mask, return_inverse=True)
+        names = np.array([','.join(rule.label for bit, rule in enumerate(rules) if value >> bit & 1)
+                          for value in distinct], dtype=object)
+        return names[inverse]
+
+    def validate(self, df: pd.DataFrame, rules: Optional[Dict[str, Dict[str, Any]]] = None,
+                 sample_rows: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+        """
+        Check every rule and collect the violations.
+
+        Args:
+            df: Data to validate
+            rules: Mapping of column name to rule dictionary (defaults to the compiled rules)
+            sample_rows: Validate a random sample of this many rows first and
+                only scan every row when the sample has violations. A clean
+                sample accepts the data without a full scan, so rare
+                violations can go unnoticed in this mode.
+            seed: Sampling seed
+
+        Returns:
+            Dictionary with ``is_valid``, a list of ``errors``, the per-row
+            ``violations`` bitmask, per-rule ``counts`` and whether the
+            result comes from a clean ``sampled`` check
+        """
+        compiled = compile_rules(rules) if rules is not None else self.rules
+        if sample_rows and len(df) > sample_rows:
+            sample = np.random.default_rng(seed).choice(len(df), size=sample_rows, replace=False)
+            if not self.violations(df.iloc[np.sort(sample)], compiled).any():
+                return {'is_valid': True, 'errors': [], 'violations': np.zeros(len(df), dtype=np.uint32),
+                        'counts': {}, 'sampled': True}
+            logger.info(f"Sample of {sample_rows} rows has violations; validating all {len(df)} rows")
+
+        mask = self.violations(df, compiled)
+        counts = {}
+        errors: List[str] = []
+        if mask.any():
+            for bit, rule in enumerate(compiled):
+                count = int(np.count_nonzero(mask & np.uint32(1 << bit)))
+                if count:
+                    counts[rule.label] = count
+                    errors.append(f"{rule.column}: {count} rows violate {rule.name}={rule.bound}")
+
+        return {'is_valid': not errors, 'errors': errors, 'violations': mask, 'counts': counts, 'sampled': False}
+
+
+class QuarantineWriter:
+    """
+    Appends rejected rows to a Parquet file, created on the first write.
+
+    Rows carry a ``violated_rules`` column. The file is written under a
+    temporary name and moved into place by ``close``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rows = 0
+        self._writer = None
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+
+    def write(self, table: pa.Table, labels: np.ndarray) -> None:
+        """Append rejected rows with their violated rule names."""
+        table = table.replace_schema_metadata(None).append_column('violated_rules', pa.array(labels, type=pa.string()))
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self._tmp_path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self.rows += table.num_rows
+
+    def close(self) -> int:
+        """Finish the file and return the number of quarantined rows."""
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+            self._writer = None
+        return self.rows
+
+    def abort(self) -> None:
+        """Discard a partially written file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,256 @@
+"""
+Local stand-in for the World Bank v2 and IMF SDMX-JSON APIs.
+
+Serves synthetic data (or recorded fixtures, when present) over HTTP so that
+extractors can be tested and benchmarked without network access. Latency,
+pagination, 429 throttling and payload size are configurable.
+
+Routes:
+    /v2/countries/{codes}/indicators/{indicator}
+    /REST/SDMX_JSON.svc/DataStructure/{dataset}
+    /REST/SDMX_JSON.svc/CompactData/{dataset}
+"""
+
+import json
+import time
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+
+@dataclass
+class FakeAPIConfig:
+    """Behaviour of the fake API server."""
+    latency: float = 0.0
+    throttle_every: int = 0
+    retry_after: int = 0
+    countries: List[str] = field(default_factory=lambda: [f"C{i:02d}" for i in range(50)])
+    indicators_per_dataset: int = 5
+    default_years: Tuple[int, int] = (2000, 2023)
+    # Filler characters added to every record (World Bank) / observation (IMF)
+    record_padding: int = 0
+    fixtures_dir: Optional[str] = None
+
+
+def _value(*parts: Any) -> float:
+    """Deterministic pseudo-random value for a series point."""
+    return (zlib.crc32('|'.join(map(str, parts)).encode()) % 100000) / 100.0
+
+
+def _years(spec: Optional[str], default: Tuple[int, int], end: Optional[str] = None) -> range:
+    if spec and ':' in spec:
+        start, stop = spec.split(':')
+    else:
+        start, stop = spec or default[0], end or default[1]
+    return range(int(start), int(stop) + 1)
+
+
+class FakeAPIServer:
+    """
+    Threaded fake API server.
+
+    Usage:
+        with FakeAPIServer(FakeAPIConfig(latency=0.01)) as server:
+            config['world_bank_params']['base_url'] = server.world_bank_url
+    """
+
+    def __init__(self, config: Optional[FakeAPIConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or FakeAPIConfig()
+        self.request_count = 0
+        self.throttled_count = 0
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def world_bank_url(self) -> str:
+        return f"{self.base_url}/v2"
+
+    @property
+    def imf_url(self) -> str:
+        return f"{self.base_url}/REST/SDMX_JSON.svc"
+
+    def start(self) -> 'FakeAPIServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeAPIServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _register(self, path: str) -> int:
+        with self._lock:
+            self.request_count += 1
+            self.requests.append(path)
+            return self.request_count
+
+    def _fixture(self, path: str, query: str) -> Optional[bytes]:
+        """Return a recorded response for this request, if one exists."""
+        if not self.config.fixtures_dir:
+            return None
+        fixture = Path(self.config.fixtures_dir) / f"{quote(path + '?' + query, safe='')}.json"
+        if not fixture.exists():
+            fixture = Path(self.config.fixtures_dir) / f"{quote(path, safe='')}.json"
+        return fixture.read_bytes() if fixture.exists() else None
+
+    def _padding(self, field_name: str) -> Dict[str, str]:
+        """Filler field that grows each record by ``record_padding`` characters."""
+        return {field_name: 'x' * self.config.record_padding} if self.config.record_padding else {}
+
+    def world_bank_payload(self, codes: str, indicator: str, params: Dict[str, str]) -> List[Any]:
+        countries = self.config.countries if codes.lower() == 'all' else codes.split(';')
+        records = [
+            {
+                'indicator': {'id': indicator, 'value': f"Indicator {indicator}"},
+                'country': {'id': country, 'value': f"Country {country}"},
+                'countryiso3code': country,
+                'date': str(year),
+                'value': _value(country, indicator, year),
+                'unit': '',
+                'obs_status': '',
+                'decimal': 1,
+                **self._padding('footnote')
+            }
+            for country in countries
+            for year in reversed(_years(params.get('date'), self.config.default_years))
+        ]
+        per_page = int(params.get('per_page', 50))
+        page = int(params.get('page', 1))
+        pages = max(1, -(-len(records) // per_page))
+        metadata = {'page': page, 'pages': pages, 'per_page': per_page, 'total': len(records)}
+        return [metadata, records[(page - 1) * per_page:page * per_page]]
+
+    def _imf_indicators(self, dataset: str) -> List[str]:
+        return [f"{dataset}_I{i}" for i in range(self.config.indicators_per_dataset)]
+
+    def imf_structure_payload(self, dataset: str) -> Dict[str, Any]:
+        def codelist(codelist_id, codes):
+            return {'@id': codelist_id, 'Code': [
+                {'@value': code, 'Description': {'@xml:lang': 'en', '#text': f"Label {code}"}} for code in codes
+            ]}
+
+        return {'Structure': {
+            'KeyFamilies': {'KeyFamily': {
+                '@id': dataset,
+                '@agencyID': 'IMF',
+                '@version': '1.0',
+                'Components': {'Dimension': [
+                    {'@conceptRef': 'FREQ', '@codelist': 'CL_FREQ'},
+                    {'@conceptRef': 'REF_AREA', '@codelist': f"CL_AREA_{dataset}"},
+                    {'@conceptRef': 'INDICATOR', '@codelist': f"CL_INDICATOR_{dataset}"}
+                ]}
+            }},
+            'CodeLists': {'CodeList': [
+                codelist('CL_FREQ', ['A']),
+                codelist(f"CL_AREA_{dataset}", self.config.countries),
+                codelist(f"CL_INDICATOR_{dataset}", self._imf_indicators(dataset))
+            ]}
+        }}
+
+    def imf_compact_payload(self, dataset: str, params: Dict[str, str]) -> Dict[str, Any]:
+        countries = params['countries'].split('+') if params.get('countries') else self.config.countries
+        years = _years(params.get('startPeriod'), self.config.default_years, params.get('endPeriod'))
+        indicators = params['indicators'].split('+') if params.get('indicators') else self._imf_indicators(dataset)
+        series = [
+            {
+                '@FREQ': 'A',
+                '@REF_AREA': country,
+                '@INDICATOR': indicator,
+                'Obs': [
+                    {'@TIME_PERIOD': str(year), '@OBS_VALUE': str(_value(country, indicator, year)),
+                     **self._padding('@COMMENT')}
+                    for year in years
+                ]
+            }
+            for country in countries
+            for indicator in indicators
+        ]
+        return {'CompactData': {'DataSet': {'Series': series}}}
+
+    def respond(self, path: str, query: str) -> Tuple[int, Optional[bytes]]:
+        """Route a request to its payload; returns (status, body)."""
+        fixture = self._fixture(path, query)
+        if fixture is not None:
+            return 200, fixture
+
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        parts = path.strip('/').split('/')
+
+        if len(parts) == 5 and parts[:2] == ['v2', 'countries'] and parts[3] == 'indicators':
+            payload = self.world_bank_payload(parts[2], parts[4], params)
+        elif len(parts) == 4 and parts[:2] == ['REST', 'SDMX_JSON.svc'] and parts[2] == 'DataStructure':
+            payload = self.imf_structure_payload(parts[3])
+        elif len(parts) == 4 and parts[:2] == ['REST', 'SDMX_JSON.svc'] and parts[2] == 'CompactData':
+            payload = self.imf_compact_payload(parts[3], params)
+        else:
+            return 404, None
+
+        return 200, json.dumps(payload).encode('utf-8')
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                count = server._register(self.path)
+
+                if server.config.latency:
+                    time.sleep(server.config.latency)
+
+                if server.config.throttle_every and count % server.config.throttle_every == 0:
+                    with server._lock:
+                        server.throttled_count += 1
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(server.config.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                status, body = server.respond(url.path, url.query)
+                if body is None:
+                    self.send_response(status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
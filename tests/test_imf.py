@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+from tests.fake_api import FakeAPIServer, FakeAPIConfig
+from src.extractors.imf import IMFExtractor
+from src.extractors.imf_structure import DataStructureCache
+
+
+@pytest.fixture
+def server():
+    with FakeAPIServer(FakeAPIConfig(countries=['IT', 'FR', 'DE'], indicators_per_dataset=2)) as server:
+        yield server
+
+
+def make_config(tmp_path, server, **imf_params):
+    return {
+        'data_paths': {'bronze': str(tmp_path / 'bronze')},
+        'imf_params': {
+            'datasets': ['IFS', 'FSI'],
+            'base_url': server.imf_url,
+            'structure_cache_dir': str(tmp_path / 'dsd'),
+            **imf_params
+        },
+        'http': {'retry_backoff_factor': 0},
+    }
+
+
+def test_imf_extraction_resolves_labels(tmp_path, server):
+    """Series are parsed into bronze rows with labels from the cached DSD."""
+    extractor = IMFExtractor(make_config(tmp_path, server))
+
+    df = pd.read_parquet(extractor.extract(countries=['IT', 'FR'], start_period='2020', end_period='2022'))
+
+    assert len(df) == 2 * 2 * 2 * 3
+    assert set(df['country_name']) == {'Label IT', 'Label FR'}
+
+
+def test_imf_skips_unknown_countries_and_reuses_structures(tmp_path, server):
+    """Unknown country codes are dropped locally and DSDs are fetched only once."""
+    extractor = IMFExtractor(make_config(tmp_path, server))
+
+    extractor.extract(countries=['IT', 'XX'], start_period='2020', end_period='2020')
+    extractor.extract(countries=['IT'], start_period='2020', end_period='2020')
+
+    structure_requests = [path for path in server.requests if 'DataStructure' in path]
+    assert len(structure_requests) == 2
+    assert all('XX' not in path for path in server.requests)
+
+
+def test_imf_streaming_matches_full_parse(tmp_path, server):
+    """The streaming parser yields exactly what the full-document parser does."""
+    streamed = pd.read_parquet(IMFExtractor(make_config(tmp_path, server)).extract(start_period='2019'))
+    config = make_config(tmp_path, server, stream_parse=False)
+    config['data_paths']['bronze'] = str(tmp_path / 'bronze_full')
+    parsed = pd.read_parquet(IMFExtractor(config).extract(start_period='2019'))
+
+    pd.testing.assert_frame_equal(streamed, parsed)
+
+
+def test_imf_incremental_backfills_only_new_series(tmp_path, server):
+    """Series first returned by a narrowed all-countries request get their full history; others do not."""
+    config = make_config(tmp_path, server)
+    config['extraction'] = {'incremental': True, 'watermark_dir': str(tmp_path / 'watermarks'),
+                            'revision_lookback_years': 1}
+    extractor = IMFExtractor(config)
+    extractor.extract(start_period='2000', end_period='2023')
+
+    server.config.indicators_per_dataset = 3
+    server.config.countries = server.config.countries + ['ES']
+    df = pd.read_parquet(extractor.extract(start_period='2000', end_period='2023'))
+
+    full, lookback = list(range(2000, 2024)), [2022, 2023]
+    for (country, indicator), dates in df.astype(str).groupby(['country', 'indicator'])['date']:
+        new = country == 'ES' or indicator.endswith('_I2')
+        assert sorted(dates.astype(int)) == (full if new else lookback), (country, indicator)
+    assert any('indicators=' in request for request in server.requests)
+
+
+def test_structure_cache_serves_memory_copy_after_file_removed(tmp_path, server):
+    """A definition still held in memory is returned when its cache file was removed by another process."""
+    cache = DataStructureCache(str(tmp_path / 'dsd'))
+    definition = cache.put('IFS', server.imf_structure_payload('IFS'))
+    for path in (tmp_path / 'dsd').iterdir():
+        path.unlink()
+
+    assert cache.get('IFS') is definition
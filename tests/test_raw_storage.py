@@ -0,0 +1,32 @@
+import json
+import pandas as pd
+from src.etl.raw_storage import read_raw, write_raw, metadata_path
+
+RECORDS = [
+    {'indicator': {'id': 'NY.GDP.MKTP.CD', 'value': 'GDP (current US$)'},
+     'country': {'id': 'IT', 'value': 'Italy'},
+     'date': str(year), 'value': None if year == 2001 else 1.5 * year, 'decimal': 0}
+    for year in range(2000, 2010)
+]
+
+
+def test_raw_roundtrip_keeps_records_and_metadata(tmp_path):
+    """Compact raw files read back to the same records and sidecar metadata."""
+    path = write_raw(tmp_path / 'IT_GDP.json', RECORDS, {'metadata': {'country': 'IT'}})
+
+    df, metadata = read_raw(path)
+
+    assert path.suffix == '.arrow' and metadata_path(path).exists()
+    assert metadata == {'metadata': {'country': 'IT'}}
+    pd.testing.assert_frame_equal(df, pd.DataFrame(RECORDS), check_dtype=False)
+
+
+def test_raw_reader_accepts_legacy_json(tmp_path):
+    """Pretty-printed JSON landing files from older runs are still readable."""
+    path = tmp_path / 'IT_GDP.json'
+    path.write_text(json.dumps({'extracted_data': RECORDS, 'metadata': {'country': 'IT'}}, indent=2))
+
+    df, metadata = read_raw(path)
+
+    assert metadata == {'metadata': {'country': 'IT'}}
+    assert len(df) == len(RECORDS) and df['country'].iloc[0] == {'id': 'IT', 'value': 'Italy'}
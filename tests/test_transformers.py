@@ -0,0 +1,359 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.transformers.bronze_to_silver import BronzeToSilverTransformer
+from src.transformers.silver_to_gold import SilverToGoldTransformer
+from src.transformers.key_index import RowHashIndex
+from src.transformers.kernels import series_metrics
+from src.transformers.aggregates import GoldAggregateStore
+
+
+def make_config(tmp_path, **transformation):
+    return {
+        'data_paths': {'silver': str(tmp_path / 'silver'), 'gold': str(tmp_path / 'gold')},
+        'transformation': {'quarantine_path': str(tmp_path / 'quarantine'),
+                           'silver_index_path': str(tmp_path / 'state' / 'silver_keys'), **transformation},
+    }
+
+
+@pytest.fixture
+def bronze_path(tmp_path):
+    """IMF-shaped bronze file with quarterly dates, nulls, NaNs and duplicate rows."""
+    rng = np.random.default_rng(42)
+    rows = 5000
+    values = rng.uniform(0, 100, rows).round(1)
+    values[rng.random(rows) < 0.1] = np.nan
+    df = pd.DataFrame({
+        'country': pd.Categorical(rng.choice(['IT', 'FR', 'DE', None], rows)),
+        'indicator': pd.Categorical(rng.choice(['NGDP', 'PCPI'], rows)),
+        'value': values,
+        'date': pd.Categorical(rng.choice([f"{y}-Q{q}" for y in range(2000, 2010) for q in range(1, 5)], rows)),
+        'source': pd.Categorical(['IMF'] * rows),
+    })
+    path = tmp_path / 'imf_bronze.parquet'
+    pd.concat([df, df.iloc[::7]], ignore_index=True).to_parquet(path, index=False, row_group_size=1000)
+    return path
+
+
+def test_arrow_engine_matches_pandas(tmp_path, bronze_path):
+    """The Arrow engine writes the same silver data as the pandas pipeline."""
+    transformer = BronzeToSilverTransformer(make_config(tmp_path))
+
+    pandas_df = pd.read_parquet(transformer.transform(bronze_path, engine='pandas'))
+    for path in transformer.silver_path.iterdir():
+        path.unlink()
+    arrow_df = pd.read_parquet(transformer.transform(bronze_path, engine='arrow'))
+
+    assert len(arrow_df) < 5000
+    pd.testing.assert_frame_equal(pandas_df, arrow_df)
+
+
+def test_unknown_engine_from_config_is_rejected(tmp_path):
+    """An unknown engine configured under transformation.engine fails fast."""
+    transformer = BronzeToSilverTransformer(make_config(tmp_path, engine='spark'))
+
+    with pytest.raises(ValueError):
+        transformer.transform(tmp_path / 'missing.parquet')
+
+
+def test_chunked_mode_matches_in_memory(tmp_path, bronze_path):
+    """Chunked processing with a tiny budget dedups across batches and matches the in-memory output."""
+    transformer = BronzeToSilverTransformer(make_config(tmp_path, memory_budget_mb=0.01))
+
+    arrow_df = pd.read_parquet(transformer.transform(bronze_path, engine='arrow'))
+    for path in transformer.silver_path.iterdir():
+        path.unlink()
+    chunked_path = transformer.transform(bronze_path, chunked=True)
+
+    assert pq.ParquetFile(chunked_path).metadata.num_row_groups > 1
+    pd.testing.assert_frame_equal(arrow_df, pd.read_parquet(chunked_path))
+
+
+def test_row_hash_index_handles_h1_collisions():
+    """Keys sharing h1 are told apart by h2, across batches and merged runs."""
+    index = RowHashIndex()
+    h1 = np.array([5, 5, 7, 9], dtype=np.uint64)
+    h2 = np.array([1, 2, 3, 4], dtype=np.uint64)
+
+    assert index.add_new(h1, h2).all()
+    keep = index.add_new(np.array([5, 5, 5, 9], dtype=np.uint64), np.array([2, 3, 3, 4], dtype=np.uint64))
+
+    assert keep.tolist() == [False, True, False, False]
+    assert len(index) == 5
+
+
+def test_dimensions_stay_dictionary_encoded_through_gold(tmp_path, bronze_path):
+    """Dimension columns are categorical in silver and gold and stored dictionary-encoded."""
+    config = make_config(tmp_path)
+    silver_path = BronzeToSilverTransformer(config).transform(bronze_path)
+
+    gold_path = SilverToGoldTransformer(config).transform([silver_path])
+
+    schema = pq.read_schema(gold_path)
+    for column in ('country', 'indicator', 'source', 'data_source'):
+        assert pa.types.is_dictionary(schema.field(column).type)
+    assert isinstance(pd.read_parquet(silver_path)['country'].dtype, pd.CategoricalDtype)
+
+
+def test_incremental_gold_matches_full_recompute(tmp_path):
+    """Continuing from persisted window state gives the full-history metrics for new periods only."""
+    rng = np.random.default_rng(3)
+    dates = pd.date_range('2000-01-01', periods=60, freq='QS')
+    df = pd.DataFrame([(c, i, d) for d in dates for c in ['IT', 'FR'] for i in ['NGDP', 'PCPI']],
+                      columns=['country', 'indicator', 'date'])
+    df['value'] = rng.uniform(1, 100, len(df))
+    df['year'] = df['date'].dt.year.astype('int32')
+    silver = tmp_path / 'silver'
+    silver.mkdir()
+    old_path, new_path = silver / 'imf_silver_1.parquet', silver / 'imf_silver_2.parquet'
+    df[df['date'] < '2010-01-01'].to_parquet(old_path, index=False)
+    df[df['date'] >= '2010-01-01'].to_parquet(new_path, index=False)
+    config = make_config(tmp_path, gold_state_path=str(tmp_path / 'state' / 'gold_metrics.parquet'))
+    transformer = SilverToGoldTransformer(config)
+
+    transformer.transform([old_path], incremental=True)
+    incremental_df = pd.read_parquet(transformer.transform([old_path, new_path], incremental=True))
+    full_df = pd.read_parquet(transformer.transform([old_path, new_path]))
+
+    expected = full_df[full_df['date'] >= '2010-01-01'].reset_index(drop=True)
+    assert len(incremental_df) == len(expected) == 4 * 20
+    for column in ('yoy_change', 'ma_3year', 'zscore'):
+        np.testing.assert_allclose(incremental_df[column], expected[column], rtol=1e-9)
+
+
+def test_series_kernels_match_groupby_on_shuffled_rows():
+    """Kernels reproduce the pandas groupby metrics computed in (country, indicator, date) order."""
+    rng = np.random.default_rng(7)
+    dates = pd.date_range('2000-01-01', periods=30, freq='QS')
+    df = pd.DataFrame([(c, i, d) for c in ['IT', 'FR', 'DE'] for i in ['A', 'B'] for d in dates[:rng.integers(1, 30)]],
+                      columns=['country', 'indicator', 'date'])
+    df['value'] = rng.uniform(1, 100, len(df))
+    df = df.sample(frac=1, random_state=7, ignore_index=True)
+
+    metrics = series_metrics([df['country'], df['indicator']], df['date'], df['value'].to_numpy(), 4, 12)
+
+    ordered = df.sort_values(['country', 'indicator', 'date'])
+    grouped = ordered.groupby(['country', 'indicator'])['value']
+    expected = pd.DataFrame({
+        'yoy_change': grouped.pct_change(periods=4),
+        'ma_3year': grouped.rolling(window=12).mean().reset_index(level=[0, 1], drop=True),
+        'zscore': grouped.transform(lambda x: (x - x.mean()) / x.std()),
+    }).sort_index()
+    for column, values in metrics.items():
+        np.testing.assert_allclose(values, expected[column], rtol=1e-9, equal_nan=True)
+
+
+def test_aggregate_refresh_rewrites_only_touched_partitions(tmp_path):
+    """Appending new years leaves older partitions untouched; replacing a country-year matches a full groupby."""
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame([(c, i, y, q) for y in range(2000, 2006) for q in range(4) for c in ['IT', 'FR'] for i in ['A', 'B']],
+                      columns=['country', 'indicator', 'year', 'quarter'])
+    for column in ('value', 'yoy_change', 'zscore'):
+        df[column] = rng.normal(size=len(df))
+    store = GoldAggregateStore(tmp_path / 'aggregates')
+
+    store.refresh(df[df['year'] < 2004], replace=True)
+    old_file = tmp_path / 'aggregates' / 'country_year' / 'year=2001' / 'part-0.parquet'
+    written_at = old_file.stat().st_mtime_ns
+    written = store.refresh(df[df['year'] >= 2004])
+    revised = df[(df['year'] == 2005) & (df['country'] == 'IT')].assign(value=lambda d: d['value'] + 10)
+    store.refresh(revised, replace=True)
+
+    assert [path.parent.name for path in written['indicator_year']] == ['year=2004', 'year=2005']
+    assert old_file.stat().st_mtime_ns == written_at
+    final = pd.concat([df.drop(revised.index), revised])
+    expected = final.groupby(['year', 'indicator'])['value'].agg(['mean', 'median', 'std']).reset_index()
+    actual = pd.read_parquet(tmp_path / 'aggregates' / 'indicator_year')
+    actual = actual.astype({'year': int, 'indicator': str}).sort_values(['year', 'indicator'], ignore_index=True)
+    for stat in ('mean', 'median', 'std'):
+        np.testing.assert_allclose(actual[f'value_{stat}'], expected[stat], rtol=1e-12)
+    country_2005 = pd.read_parquet(tmp_path / 'aggregates' / 'country_year' / 'year=2005')
+    it_values = final[(final['year'] == 2005) & (final['country'] == 'IT')]['value']
+    assert country_2005.set_index(country_2005['country'].astype(str)).loc['IT', 'value_max'] == it_values.max()
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'duckdb'])
+def test_aggregate_full_refresh_keeps_other_indicators(tmp_path, engine):
+    """A full run over some indicators of a country-year keeps the stored members of the others."""
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame([(c, i, y) for y in (2010, 2011) for c in ['IT', 'FR'] for i in ['A', 'B'] for _ in range(3)],
+                      columns=['country', 'indicator', 'year'])
+    for column in ('value', 'yoy_change', 'zscore'):
+        df[column] = rng.normal(size=len(df))
+    store = GoldAggregateStore(tmp_path / 'aggregates')
+
+    for indicator in ('A', 'B'):
+        run = df[df['indicator'] == indicator]
+        if engine == 'duckdb':
+            from src.transformers import duckdb_engine
+            run.to_parquet(tmp_path / f'gold_{indicator}.parquet', index=False)
+            duckdb_engine.refresh_aggregates(duckdb_engine.connect(), tmp_path / f'gold_{indicator}.parquet',
+                                             store, replace=True)
+        else:
+            store.refresh(run, replace=True)
+
+    expected = df.groupby(['year', 'country'])['value'].agg(['mean', 'max']).reset_index()
+    actual = pd.read_parquet(tmp_path / 'aggregates' / 'country_year')
+    actual = actual.astype({'year': int, 'country': str}).sort_values(['year', 'country'], ignore_index=True)
+    np.testing.assert_allclose(actual['value_mean'], expected['mean'], rtol=1e-12)
+    np.testing.assert_allclose(actual['value_max'], expected['max'], rtol=1e-12)
+    assert len(pd.read_parquet(tmp_path / 'aggregates' / '_members')) == len(df)
+
+
+def test_partitioned_execution_matches_single_process(tmp_path, bronze_path):
+    """Country-partitioned process-pool runs produce the same silver and gold rows as one process."""
+    def sorted_rows(df):
+        df = df.astype({column: str for column in ('country', 'indicator', 'source', 'data_source') if column in df})
+        return df.sort_values(['country', 'indicator', 'date', 'value'], ignore_index=True)
+
+    single = make_config(tmp_path / 'single')
+    partitioned = make_config(tmp_path / 'partitioned', workers=2, partitions=3)
+    silver = BronzeToSilverTransformer(single).transform(bronze_path)
+    silver_partitioned = BronzeToSilverTransformer(partitioned).transform(bronze_path)
+    gold = SilverToGoldTransformer(single).transform([silver])
+    gold_partitioned = SilverToGoldTransformer(partitioned).transform([silver_partitioned])
+
+    pd.testing.assert_frame_equal(sorted_rows(pd.read_parquet(silver)), sorted_rows(pd.read_parquet(silver_partitioned)),
+                                  check_categorical=False)
+    pd.testing.assert_frame_equal(sorted_rows(pd.read_parquet(gold)), sorted_rows(pd.read_parquet(gold_partitioned)),
+                                  check_categorical=False)
+    assert not list((tmp_path / 'partitioned' / 'silver').glob('.partitions_*'))
+
+
+def test_duckdb_gold_engine_matches_pandas(tmp_path, bronze_path):
+    """The DuckDB backend writes the same gold rows and aggregates as the pandas path."""
+    pytest.importorskip('duckdb')
+    imf_silver = BronzeToSilverTransformer(make_config(tmp_path)).transform(bronze_path)
+    world_bank = pd.read_parquet(imf_silver).assign(
+        source=lambda df: 'World Bank', country_name=lambda df: df['country'].astype(str) + ' name')
+    world_bank.loc[::50, 'value'] = 0.0
+    wb_silver = tmp_path / 'silver' / 'world_silver_1.parquet'
+    world_bank.to_parquet(wb_silver, index=False)
+
+    results = {}
+    for engine in ('pandas', 'duckdb'):
+        config = make_config(tmp_path / engine, gold_engine=engine)
+        gold_path = SilverToGoldTransformer(config).transform([imf_silver, wb_silver])
+        if engine == 'duckdb':
+            # Second run refreshes existing partitions in place
+            gold_path = SilverToGoldTransformer(config).transform([imf_silver, wb_silver])
+        aggregates = tmp_path / engine / 'gold' / 'aggregates'
+        results[engine] = [pd.read_parquet(gold_path), pd.read_parquet(aggregates / 'country_year'),
+                           pd.read_parquet(aggregates / 'indicator_year')]
+
+    for expected, actual in zip(results['pandas'], results['duckdb']):
+        keys = {column: str for column in ('country', 'indicator') if column in expected}
+        pd.testing.assert_frame_equal(expected.astype(keys), actual.astype(keys),
+                                      check_categorical=False, rtol=1e-9)
+    assert np.isinf(results['duckdb'][0]['yoy_change']).any()
+
+
+def test_polars_engine_matches_pandas_row_for_row(tmp_path, bronze_path):
+    """The Polars lazy engine writes the same silver and gold rows, in the same order, as pandas."""
+    pytest.importorskip('polars')
+    silver, gold = {}, {}
+    for engine in ('pandas', 'polars'):
+        config = make_config(tmp_path / engine, engine=engine, gold_engine=engine)
+        silver_path = BronzeToSilverTransformer(config).transform(bronze_path)
+        world_bank = pd.read_parquet(silver_path).assign(country_name=lambda df: df['country'].astype(str) + ' name')
+        world_bank.loc[::50, 'value'] = 0.0
+        wb_silver = tmp_path / engine / 'silver' / 'world_silver_1.parquet'
+        world_bank.to_parquet(wb_silver, index=False)
+        silver[engine] = pd.read_parquet(silver_path)
+        gold[engine] = pd.read_parquet(SilverToGoldTransformer(config).transform([silver_path, wb_silver]))
+
+    pd.testing.assert_frame_equal(silver['pandas'], silver['polars'], check_categorical=False)
+    pd.testing.assert_frame_equal(gold['pandas'], gold['polars'], check_categorical=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize('engine, chunked', [('pandas', False), ('arrow', False), ('arrow', True)])
+def test_invalid_rows_are_quarantined(tmp_path, engine, chunked):
+    """Rows outside the validation ranges go to a quarantine file instead of failing the run."""
+    df = pd.DataFrame({
+        'country': ['IT', 'FR', 'DE', 'ES'],
+        'indicator': ['NGDP'] * 4,
+        'value': [10.0, -500.0, 20.0, 2e6],
+        'date': ['2001', '2002', '1950', '2003'],
+        'source': ['IMF'] * 4,
+    })
+    bronze = tmp_path / 'imf_bronze.parquet'
+    df.to_parquet(bronze, index=False)
+    transformer = BronzeToSilverTransformer(make_config(tmp_path, engine=engine, chunked=chunked))
+
+    silver = pd.read_parquet(transformer.transform(bronze))
+    quarantine = pd.read_parquet(next((tmp_path / 'quarantine').glob('imf_quarantine_*.parquet')))
+
+    assert silver['country'].astype(str).tolist() == ['IT']
+    assert quarantine['violated_rules'].tolist() == ['value.min_value', 'date.min_year', 'value.max_value']
+    with pytest.raises(ValueError):
+        BronzeToSilverTransformer(make_config(tmp_path, engine=engine, validation_mode='fail')).transform(bronze)
+
+
+def test_key_dedup_skips_unchanged_and_replaces_revised_rows(tmp_path):
+    """Re-extracted history adds only new and revised rows; the superseded version leaves older silver files."""
+    def bronze(path, rows):
+        pd.DataFrame(rows, columns=['country', 'indicator', 'value', 'date', 'source']).to_parquet(path, index=False)
+
+    first = [('IT', 'NGDP', 1.0, '2001', 'IMF'), ('FR', 'NGDP', 2.0, '2001', 'IMF'), ('IT', 'NGDP', 3.0, '2002', 'IMF')]
+    second = first[:2] + [('IT', 'NGDP', 3.5, '2002', 'IMF'), ('DE', 'NGDP', 4.0, '2002', 'IMF'),
+                          ('DE', 'NGDP', 9.0, '2002', 'IMF')]
+    bronze(tmp_path / 'imf_bronze_1.parquet', first)
+    bronze(tmp_path / 'imf_bronze_2.parquet', second)
+    transformer = BronzeToSilverTransformer(make_config(tmp_path, silver_dedup=True))
+
+    old_silver = transformer.transform(tmp_path / 'imf_bronze_1.parquet')
+    new_silver = transformer.transform(tmp_path / 'imf_bronze_2.parquet')
+
+    new_rows = pd.read_parquet(new_silver)
+    assert list(zip(new_rows['country'].astype(str), new_rows['value'])) == [('IT', 3.5), ('DE', 4.0)]
+    combined = pd.concat([pd.read_parquet(old_silver), new_rows])
+    assert sorted(zip(combined['country'].astype(str), combined['value'])) == [
+        ('DE', 4.0), ('FR', 2.0), ('IT', 1.0), ('IT', 3.5)]
+
+
+def test_key_dedup_back_to_back_runs_keep_silver_rows(tmp_path):
+    """Two runs of the same source within one second write separate silver files."""
+    rows = [('IT', 'NGDP', 1.0, '2001', 'IMF'), ('FR', 'NGDP', 2.0, '2001', 'IMF')]
+    pd.DataFrame(rows, columns=['country', 'indicator', 'value', 'date', 'source']).to_parquet(
+        tmp_path / 'imf_bronze.parquet', index=False)
+    transformer = BronzeToSilverTransformer(make_config(tmp_path, silver_dedup=True))
+
+    first = transformer.transform(tmp_path / 'imf_bronze.parquet')
+    second = transformer.transform(tmp_path / 'imf_bronze.parquet')
+
+    assert first != second
+    assert len(pd.read_parquet(first)) == 2 and len(pd.read_parquet(second)) == 0
+    assert transformer._silver_key_index('imf').live_files() == [first.name]
+
+
+def test_gold_after_key_dedup_reads_every_live_silver_file(tmp_path):
+    """A full gold run on a deduplicated silver file computes metrics and aggregates over the whole series."""
+    def bronze(path, values):
+        rows = [('IT', 'NGDP', value, f"{2000 + year // 4}-Q{year % 4 + 1}", 'IMF') for year, value in enumerate(values)]
+        pd.DataFrame(rows, columns=['country', 'indicator', 'value', 'date', 'source']).to_parquet(path, index=False)
+
+    history = [float(value) for value in range(1, 21)]
+    revised = history[:10] + [100.0] + history[11:] + [21.0, 22.0]
+    bronze(tmp_path / 'imf_bronze_1.parquet', history)
+    bronze(tmp_path / 'imf_bronze_2.parquet', revised)
+    bronze(tmp_path / 'imf_bronze_full.parquet', revised)
+    config = make_config(tmp_path, silver_dedup=True)
+
+    BronzeToSilverTransformer(config).transform(tmp_path / 'imf_bronze_1.parquet')
+    new_silver = BronzeToSilverTransformer(config).transform(tmp_path / 'imf_bronze_2.parquet')
+    assert len(pd.read_parquet(new_silver)) == 3
+    gold = pd.read_parquet(SilverToGoldTransformer(config).transform([new_silver]))
+
+    reference = make_config(tmp_path / 'reference')
+    full_silver = BronzeToSilverTransformer(reference).transform(tmp_path / 'imf_bronze_full.parquet')
+    expected = pd.read_parquet(SilverToGoldTransformer(reference).transform([full_silver]))
+
+    gold, expected = (df.sort_values('date', ignore_index=True) for df in (gold, expected))
+    assert len(gold) == len(expected) == 22
+    for column in ('value', 'yoy_change', 'ma_3year', 'zscore'):
+        np.testing.assert_allclose(gold[column], expected[column], rtol=1e-12, equal_nan=True)
+    aggregates = pd.read_parquet(tmp_path / 'gold' / 'aggregates' / 'country_year')
+    expected_aggregates = pd.read_parquet(tmp_path / 'reference' / 'gold' / 'aggregates' / 'country_year')
+    np.testing.assert_allclose(aggregates['value_mean'], expected_aggregates['value_mean'], rtol=1e-12)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.validation import DataValidator, compile_rules
+
+RULES = {
+    'date': {'min_year': 1960, 'max_year': 2020},
+    'value': {'min_value': -100, 'max_value': 1000},
+}
+
+
+def test_rules_evaluate_in_one_bitmask():
+    """Each rule sets its own bit; year bounds are inclusive and missing values never violate."""
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['1959-12-31', '1960-01-01', '2020-12-31', '2021-01-01', None, '2000-01-01']),
+        'value': [0.0, -101.0, 1000.0, 5000.0, np.nan, 1000.5],
+    })
+    validator = DataValidator(RULES)
+
+    result = validator.validate(df)
+
+    assert result['violations'].tolist() == [0b0001, 0b0100, 0, 0b1010, 0, 0b1000]
+    assert result['counts'] == {'date.min_year': 1, 'date.max_year': 1, 'value.min_value': 1, 'value.max_value': 2}
+    assert not result['is_valid'] and len(result['errors']) == 4
+    assert validator.labels(result['violations'])[3] == 'date.max_year,value.max_value'
+
+
+def test_sampled_mode_falls_back_to_full_scan_on_violation():
+    """A clean sample accepts the data; a sample with violations triggers the exact full scan."""
+    df = pd.DataFrame({'date': pd.to_datetime(['2000-01-01'] * 1000), 'value': np.arange(1000.0)})
+    validator = DataValidator(RULES)
+
+    assert validator.validate(df, sample_rows=100)['is_valid']
+    df.loc[::2, 'value'] = 1e9
+    result = validator.validate(df, sample_rows=100)
+    assert not result['sampled'] and result['counts'] == {'value.max_value': 500}
+
+
+def test_unknown_rule_is_rejected():
+    with pytest.raises(ValueError):
+        compile_rules({'value': {'max_len': 3}})
@@ -1,30 +1,140 @@
+import pandas as pd
 import pytest
-from src.etl.WorldBankExtractor import fetch_world_bank_data, get_config_path
-
-def test_world_bank_extraction():
-    """Test successful data extraction from World Bank API."""
-    # Test parameters
-    country = "IT"
-    indicator = "NY.GDP.MKTP.CD"
-    start_year = 2020
-    end_year = 2022
-    
-    # Get the correct config path
-    config_file = get_config_path()
-    
-    # Test the function
-    data = fetch_world_bank_data(country, indicator, start_year, end_year, config_file)
-    
-    # Assert the response is valid
-    assert data is not None
-    assert isinstance(data, list)
-
-def test_invalid_config_path():
-    """Test handling of non-existent config file."""
-    with pytest.raises(FileNotFoundError):
-        fetch_world_bank_data("IT", "NY.GDP.MKTP.CD", 2020, 2022, "nonexistent.yaml")
-
-def test_invalid_data_structure():
-    """Test handling of invalid API response structure."""
-    # This would need mocking the API response
-    pass  # We can implement this later with mocking if needed
\ No newline at end of file
+from tests.fake_api import FakeAPIServer, FakeAPIConfig
+from src.extractors.world_bank import WorldBankExtractor
+
+INDICATORS = ["NY.GDP.MKTP.CD", "SL.UEM.TOTL.ZS"]
+
+
+@pytest.fixture
+def server():
+    with FakeAPIServer(FakeAPIConfig(countries=[f"C{i:02d}" for i in range(20)])) as server:
+        yield server
+
+
+def make_config(tmp_path, server, **world_bank_params):
+    return {
+        'data_paths': {'bronze': str(tmp_path / 'bronze')},
+        'world_bank_params': {'indicators': INDICATORS, 'base_url': server.world_bank_url, **world_bank_params},
+        'http': {'retry_backoff_factor': 0},
+    }
+
+
+def test_world_bank_extraction_fetches_all_pages(tmp_path, server):
+    """All pages reported in the response metadata are fetched and merged."""
+    extractor = WorldBankExtractor(make_config(tmp_path, server, per_page=50))
+
+    df = pd.read_parquet(extractor.extract(countries=['all'], start_year=2000, end_year=2023))
+
+    assert len(df) == len(INDICATORS) * 20 * 24
+    assert set(df['indicator']) == set(INDICATORS)
+
+
+def test_world_bank_batches_countries(tmp_path, server):
+    """Countries are grouped into semicolon-joined requests and split back out."""
+    extractor = WorldBankExtractor(make_config(tmp_path, server, max_batch_countries=10))
+    countries = [f"C{i:02d}" for i in range(20)]
+
+    df = pd.read_parquet(extractor.extract(countries=countries, start_year=2020, end_year=2022))
+
+    assert server.request_count == len(INDICATORS) * 2
+    assert sorted(df['country'].unique()) == countries
+
+
+def test_world_bank_async_matches_sync(tmp_path, server):
+    """The async fan-out produces the same bronze data as sequential extraction."""
+    extractor = WorldBankExtractor(make_config(tmp_path, server, per_page=20, max_batch_countries=3))
+    countries = [f"C{i:02d}" for i in range(7)]
+
+    sync_df = pd.read_parquet(extractor.extract(countries=countries, start_year=2010, end_year=2020, mode='sync'))
+    extractor.bronze_path = tmp_path / 'bronze_async'
+    extractor.bronze_path.mkdir()
+    async_df = pd.read_parquet(extractor.extract(countries=countries, start_year=2010, end_year=2020, mode='async'))
+
+    pd.testing.assert_frame_equal(sync_df, async_df)
+
+
+def test_world_bank_retries_throttled_requests(tmp_path):
+    """429 responses are retried by the shared transport."""
+    with FakeAPIServer(FakeAPIConfig(countries=['IT'], throttle_every=2)) as server:
+        extractor = WorldBankExtractor(make_config(tmp_path, server))
+
+        df = pd.read_parquet(extractor.extract(countries=['IT'], start_year=2020, end_year=2022))
+
+    assert server.throttled_count > 0
+    assert len(df) == len(INDICATORS) * 3
+
+
+def test_world_bank_rate_limiter_backs_off_on_throttling(tmp_path):
+    """429s slow the shared limiter down instead of being retried per session."""
+    with FakeAPIServer(FakeAPIConfig(countries=['IT'], throttle_every=2)) as server:
+        config = make_config(tmp_path, server)
+        config['rate_limit'] = {'enabled': True, 'initial_rate': 100, 'max_rate': 100, 'min_rate': 1}
+        extractor = WorldBankExtractor(config)
+
+        df = pd.read_parquet(extractor.extract(countries=['IT'], start_year=2020, end_year=2022))
+        host_metrics = extractor.http.metrics()[server.base_url.split('//')[1]]
+
+    assert len(df) == len(INDICATORS) * 3
+    assert host_metrics['throttled'] == server.throttled_count > 0
+    assert host_metrics['rate'] < 100
+    assert host_metrics['queue_depth'] == 0
+
+
+def test_world_bank_ignores_record_padding(tmp_path):
+    """Padded payloads are larger on the wire but land the same bronze rows."""
+    frames, sizes = [], []
+    for padding in (0, 2000):
+        with FakeAPIServer(FakeAPIConfig(countries=['IT', 'FR'], record_padding=padding)) as server:
+            extractor = WorldBankExtractor(make_config(tmp_path / str(padding), server))
+            frames.append(pd.read_parquet(extractor.extract(countries=['IT', 'FR'], start_year=2020, end_year=2022)))
+            sizes.append(len(server.respond(f"/v2/countries/IT/indicators/{INDICATORS[0]}", 'format=json')[1]))
+
+    pd.testing.assert_frame_equal(frames[0], frames[1])
+    assert sizes[1] > sizes[0] + 2000 * 24
+
+
+def test_world_bank_incremental_backfills_new_countries(tmp_path, server):
+    """A country first returned by a narrowed ['all'] request gets its full history."""
+    config = make_config(tmp_path, server)
+    config['extraction'] = {'incremental': True, 'watermark_dir': str(tmp_path / 'watermarks'),
+                            'revision_lookback_years': 2}
+    extractor = WorldBankExtractor(config)
+    extractor.extract(countries=['C00', 'C01'], start_year=2000, end_year=2023)
+
+    # Watermarks from explicit countries do not narrow the first request for every country
+    first = pd.read_parquet(extractor.extract(countries=['all'], start_year=2000, end_year=2023))
+    assert len(first) == len(INDICATORS) * 20 * 24
+
+    server.config.countries = server.config.countries + ['NEW']
+    df = pd.read_parquet(extractor.extract(countries=['all'], start_year=2000, end_year=2023))
+
+    new = df[df['country'] == 'NEW']
+    assert sorted(new['date'].astype(int).unique()) == list(range(2000, 2024))
+    assert len(new) == len(INDICATORS) * 24
+    assert sorted(df.loc[df['country'] == 'C05', 'date'].astype(int).unique()) == list(range(2021, 2024))
+
+
+def test_world_bank_failed_run_discards_watermark_advances(tmp_path, server, monkeypatch):
+    """Periods flushed by a run whose bronze file was never published do not narrow the next run."""
+    config = make_config(tmp_path, server)
+    config['extraction'] = {'incremental': True, 'watermark_dir': str(tmp_path / 'watermarks'),
+                            'revision_lookback_years': 2, 'bronze_row_group_size': 1}
+    extractor = WorldBankExtractor(config)
+    extractor.extract(countries=['C00'], start_year=2000, end_year=2010)
+
+    split = extractor._split_by_country
+    calls = []
+    def fail_after_first_batch(indicator, countries, data):
+        calls.append(indicator)
+        if len(calls) > 1:
+            raise RuntimeError("parse failure")
+        return split(indicator, countries, data)
+    monkeypatch.setattr(extractor, '_split_by_country', fail_after_first_batch)
+    with pytest.raises(RuntimeError):
+        extractor.extract(countries=['C00', 'C01'], start_year=2000, end_year=2023)
+    monkeypatch.undo()
+
+    df = pd.read_parquet(extractor.extract(countries=['C00', 'C01'], start_year=2000, end_year=2023))
+    c00 = df[(df['country'] == 'C00') & (df['indicator'] == INDICATORS[0])]
+    assert sorted(c00['date'].astype(int)) == list(range(2008, 2024))
@@ -0,0 +1,24 @@
+from src.etl.raw_storage import write_raw
+from src.etl.WorldBankTransformer import WorldBankTransformer, TransformedData
+
+RECORDS = [
+    {'indicator': {'id': 'NY.GDP.MKTP.CD', 'value': 'GDP (current US$)'},
+     'country': {'id': 'IT', 'value': 'Italy'},
+     'date': str(year), 'value': None if year == 2001 else 1.5 * year, 'decimal': 0}
+    for year in range(2000, 2010)
+]
+
+
+def test_transformer_returns_lazy_handle(tmp_path, monkeypatch):
+    """transform_data returns a handle to the Parquet output instead of one dict per row."""
+    monkeypatch.setattr(WorldBankTransformer, '_ensure_transformed_data_dir', lambda self: tmp_path)
+    path = write_raw(tmp_path / 'IT_GDP.json', RECORDS, {'metadata': {'country': 'IT'}})
+
+    result = WorldBankTransformer().transform_data(path)
+
+    handle = result['transformed_data']
+    assert isinstance(handle, TransformedData)
+    assert handle.row_count == result['metadata']['rows_processed'] == 9
+    assert handle.schema.names == result['metadata']['columns']
+    assert handle.load(columns=['value'])['value'].iloc[0] == 3000.0
+    assert sum(len(batch) for batch in handle.iter_batches(batch_size=4)) == 9